@@ -1,9 +1,10 @@
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import json
 import os
 import asyncio
 import aiohttp
+import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
 from anthropic import Anthropic
 from datetime import datetime
@@ -13,8 +14,10 @@ import random
 from coresignal_service import CoreSignalService
 from dotenv import load_dotenv
 import requests
-import csv
-from io import StringIO
+import queue
+import threading
+from csv_stream import iter_csv, csv_string, csv_download_headers
+from supabase_pagination import keyset_params, split_page
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,9 +25,6 @@ load_dotenv()
 app = Flask(__name__, static_folder='.', static_url_path='')
 CORS(app)
 
-# Session-based page tracking (resets on server restart)
-used_pages_tracker = set()
-
 # Initialize Anthropic client
 anthropic_client = Anthropic(
     api_key=os.getenv("ANTHROPIC_API_KEY")  # Set your API key as environment variable
@@ -41,6 +41,9 @@ except ImportError as e:
     print(f"Warning: Could not import ExtensionService: {e}")
     extension_service = None
 
+# Bulk feedback summaries (per-URL cache, invalidated on save/clear)
+from feedback_service import feedback_service
+
 # Import JD Analyzer routes
 try:
     from jd_analyzer.api.endpoints import register_jd_analyzer_routes, make_coresignal_request_with_retry
@@ -51,11 +54,13 @@ except ImportError as e:
     # Fallback: define retry function here if import fails
     def make_coresignal_request_with_retry(url, payload, headers, max_retries=2, timeout=30):
         """Fallback retry function if JD Analyzer import fails"""
+        from coresignal_pagination import cached_preview_post
+
         for attempt in range(max_retries + 1):
             try:
-                response = requests.post(url, json=payload, headers=headers, timeout=timeout)
-                if response.status_code == 200:
-                    return (True, response.json(), None)
+                data, response = cached_preview_post(url, payload, headers, timeout)
+                if data is not None:
+                    return (True, data, None)
                 if response.status_code == 503 and attempt < max_retries:
                     wait_time = 2 ** attempt
                     print(f"⚠️  Rate limit (503) - retrying in {wait_time}s...")
@@ -91,37 +96,41 @@ def save_candidate_assessment(linkedin_url, full_name, headline, profile_data, a
     return save_to_supabase_api(linkedin_url, full_name, headline, profile_data, assessment_data, assessment_type, session_name)
 
 
+def build_assessment_row(linkedin_url, full_name, headline, profile_data, assessment_data, assessment_type, session_name):
+    """Build a candidate_assessments row (scores extracted from the assessment)"""
+    weighted_score = None
+    overall_score = None
+    
+    if assessment_data:
+        if assessment_data.get('weighted_analysis') and assessment_data['weighted_analysis'].get('weighted_score') is not None:
+            try:
+                weighted_score = float(assessment_data['weighted_analysis']['weighted_score'])
+            except (ValueError, TypeError):
+                weighted_score = None
+        elif assessment_data.get('overall_score') is not None:
+            try:
+                overall_score = float(assessment_data['overall_score'])
+            except (ValueError, TypeError):
+                overall_score = None
+    
+    return {
+        'linkedin_url': linkedin_url,
+        'full_name': full_name,
+        'headline': headline,
+        'profile_data': profile_data,
+        'assessment_data': assessment_data,
+        'weighted_score': weighted_score,
+        'overall_score': overall_score,
+        'assessment_type': assessment_type,
+        'session_name': session_name
+    }
+
+
 def save_to_supabase_api(linkedin_url, full_name, headline, profile_data, assessment_data, assessment_type, session_name):
     """Save using Supabase REST API"""
     try:
-        # Extract scores
-        weighted_score = None
-        overall_score = None
-        
-        if assessment_data:
-            if assessment_data.get('weighted_analysis') and assessment_data['weighted_analysis'].get('weighted_score') is not None:
-                try:
-                    weighted_score = float(assessment_data['weighted_analysis']['weighted_score'])
-                except (ValueError, TypeError):
-                    weighted_score = None
-            elif assessment_data.get('overall_score') is not None:
-                try:
-                    overall_score = float(assessment_data['overall_score'])
-                except (ValueError, TypeError):
-                    overall_score = None
-        
         # Prepare data for Supabase API
-        data = {
-            'linkedin_url': linkedin_url,
-            'full_name': full_name,
-            'headline': headline,
-            'profile_data': profile_data,
-            'assessment_data': assessment_data,
-            'weighted_score': weighted_score,
-            'overall_score': overall_score,
-            'assessment_type': assessment_type,
-            'session_name': session_name
-        }
+        data = build_assessment_row(linkedin_url, full_name, headline, profile_data, assessment_data, assessment_type, session_name)
         
         # Make API request to Supabase
         headers = {
@@ -145,41 +154,109 @@ def save_to_supabase_api(linkedin_url, full_name, headline, profile_data, assess
         print(f"❌ Error saving assessment to Supabase API: {str(e)}")
         return False
 
-def load_candidate_assessments(limit=50):
-    """Load candidate assessments from database using Supabase REST API"""
-    return load_from_supabase_api(limit)
 
-
-def load_from_supabase_api(limit):
-    """Load using Supabase REST API"""
+def save_candidate_assessments_bulk(rows):
+    """
+    Insert many candidate_assessments rows in one request.
+    
+    Returns:
+        Dict of linkedin_url -> inserted assessment ID (empty on failure)
+    """
+    if not rows:
+        return {}
+    
     try:
         headers = {
             'apikey': SUPABASE_KEY,
             'Authorization': f'Bearer {SUPABASE_KEY}',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Prefer': 'return=representation'
         }
         
-        # Build query parameters
-        params = {
-            'select': '*',
-            'order': 'weighted_score.desc,overall_score.desc,created_at.desc',
-            'limit': str(limit)
+        url = f"{SUPABASE_URL}/rest/v1/candidate_assessments"
+        # Only the new IDs come back, not the JSONB payloads we just sent
+        response = requests.post(url, json=rows, headers=headers, params={'select': 'id,linkedin_url'})
+        
+        if response.status_code in [200, 201]:
+            inserted = response.json()
+            print(f"✅ Saved {len(inserted)} assessments to database via Supabase API")
+            return {row['linkedin_url']: row['id'] for row in inserted}
+        else:
+            print(f"❌ Supabase API error: {response.status_code} - {response.text}")
+            return {}
+            
+    except Exception as e:
+        print(f"❌ Error bulk saving assessments to Supabase API: {str(e)}")
+        return {}
+
+# Columns the saved-assessment browser lists; the profile_data/assessment_data
+# blobs are loaded per candidate via /assessments/<id>
+ASSESSMENT_LIST_COLUMNS = (
+    'id,linkedin_url,full_name,headline,weighted_score,overall_score,'
+    'assessment_type,session_name,created_at,checked_at:profile_data->>checked_at'
+)
+
+def load_candidate_assessments(limit=50, cursor=None, columns=ASSESSMENT_LIST_COLUMNS):
+    """
+    Load one page of candidate assessments (newest first) using Supabase REST API
+    
+    Returns:
+        (assessments, next_cursor) - next_cursor is None on the last page
+    """
+    return load_from_supabase_api(limit, cursor, columns)
+
+
+def load_from_supabase_api(limit, cursor=None, columns=ASSESSMENT_LIST_COLUMNS):
+    """Load using Supabase REST API (keyset pagination on created_at, id)"""
+    # Build query parameters (raises ValueError for a malformed cursor)
+    params = {'select': columns}
+    params.update(keyset_params('created_at', limit, cursor))
+    
+    try:
+        headers = {
+            'apikey': SUPABASE_KEY,
+            'Authorization': f'Bearer {SUPABASE_KEY}',
+            'Content-Type': 'application/json'
         }
         
         url = f"{SUPABASE_URL}/rest/v1/candidate_assessments"
         response = requests.get(url, headers=headers, params=params)
         
         if response.status_code == 200:
-            assessments = response.json()
+            assessments, next_cursor = split_page(response.json(), limit, 'created_at')
             print(f"✅ Loaded {len(assessments)} assessments from database via Supabase API")
-            return assessments
+            return assessments, next_cursor
         else:
             print(f"❌ Supabase API error: {response.status_code} - {response.text}")
-            return []
+            return [], None
             
     except Exception as e:
         print(f"❌ Error loading assessments from Supabase API: {str(e)}")
-        return []
+        return [], None
+
+
+def load_assessment_detail(assessment_id):
+    """Load one candidate assessment with its profile_data and assessment_data"""
+    try:
+        headers = {
+            'apikey': SUPABASE_KEY,
+            'Authorization': f'Bearer {SUPABASE_KEY}',
+            'Content-Type': 'application/json'
+        }
+        
+        url = f"{SUPABASE_URL}/rest/v1/candidate_assessments"
+        response = requests.get(url, headers=headers, params={'id': f'eq.{assessment_id}'})
+        
+        if response.status_code == 200:
+            rows = response.json()
+            return rows[0] if rows else None
+        else:
+            print(f"❌ Supabase API error: {response.status_code} - {response.text}")
+            return None
+            
+    except Exception as e:
+        print(f"❌ Error loading assessment {assessment_id} from Supabase API: {str(e)}")
+        return None
 
 # ============================================
 # STORAGE FUNCTIONS - SAVE API CREDITS!
@@ -647,15 +724,10 @@ def search_coresignal_profiles_preview(criteria: dict, page: int = 1) -> dict:
         print(f"   ❌ Error: {error_msg}")
         return {"success": False, "error": error_msg}
 
-def convert_search_results_to_csv(results: list) -> str:
-    """Convert search results to CSV format for batch processing"""
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['Profile URL', 'First Name', 'Last Name', 'Full Name', 'Headline', 'Location', 'Current Title'])
-    
-    # Write data
+SEARCH_RESULTS_CSV_HEADER = ['Profile URL', 'First Name', 'Last Name', 'Full Name', 'Headline', 'Location', 'Current Title']
+
+def iter_search_result_rows(results: list):
+    """Yield one CSV row per search result (columns of SEARCH_RESULTS_CSV_HEADER)"""
     for profile in results:
         profile_url = profile.get('websites_linkedin', '')
         full_name = profile.get('full_name', '')
@@ -666,9 +738,11 @@ def convert_search_results_to_csv(results: list) -> str:
         location = profile.get('location_raw_address', '')
         job_title = profile.get('job_title', '')
         
-        writer.writerow([profile_url, first_name, last_name, full_name, headline, location, job_title])
-    
-    return output.getvalue()
+        yield [profile_url, first_name, last_name, full_name, headline, location, job_title]
+
+def convert_search_results_to_csv(results: list) -> str:
+    """Convert search results to CSV format for batch processing"""
+    return csv_string(SEARCH_RESULTS_CSV_HEADER, iter_search_result_rows(results))
 
 def extract_profile_summary(profile_data):
     """Extract key information from LinkedIn profile for analysis"""
@@ -1371,6 +1445,9 @@ def batch_assess_profiles():
         candidates = data.get('candidates', [])
         user_prompt = data.get('user_prompt', 'Provide a general professional assessment')
         weighted_requirements = data.get('weighted_requirements', [])
+        # Optionally persist successful assessments (one bulk insert); each result then carries its assessment_id
+        save_to_database = bool(data.get('save_to_database', False))
+        session_name = data.get('session_name')
         
         if not candidates:
             return jsonify({'error': 'No candidates provided'}), 400
@@ -1509,10 +1586,31 @@ def batch_assess_profiles():
         # Add CSV names to results to match with candidates
         for i, result in enumerate(results):
             if i < len(candidates):
-                result['csv_name'] = candidates[i]['fullName']
-                result['csv_first_name'] = candidates[i]['firstName']
-                result['csv_last_name'] = candidates[i]['lastName']
-                print(f"DEBUG: Result {i} mapped to candidate: {candidates[i]['fullName']} - URL: {result.get('url', 'No URL')}")
+                result['csv_name'] = candidates[i].get('fullName', candidates[i].get('name', ''))
+                result['csv_first_name'] = candidates[i].get('firstName', '')
+                result['csv_last_name'] = candidates[i].get('lastName', '')
+                print(f"DEBUG: Result {i} mapped to candidate: {result['csv_name']} - URL: {result.get('url', 'No URL')}")
+        
+        if save_to_database:
+            rows = []
+            for result in results:
+                if result.get('success') and result.get('assessment'):
+                    profile_data = result.get('profile_data') or {}
+                    if isinstance(profile_data, dict) and 'profile_data' in profile_data:
+                        profile_data = profile_data['profile_data']
+                    rows.append(build_assessment_row(
+                        result.get('url'),
+                        profile_data.get('full_name') or result.get('csv_name'),
+                        profile_data.get('generated_headline') or profile_data.get('headline'),
+                        profile_data,
+                        result['assessment'],
+                        'batch',
+                        session_name
+                    ))
+            
+            assessment_ids = save_candidate_assessments_bulk(rows)
+            for result in results:
+                result['assessment_id'] = assessment_ids.get(result.get('url'))
         
         # Debug: Print results before sorting
         print("DEBUG: Results before sorting:")
@@ -1596,15 +1694,46 @@ def save_assessment():
 
 @app.route('/load-assessments', methods=['GET'])
 def load_assessments():
-    """Load candidate assessments from the database"""
+    """
+    Load one page of saved assessments, newest first.
+    
+    Query params:
+        limit: Page size (default 50, max 200)
+        cursor: next_cursor from the previous page
+        fields: "summary" (default - list columns only) or "full" (include the JSONB blobs)
+    """
     try:
-        limit = request.args.get('limit', 50, type=int)
-        assessments = load_candidate_assessments(limit=limit)
+        limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+        cursor = request.args.get('cursor')
+        columns = '*' if request.args.get('fields') == 'full' else ASSESSMENT_LIST_COLUMNS
+        
+        try:
+            assessments, next_cursor = load_candidate_assessments(limit=limit, cursor=cursor, columns=columns)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         return jsonify({
             'success': True,
             'assessments': assessments,
-            'count': len(assessments)
+            'count': len(assessments),
+            'next_cursor': next_cursor
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
+@app.route('/assessments/<assessment_id>', methods=['GET'])
+def get_assessment_detail(assessment_id):
+    """Load one saved assessment with its full profile and assessment data"""
+    try:
+        assessment = load_assessment_detail(assessment_id)
+        
+        if not assessment:
+            return jsonify({'error': 'Assessment not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'assessment': assessment
         })
         
     except Exception as e:
@@ -1621,6 +1750,8 @@ def search_profiles_endpoint():
         
         user_prompt = data.get('user_prompt', '')
         limit = data.get('limit', 20)
+        id_only = bool(data.get('id_only', False))  # Return only lightweight profiles (IDs + headline fields), no CSV
+        stream_csv = data.get('format') == 'csv'  # Stream the CSV itself instead of JSON with csv_data
         
         if not user_prompt:
             return jsonify({'error': 'User prompt is required'}), 400
@@ -1658,53 +1789,96 @@ def search_profiles_endpoint():
         print(f"🌐 Searching CoreSignal database for {limit} profiles...")
         print(f"   Will fetch {num_pages_needed} page(s) of ~{profiles_per_page} profiles each")
         
-        # Track which pages to fetch - avoid already-used pages
-        available_pages = [p for p in range(1, 6) if p not in used_pages_tracker]
+        # Track which pages to fetch - avoid pages this search session already used.
+        # Sessions live in Supabase, so every worker sees the same used pages.
+        from search_session_store import search_session_store
+        from search_result_cache import canonical_query_hash
         
-        # If we don't have enough unused pages, reset the tracker
+        query = build_intelligent_elasticsearch_query(criteria)
+        session_id = data.get('session_id') or f"search-profiles:{canonical_query_hash(query)}"
+        session = search_session_store.get(session_id)
+        used_pages = set(session['fetched_pages']) if session else set()
+        
+        available_pages = [p for p in range(1, 6) if p not in used_pages]
+        
+        # Profiles this session already returned are not returned again
+        seen_ids = set(map(str, session['returned_ids'])) if session else set()
+        
+        # If we don't have enough unused pages, reset the session's pages
         if len(available_pages) < num_pages_needed:
-            print(f"ℹ️  Only {len(available_pages)} unused pages available, resetting tracker...")
-            used_pages_tracker.clear()
+            print(f"ℹ️  Only {len(available_pages)} unused pages available, resetting session pages...")
+            search_session_store.reset_pages(session_id)
             available_pages = list(range(1, 6))
+            seen_ids = set()
         
         # Randomly select pages from available ones
         pages_to_fetch = random.sample(available_pages, min(num_pages_needed, len(available_pages)))
         
-        # Mark these pages as used
-        for page in pages_to_fetch:
-            used_pages_tracker.add(page)
+        print(f"🎲 Selected random pages: {pages_to_fetch} (session {session_id} has used {sorted(used_pages)})")
         
-        print(f"🎲 Selected random pages: {pages_to_fetch} (session tracker has {len(used_pages_tracker)} used pages)")
+        def fetch_page(page_num):
+            page_result = search_coresignal_profiles_preview(criteria, page_num)
+            return page_result.get('success'), page_result.get('results', []), page_result.get('error')
         
-        all_results = []
+        # Fetch the selected pages concurrently (shared CoreSignal rate limit, results in page order)
+        from coresignal_pagination import dedupe_profiles, fetch_pages_concurrently, preview_profile_id, to_light_profile
+        print(f"📡 Fetching {len(pages_to_fetch)} page(s) concurrently...")
         
-        # Fetch each page
-        for i, page_num in enumerate(pages_to_fetch):
-            print(f"📡 API call {i+1}/{num_pages_needed} (page {page_num})...")
-            
-            # Fetch profiles from this page
-            page_result = search_coresignal_profiles_preview(criteria, page_num)
-            
-            if not page_result.get('success'):
-                print(f"⚠️  Page {page_num} failed: {page_result.get('error')}")
+        all_results = []
+        fetched_pages = []
+        for outcome in fetch_pages_concurrently(fetch_page, pages_to_fetch):
+            if not outcome['success']:
+                print(f"⚠️  Page {outcome['page']} failed: {outcome['error']}")
                 continue
             
-            page_profiles = page_result.get('results', [])
-            all_results.extend(page_profiles)
-            
-            print(f"   Total so far: {len(all_results)} profiles")
-            
-            # Small delay between calls
-            if i < num_pages_needed - 1:
-                time.sleep(1)
+            fetched_pages.append(outcome['page'])
+            all_results.extend(outcome['results'])
+            print(f"   Page {outcome['page']}: total so far: {len(all_results)} profiles")
+        
+        # Drop employees repeated across pages or already returned in this session
+        fetched_count = len(all_results)
+        all_results = dedupe_profiles(all_results, seen_ids)
+        if fetched_count > len(all_results):
+            print(f"🔁 Removed {fetched_count - len(all_results)} duplicate profiles")
         
         # Limit to requested amount
         results = all_results[:limit]
         
+        # Mark these pages as used
+        session = search_session_store.save(
+            session_id,
+            query=query,
+            endpoint='employee_clean',
+            fetched_pages=fetched_pages,
+            returned_ids=[preview_profile_id(profile) for profile in results],
+            added_fetched=len(results)
+        )
+        
         print(f"🎉 Successfully retrieved {len(results)} profiles from pages: {pages_to_fetch}")
-        print(f"📊 Pages used in this session so far: {sorted(used_pages_tracker)}")
+        print(f"📊 Pages used in this session so far: {session['fetched_pages']}")
         
         # Step 3: Convert to CSV
+        if stream_csv:
+            print("📄 Streaming results as CSV...")
+            headers = csv_download_headers(f"linkedin_search_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+            headers['X-Session-Id'] = session_id
+            headers['X-Total-Found'] = str(len(results))
+            return Response(
+                stream_with_context(iter_csv(SEARCH_RESULTS_CSV_HEADER, iter_search_result_rows(results))),
+                mimetype='text/csv',
+                headers=headers
+            )
+        
+        if id_only:
+            # Full profiles are fetched via /fetch-profile when a candidate is opened
+            return jsonify({
+                'success': True,
+                'profiles': [to_light_profile(profile) for profile in results],
+                'total_found': len(results),
+                'criteria': criteria,
+                'session_id': session_id
+            })
+        
         print("📄 Converting results to CSV...")
         csv_data = convert_search_results_to_csv(results)
         
@@ -1712,7 +1886,8 @@ def search_profiles_endpoint():
             'success': True,
             'csv_data': csv_data,
             'total_found': len(results),
-            'criteria': criteria
+            'criteria': criteria,
+            'session_id': session_id
         })
         
     except Exception as e:
@@ -1724,6 +1899,10 @@ def save_feedback():
     """
     Save recruiter feedback (like/dislike/note) for a candidate
     Supports auto-save with debouncing on frontend
+
+    Notes sent with a draft_id (plus draft_revision, and flush on blur/close)
+    upsert one row per (candidate, recruiter, draft); saves within a short
+    window are coalesced server-side so only the latest text is written.
     """
     try:
         data = request.get_json()
@@ -1732,6 +1911,7 @@ def save_feedback():
         feedback_type = data.get('feedback_type')  # 'like', 'dislike', 'note'
         feedback_text = data.get('feedback_text', '')  # Optional for like/dislike
         recruiter_name = data.get('recruiter_name', 'Unknown')
+        draft_id = data.get('draft_id')  # Auto-saved note being edited
 
         if not linkedin_url or not feedback_type:
             return jsonify({'error': 'linkedin_url and feedback_type are required'}), 400
@@ -1739,6 +1919,31 @@ def save_feedback():
         if feedback_type not in ['like', 'dislike', 'note']:
             return jsonify({'error': 'feedback_type must be like, dislike, or note'}), 400
 
+        if feedback_type == 'note' and draft_id:
+            try:
+                revision = int(data.get('draft_revision', 0))
+            except (TypeError, ValueError):
+                return jsonify({'error': 'draft_revision must be an integer'}), 400
+
+            flush = bool(data.get('flush', False))
+            success, saved = feedback_service.save_note_draft(
+                linkedin_url,
+                recruiter_name,
+                str(draft_id),
+                feedback_text,
+                revision,
+                flush=flush
+            )
+            if not success:
+                return jsonify({'error': 'Failed to save feedback'}), 500
+
+            return jsonify({
+                'success': True,
+                'message': 'Feedback saved successfully' if flush else 'Feedback queued',
+                'coalesced': not flush,
+                'feedback': saved
+            })
+
         headers = {
             'apikey': SUPABASE_KEY,
             'Authorization': f'Bearer {SUPABASE_KEY}',
@@ -1755,6 +1960,7 @@ def save_feedback():
 
         url = f"{SUPABASE_URL}/rest/v1/recruiter_feedback"
         response = requests.post(url, json=payload, headers=headers)
+        feedback_service.invalidate(linkedin_url)
 
         if response.status_code in [200, 201]:
             print(f"✅ Saved {feedback_type} feedback from {recruiter_name} for {linkedin_url}")
@@ -1775,7 +1981,7 @@ def save_feedback():
 def get_feedback(linkedin_url):
     """
     Get all feedback for a specific candidate
-    Returns array of feedback sorted by created_at DESC
+    Returns array of feedback sorted by updated_at DESC (an edited note draft moves to the top)
     """
     try:
         import urllib.parse
@@ -1787,8 +1993,8 @@ def get_feedback(linkedin_url):
             'Content-Type': 'application/json'
         }
 
-        # Get all feedback for this candidate, sorted by newest first
-        url = f"{SUPABASE_URL}/rest/v1/recruiter_feedback?candidate_linkedin_url=eq.{encoded_url}&order=created_at.desc"
+        # Get all feedback for this candidate, most recently written first
+        url = f"{SUPABASE_URL}/rest/v1/recruiter_feedback?candidate_linkedin_url=eq.{encoded_url}&order=updated_at.desc,id.desc"
         response = requests.get(url, headers=headers)
 
         if response.status_code == 200:
@@ -1806,6 +2012,37 @@ def get_feedback(linkedin_url):
         print(f"❌ Error getting feedback: {str(e)}")
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
+@app.route('/get-feedback-bulk', methods=['POST'])
+def get_feedback_bulk():
+    """
+    Get feedback summaries for many candidates at once (feedback indicators)
+
+    Request: {"linkedin_urls": ["https://linkedin.com/in/...", ...]}  (max 500)
+    Returns per-URL {count, likes, dislikes, notes, latest} from one query per 50 URLs
+    """
+    try:
+        data = request.get_json() or {}
+        linkedin_urls = data.get('linkedin_urls', [])
+
+        if not isinstance(linkedin_urls, list):
+            return jsonify({'error': 'linkedin_urls must be a list'}), 400
+
+        if len(linkedin_urls) > 500:
+            return jsonify({'error': 'At most 500 linkedin_urls per request'}), 400
+
+        summaries = feedback_service.get_summaries(linkedin_urls)
+        with_feedback = sum(1 for summary in summaries.values() if summary['count'])
+        print(f"✅ Retrieved feedback summaries for {len(summaries)} candidates ({with_feedback} with feedback)")
+
+        return jsonify({
+            'success': True,
+            'feedback': summaries
+        })
+
+    except Exception as e:
+        print(f"❌ Error getting bulk feedback: {str(e)}")
+        return jsonify({'error': f'Server error: {str(e)}'}), 500
+
 @app.route('/clear-feedback', methods=['POST'])
 def clear_feedback():
     """
@@ -1831,7 +2068,10 @@ def clear_feedback():
 
         # Delete all feedback for this candidate from this recruiter
         url = f"{SUPABASE_URL}/rest/v1/recruiter_feedback?candidate_linkedin_url=eq.{encoded_url}&recruiter_name=eq.{urllib.parse.quote(recruiter_name, safe='')}"
+        # Buffered note drafts would otherwise be written back after the delete
+        feedback_service.discard_drafts(linkedin_url, recruiter_name)
         response = requests.delete(url, headers=headers)
+        feedback_service.invalidate(linkedin_url)
 
         if response.status_code in [200, 204]:
             print(f"✅ Cleared all feedback from {recruiter_name} for {linkedin_url}")
@@ -2258,7 +2498,7 @@ def add_profile_to_list():
 
 @app.route('/extension/profiles/<list_id>', methods=['GET'])
 def get_profiles_in_list(list_id):
-    """Get all profiles in a list"""
+    """Get a page of profiles in a list (list columns only - see /detail for profile_data)"""
     if not extension_service:
         return jsonify({'error': 'Extension service not available'}), 503
 
@@ -2277,8 +2517,34 @@ def get_profiles_in_list(list_id):
     if request.args.get('status'):
         filters['status'] = request.args.get('status')
 
-    profiles = extension_service.get_profiles_in_list(list_id, filters if filters else None)
-    return jsonify(profiles)
+    # Keyset pagination: pass back next_cursor to get the following page
+    limit = max(1, min(request.args.get('limit', 100, type=int), 500))
+    cursor = request.args.get('cursor')
+
+    try:
+        profiles, next_cursor = extension_service.get_profiles_page(
+            list_id, filters if filters else None, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'profiles': profiles,
+        'next_cursor': next_cursor
+    })
+
+@app.route('/extension/profiles/<profile_id>/detail', methods=['GET'])
+def get_profile_detail(profile_id):
+    """Get one list profile with its full profile_data"""
+    if not extension_service:
+        return jsonify({'error': 'Extension service not available'}), 503
+
+    profile = extension_service.get_profile(profile_id)
+
+    if profile:
+        return jsonify(profile)
+    else:
+        return jsonify({'error': 'Profile not found'}), 404
 
 @app.route('/extension/profiles/<profile_id>/status', methods=['PUT'])
 def update_profile_status(profile_id):
@@ -2334,7 +2600,7 @@ def assess_list(list_id):
         print(f"🎯 Starting list assessment for list {list_id}")
 
         # Step 1: Get all unassessed profiles from the list
-        profiles = extension_service.get_profiles_in_list(list_id, {'assessed': False})
+        profiles = extension_service.get_profiles_in_list(list_id, {'assessed': False}, columns='id,linkedin_url,name')
 
         if not profiles:
             return jsonify({
@@ -2375,7 +2641,10 @@ def assess_list(list_id):
         batch_data = {
             'candidates': candidates,
             'user_prompt': 'Provide a comprehensive professional assessment',
-            'weighted_requirements': weighted_requirements
+            'weighted_requirements': weighted_requirements,
+            # Saved in one bulk insert; results come back with their assessment_id
+            'save_to_database': True,
+            'session_name': f"list:{list_id}"
         }
 
         # Call batch_assess_profiles function directly
@@ -2395,12 +2664,12 @@ def assess_list(list_id):
 
         # Step 5: Link assessment results back to extension_profiles
         assessment_results = batch_result.get('results', [])
-        linked_count = 0
+        profiles_by_url = {p['linkedin_url']: p for p in profiles}
+        links = []
         scores = []
 
         for result in assessment_results:
             if result.get('success'):
-                linkedin_url = result.get('linkedin_url')
                 assessment_data = result.get('assessment')
 
                 # Extract score
@@ -2414,43 +2683,18 @@ def assess_list(list_id):
                     scores.append(score)
 
                 # Find the corresponding profile
-                matching_profile = next((p for p in profiles if p['linkedin_url'] == linkedin_url), None)
-
-                if matching_profile:
-                    # Find the assessment ID from candidate_assessments table
-                    # Query Supabase for the assessment
-                    assessment_query_url = f"{SUPABASE_URL}/rest/v1/candidate_assessments"
-                    assessment_params = {
-                        'linkedin_url': f'eq.{linkedin_url}',
-                        'order': 'created_at.desc',
-                        'limit': '1'
-                    }
-
-                    headers = {
-                        'apikey': SUPABASE_KEY,
-                        'Authorization': f'Bearer {SUPABASE_KEY}'
-                    }
-
-                    assessment_response = requests.get(
-                        assessment_query_url,
-                        headers=headers,
-                        params=assessment_params
-                    )
-
-                    if assessment_response.ok:
-                        assessments = assessment_response.json()
-                        if assessments:
-                            assessment_id = assessments[0].get('id')
+                matching_profile = profiles_by_url.get(result.get('url'))
 
-                            # Link to extension_profiles
-                            success = extension_service.link_assessment(
-                                matching_profile['id'],
-                                assessment_id,
-                                score
-                            )
+                if matching_profile and result.get('assessment_id'):
+                    links.append({
+                        'profile_id': matching_profile['id'],
+                        'assessment_id': result['assessment_id'],
+                        # Scores like 'N/A' would fail the FLOAT column for the whole batch
+                        'assessment_score': score if isinstance(score, (int, float)) else None
+                    })
 
-                            if success:
-                                linked_count += 1
+        # One bulk update for every profile
+        linked_count = extension_service.link_assessments(links)
 
         avg_score = sum(scores) / len(scores) if scores else None
 
@@ -2487,118 +2731,95 @@ def export_list_to_csv(list_id):
         if min_score:
             filters['min_score'] = min_score
 
-        profiles = extension_service.get_profiles_in_list(list_id, filters)
+        profiles = extension_service.get_profiles_in_list(
+            list_id, filters, columns='id,linkedin_url,name,assessment_id,assessment_score'
+        )
 
         if not profiles:
             return jsonify({'error': 'No assessed profiles to export'}), 404
 
-        # Get list info
-        stats = extension_service.get_list_stats(list_id)
-        list_name = stats.get('list_name', 'candidates') if stats else 'candidates'
-
-        # Generate CSV
-        csv_output = StringIO()
-        csv_writer = csv.writer(csv_output)
-
-        # Header row
-        csv_writer.writerow(['first_name', 'last_name', 'email', 'note', 'tags'])
-
-        # Get full assessment data for each profile
-        profile_ids = []
-        for profile in profiles:
-            # Parse name
-            name = profile.get('name', '')
-            name_parts = name.split(' ', 1)
-            first_name = name_parts[0] if name_parts else ''
-            last_name = name_parts[1] if len(name_parts) > 1 else ''
-
-            # Email (leave blank - not available from public profiles)
-            email = ''
-
-            # Build note with assessment data
-            note = ''
-            if include_notes and profile.get('assessment_id'):
-                # Fetch full assessment
-                assessment_url = f"{SUPABASE_URL}/rest/v1/candidate_assessments"
-                assessment_params = {'id': f'eq.{profile["assessment_id"]}'}
-
-                headers = {
-                    'apikey': SUPABASE_KEY,
-                    'Authorization': f'Bearer {SUPABASE_KEY}'
-                }
-
-                assessment_response = requests.get(
-                    assessment_url,
-                    headers=headers,
-                    params=assessment_params
-                )
-
-                if assessment_response.ok:
-                    assessments = assessment_response.json()
-                    if assessments:
-                        assessment = assessments[0].get('assessment_data', {})
-                        score = profile.get('assessment_score', 0)
-
-                        # Extract strengths
-                        strengths = []
-                        if assessment.get('weighted_analysis'):
-                            for req in assessment['weighted_analysis'].get('requirements_analysis', []):
-                                strengths.append(req.get('analysis', ''))
-                        elif assessment.get('strengths'):
-                            strengths = assessment['strengths']
-
-                        # Build note
-                        note_parts = [
-                            f"AI Score: {score}/100"
-                        ]
-
-                        if strengths:
-                            note_parts.append(f"Strengths: {', '.join(strengths[:3])}")
-
-                        note_parts.append(f"LinkedIn: {profile['linkedin_url']}")
-                        note_parts.append(f"Assessed: {datetime.now().strftime('%Y-%m-%d')}")
-
-                        note = '. '.join(note_parts)
+        # Get list info (just the row - no stats needed for the name)
+        list_data = extension_service.get_list(list_id)
+        list_name = (list_data or {}).get('list_name') or 'candidates'
+        recruiter_name = request.args.get('recruiter_name', 'Unknown')
+        csv_filename = f"{list_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv"
+
+        # Fetch every assessment the notes need in one bulk query (not one per profile)
+        assessments_by_id = {}
+        if include_notes:
+            assessments_by_id = extension_service.get_assessments_by_ids(
+                [profile.get('assessment_id') for profile in profiles]
+            )
 
-            # Tags
+        def export_rows():
+            """Yield one CSV row per profile; marks the export once every row is sent"""
+            profile_ids = []
+            export_date = datetime.now().strftime('%Y-%m-%d')
             tags = f"{list_name.replace(' ', '-')},{datetime.now().strftime('%Y-Q%q')}"
+            for profile in profiles:
+                # Parse name
+                name = profile.get('name', '')
+                name_parts = name.split(' ', 1)
+                first_name = name_parts[0] if name_parts else ''
+                last_name = name_parts[1] if len(name_parts) > 1 else ''
+
+                # Email (leave blank - not available from public profiles)
+                email = ''
+
+                # Build note with assessment data
+                note = ''
+                assessment_row = assessments_by_id.get(str(profile.get('assessment_id')))
+                if assessment_row:
+                    assessment = assessment_row.get('assessment_data') or {}
+                    score = profile.get('assessment_score', 0)
+
+                    # Extract strengths
+                    strengths = []
+                    if assessment.get('weighted_analysis'):
+                        for req in assessment['weighted_analysis'].get('requirements_analysis', []):
+                            strengths.append(req.get('analysis', ''))
+                    elif assessment.get('strengths'):
+                        strengths = assessment['strengths']
+
+                    # Build note
+                    note_parts = [
+                        f"AI Score: {score}/100"
+                    ]
+
+                    if strengths:
+                        note_parts.append(f"Strengths: {', '.join(strengths[:3])}")
+
+                    note_parts.append(f"LinkedIn: {profile['linkedin_url']}")
+                    note_parts.append(f"Assessed: {export_date}")
+
+                    note = '. '.join(note_parts)
+
+                yield [first_name, last_name, email, note, tags]
+
+                profile_ids.append(profile['id'])
+
+            # Only reached when the whole file was streamed (not if the client disconnects)
+            if profile_ids:
+                extension_service.mark_exported(profile_ids)
+
+            # Record export
+            extension_service.record_export({
+                'list_id': list_id,
+                'exported_by': recruiter_name,
+                'candidate_count': len(profiles),
+                'min_score_filter': min_score,
+                'csv_filename': csv_filename
+            })
 
-            # Write row
-            csv_writer.writerow([first_name, last_name, email, note, tags])
-
-            profile_ids.append(profile['id'])
-
-        # Mark profiles as exported
-        if profile_ids:
-            extension_service.mark_exported(profile_ids)
-
-        # Record export
-        export_record = {
-            'list_id': list_id,
-            'exported_by': request.args.get('recruiter_name', 'Unknown'),
-            'candidate_count': len(profiles),
-            'min_score_filter': min_score,
-            'csv_filename': f"{list_name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv"
-        }
-        extension_service.record_export(export_record)
-
-        # Prepare response
-        csv_content = csv_output.getvalue()
-        csv_output.close()
+            print(f"✅ Exported {len(profiles)} profiles to CSV")
 
-        # Create response with CSV download
-        response = app.response_class(
-            csv_content,
+        # Stream the CSV download row batch by row batch
+        return Response(
+            stream_with_context(iter_csv(['first_name', 'last_name', 'email', 'note', 'tags'], export_rows())),
             mimetype='text/csv',
-            headers={
-                'Content-Disposition': f'attachment; filename={export_record["csv_filename"]}'
-            }
+            headers=csv_download_headers(csv_filename)
         )
 
-        print(f"✅ Exported {len(profiles)} profiles to CSV")
-
-        return response
-
     except Exception as e:
         print(f"❌ Error exporting to CSV: {str(e)}")
         import traceback
@@ -2696,20 +2917,29 @@ def research_companies_endpoint():
                 'error': 'Research already in progress for this JD'
             }), 409
 
-        # Start async research in background
-        async def run_research():
-            await service.research_companies_for_jd(jd_id, jd_data, config)
-
-        # Create new event loop for this task
-        import threading
-        def background_task():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(run_research())
-            loop.close()
+        # Start async research in background on the shared research loop.
+        # Register the run on the progress bus first so /stream subscribes
+        # in-process even before the first status update is published.
+        from company_research_service import run_in_service_loop
+        from research_progress import progress_bus
+        progress_bus.begin(jd_id)
+        future = run_in_service_loop(service.research_companies_for_jd(jd_id, jd_data, config))
+
+        def on_research_done(done_future):
+            # Runs on the research loop thread - only log and schedule, never block
+            if done_future.cancelled():
+                error = RuntimeError('Research run was cancelled')
+            else:
+                error = done_future.exception()
+                if error is None:
+                    return
+            print(f"❌ Research run for {jd_id} failed: {error}")
+            import traceback
+            traceback.print_exception(type(error), error, error.__traceback__)
+            # The run marks itself failed, but that write may be what failed
+            run_in_service_loop(service.mark_session_failed(jd_id, str(error)))
 
-        thread = threading.Thread(target=background_task)
-        thread.start()
+        future.add_done_callback(on_research_done)
 
         return jsonify({
             'success': True,
@@ -2725,6 +2955,9 @@ def research_companies_endpoint():
         return jsonify({'error': str(e)}), 500
 
 
+# Longest a request waits for /evaluate-more-companies before answering 504
+EVALUATE_MORE_TIMEOUT_SECONDS = float(os.getenv("EVALUATE_MORE_TIMEOUT_SECONDS", "240"))
+
 @app.route('/evaluate-more-companies', methods=['POST'])
 def evaluate_more_companies_endpoint():
     """
@@ -2750,26 +2983,22 @@ def evaluate_more_companies_endpoint():
         if not session_id:
             return jsonify({'error': 'session_id is required'}), 400
 
-        # Run evaluation in background
-        async def run_evaluation():
-            return await service.evaluate_additional_companies(session_id, start_index, count)
-
-        # Create new event loop for this task
-        import threading
-        result_container = {}
-
-        def background_task():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(run_evaluation())
-            result_container['result'] = result
-            loop.close()
-
-        thread = threading.Thread(target=background_task)
-        thread.start()
-        thread.join()  # Wait for completion (evaluations are faster than discovery)
+        # Run evaluation on the shared research loop and wait for completion
+        # (evaluations are faster than discovery)
+        from company_research_service import run_in_service_loop
+        future = run_in_service_loop(
+            service.evaluate_additional_companies(session_id, start_index, count)
+        )
+        try:
+            result = future.result(timeout=EVALUATE_MORE_TIMEOUT_SECONDS)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            print(f"⏱️  Evaluate more for {session_id} timed out after {EVALUATE_MORE_TIMEOUT_SECONDS}s")
+            return jsonify({
+                'error': f'Evaluation timed out after {EVALUATE_MORE_TIMEOUT_SECONDS}s'
+            }), 504
 
-        return jsonify(result_container.get('result', {'error': 'Evaluation failed'}))
+        return jsonify(result or {'error': 'Evaluation failed'})
 
     except Exception as e:
         print(f"Evaluate more error: {str(e)}")
@@ -2816,24 +3045,73 @@ def get_research_status(jd_id):
         return jsonify({'error': str(e)}), 500
 
 
+def with_research_progress(session):
+    """Return a copy of a research session with progress_percentage added."""
+    session = dict(session)
+    status = session.get('status')
+
+    if status == 'completed':
+        progress = 100
+    elif status == 'failed':
+        progress = 0
+    else:
+        total_expected = session.get('max_companies') or 50
+        evaluated = session.get('total_evaluated') or 0
+        progress = min(int((evaluated / total_expected) * 100), 99)
+
+    session['progress_percentage'] = progress
+    return session
+
+
 @app.route('/research-companies/<jd_id>/stream', methods=['GET'])
 def stream_research_status(jd_id):
     """
     Stream research session status in real-time using Server-Sent Events (SSE).
 
-    This provides much better UX than polling:
-    - Updates every 500ms (vs 2 seconds)
-    - Shows detailed progress (phase, current action, company being evaluated)
-    - Lower server load
-    - Professional streaming experience
+    Runs started by this worker are pushed from the in-process progress bus
+    (research_progress.progress_bus) as each status update happens - no
+    database reads at all. Runs owned by another worker fall back to polling
+    company_research_sessions once per status flush interval.
     """
-    def generate():
+    heartbeat_seconds = 15
+    poll_interval_seconds = 1.0  # Matches CompanyResearchConfig.STATUS_FLUSH_INTERVAL_MS
+
+    def stream_from_bus(progress_bus):
+        subscriber = progress_bus.subscribe(jd_id)
+        try:
+            while True:
+                try:
+                    session = subscriber.get(timeout=heartbeat_seconds)
+                except queue.Empty:
+                    if not progress_bus.is_tracking(jd_id):
+                        yield f"data: {json.dumps({'error': 'Research run is no longer tracked'})}\n\n"
+                        break
+                    # SSE comment keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+
+                # Skip to the newest snapshot if several queued up
+                while True:
+                    try:
+                        session = subscriber.get_nowait()
+                    except queue.Empty:
+                        break
+
+                session = with_research_progress(session)
+                yield f"data: {json.dumps({'success': True, 'session': session}, default=str)}\n\n"
+
+                if session['status'] in ['completed', 'failed']:
+                    break
+        finally:
+            progress_bus.unsubscribe(jd_id, subscriber)
+
+    def poll_supabase():
         from supabase import create_client
         supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
 
         last_status = None
         retry_count = 0
-        max_retries = 10  # Wait up to 5 seconds for session to be created
+        max_retries = 10  # Wait up to 10 seconds for session to be created
 
         while True:
             try:
@@ -2849,24 +3127,12 @@ def stream_research_status(jd_id):
                         yield f"data: {json.dumps({'error': 'Session not found after retries'})}\n\n"
                         break
                     # Wait and retry
-                    time.sleep(0.5)
+                    time.sleep(poll_interval_seconds)
                     continue
 
-                session = result.data[0]
+                session = with_research_progress(result.data[0])
                 status = session['status']
 
-                # Calculate progress
-                if status == 'completed':
-                    progress = 100
-                elif status == 'failed':
-                    progress = 0
-                else:
-                    total_expected = session.get('max_companies', 50)
-                    evaluated = session.get('total_evaluated', 0)
-                    progress = min(int((evaluated / total_expected) * 100), 99)
-
-                session['progress_percentage'] = progress
-
                 # Only send update if status changed
                 current_status = json.dumps(session)
                 if current_status != last_status:
@@ -2877,13 +3143,21 @@ def stream_research_status(jd_id):
                 if status in ['completed', 'failed']:
                     break
 
-                # Stream every 500ms
-                time.sleep(0.5)
+                time.sleep(poll_interval_seconds)
 
             except Exception as e:
                 yield f"data: {json.dumps({'error': str(e)})}\n\n"
                 break
 
+    def generate():
+        from research_progress import progress_bus
+
+        if progress_bus.is_tracking(jd_id):
+            yield from stream_from_bus(progress_bus)
+        else:
+            # Cross-worker fallback: the run lives in another process
+            yield from poll_supabase()
+
     return Response(generate(), mimetype='text/event-stream', headers={
         'Cache-Control': 'no-cache',
         'X-Accel-Buffering': 'no'
@@ -2987,32 +3261,61 @@ def get_research_results(jd_id):
         return jsonify({'error': str(e)}), 500
 
 
+RESEARCH_CSV_PAGE_SIZE = 500  # target_companies rows read per Supabase request while streaming
+
 @app.route('/research-companies/<jd_id>/export-csv', methods=['GET'])
 def export_research_csv(jd_id):
-    """Export research results as CSV."""
+    """
+    Export research results as CSV.
+
+    Query params:
+        format: "csv" streams the CSV download itself; by default the response
+            is JSON {success, csv_data, filename}
+    """
     try:
+        stream_csv = request.args.get('format') == 'csv'
+
         from supabase import create_client
         supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
 
-        # Get all companies for this JD
-        result = supabase.table("target_companies").select("*").eq(
-            "jd_id", jd_id
-        ).order("relevance_score", desc=True).execute()
-
-        if not result.data:
+        def fetch_companies(offset):
+            result = supabase.table("target_companies").select(
+                "company_name,relevance_score,category,industry,employee_count,"
+                "funding_stage,headquarters_location,relevance_reasoning,discovered_via"
+            ).eq(
+                "jd_id", jd_id
+            ).order("relevance_score", desc=True).order("id").range(
+                offset, offset + RESEARCH_CSV_PAGE_SIZE - 1
+            ).execute()
+            return result.data or []
+
+        # First page up front so a missing JD still gets a JSON 404
+        first_page = fetch_companies(0)
+        if not first_page:
             return jsonify({'error': 'No results found'}), 404
 
-        companies = result.data
-
-        # Build CSV
-        import csv
-        import io
-
-        output = io.StringIO()
-        writer = csv.writer(output)
+        def company_rows():
+            companies = first_page
+            offset = 0
+            while companies:
+                for company in companies:
+                    yield [
+                        company.get('company_name', ''),
+                        company.get('relevance_score', ''),
+                        company.get('category', ''),
+                        company.get('industry', ''),
+                        company.get('employee_count', ''),
+                        company.get('funding_stage', ''),
+                        company.get('headquarters_location', ''),
+                        company.get('relevance_reasoning', ''),
+                        company.get('discovered_via', '')
+                    ]
+                if len(companies) < RESEARCH_CSV_PAGE_SIZE:
+                    break
+                offset += RESEARCH_CSV_PAGE_SIZE
+                companies = fetch_companies(offset)
 
-        # Header
-        writer.writerow([
+        header = [
             'Company Name',
             'Relevance Score',
             'Category',
@@ -3022,28 +3325,21 @@ def export_research_csv(jd_id):
             'Headquarters',
             'Why Relevant',
             'Discovered Via'
-        ])
+        ]
 
-        # Data rows
-        for company in companies:
-            writer.writerow([
-                company.get('company_name', ''),
-                company.get('relevance_score', ''),
-                company.get('category', ''),
-                company.get('industry', ''),
-                company.get('employee_count', ''),
-                company.get('funding_stage', ''),
-                company.get('headquarters_location', ''),
-                company.get('relevance_reasoning', ''),
-                company.get('discovered_via', '')
-            ])
-
-        csv_data = output.getvalue()
+        filename = f'company_research_{jd_id[:8]}.csv'
+
+        if stream_csv:
+            return Response(
+                stream_with_context(iter_csv(header, company_rows())),
+                mimetype='text/csv',
+                headers=csv_download_headers(filename)
+            )
 
         return jsonify({
             'success': True,
-            'csv_data': csv_data,
-            'filename': f'company_research_{jd_id[:8]}.csv'
+            'csv_data': csv_string(header, company_rows()),
+            'filename': filename
         })
 
     except Exception as e:
@@ -3230,6 +3526,14 @@ def search_by_company_list():
     """
     Search for people at a list of companies using CoreSignal.
 
+    Each company is resolved to a CoreSignal ID and searched as its own task;
+    tasks run concurrently under the shared CoreSignal rate limit. With
+    "search_mode": "combined", all companies are resolved first and then
+    searched together with chunked `terms` queries (fewer CoreSignal calls but
+    an uneven split of profiles across companies; streamed results arrive once
+    the combined search finishes). Both modes report the number of /preview
+    requests made as "preview_requests".
+
     Request Body:
     {
         "company_names": ["Deepgram", "AssemblyAI", "ElevenLabs"],
@@ -3238,7 +3542,9 @@ def search_by_company_list():
             "seniority": "senior",  # Optional
             "location": "San Francisco"  # Optional
         },
-        "max_per_company": 20  # Optional, default 20
+        "max_per_company": 20,  # Optional, default 20
+        "search_mode": "per_company",  # Optional - "per_company" (default) or "combined"
+        "stream": false  # Optional - stream NDJSON per company as each completes
     }
 
     Returns:
@@ -3254,96 +3560,223 @@ def search_by_company_list():
                 ...
             ],
             "total_people": 45,
+            "preview_requests": 3,
             "search_time_seconds": 5.2
         }
+
+        With "stream": true, one JSON object per line instead:
+            {"type": "company", "index": 0, "match": {...}, "people": [...]}  (per company, completion order)
+            {"type": "done", "success": true, "total_people": 45, "companies_matched": 3, "preview_requests": 3, "search_time_seconds": 5.2}
     """
     try:
         import time
+        from concurrent.futures import as_completed
         start_time = time.time()
 
         data = request.get_json()
         company_names = data.get("company_names", [])
         filters = data.get("filters", {})
         max_per_company = data.get("max_per_company", 20)
+        search_mode = data.get("search_mode", "per_company")
+        stream = bool(data.get("stream", False))
 
         if not company_names:
             return jsonify({'error': 'company_names is required'}), 400
 
+        if search_mode not in ("per_company", "combined"):
+            return jsonify({'error': 'search_mode must be "per_company" or "combined"'}), 400
+
         print(f"\n{'='*100}")
         print(f"[COMPANY SEARCH] Searching for people at {len(company_names)} companies")
         print(f"[COMPANY SEARCH] Filters: {filters}")
         print(f"{'='*100}\n")
 
-        # Step 1: Look up CoreSignal company IDs
         from coresignal_company_lookup import CoreSignalCompanyLookup
+        from coresignal_service import (
+            PreviewRequestCounter, search_profiles_by_company_id, search_profiles_by_company_ids
+        )
+        from coresignal_rate_limit import CORESIGNAL_MAX_CONCURRENT
         lookup_service = CoreSignalCompanyLookup()
+        # /preview requests made by this search, to compare the two modes
+        request_counter = PreviewRequestCounter()
 
-        company_matches = []
-        coresignal_company_ids = []
+        # Names resolved before come from company_id_resolutions, not the API
+        cached_count = lookup_service.prefetch(company_names)
+        print(f"[COMPANY SEARCH] {cached_count}/{len(company_names)} company IDs from stored resolutions")
 
-        for company_name in company_names:
+        # Two names resolving to the same CoreSignal company are only searched once
+        claimed_ids = {}
+        claimed_lock = threading.Lock()
+
+        def failed_match(company_name, error):
+            return {
+                "company_name": company_name,
+                "coresignal_id": None,
+                "confidence": 0.0,
+                "error": error
+            }
+
+        def resolve_company(company_name):
+            """(company_match, searchable) - not searchable if unmatched or a duplicate ID."""
             match = lookup_service.get_best_match(company_name, confidence_threshold=0.7)
 
-            if match:
-                company_matches.append({
-                    "company_name": company_name,
-                    "coresignal_name": match["name"],
-                    "coresignal_id": match["company_id"],
-                    "confidence": match["confidence"],
-                    "website": match.get("website"),
-                    "employee_count": match.get("employee_count")
-                })
-                coresignal_company_ids.append(match["company_id"])
-                print(f"✓ {company_name} → {match['name']} (ID: {match['company_id']}, confidence: {match['confidence']})")
-            else:
+            if not match:
                 print(f"✗ {company_name} → No match found")
-                company_matches.append({
-                    "company_name": company_name,
-                    "coresignal_id": None,
-                    "confidence": 0.0,
-                    "error": "No matching company found"
-                })
+                return failed_match(company_name, "No matching company found"), False
+
+            company_match = {
+                "company_name": company_name,
+                "coresignal_name": match["name"],
+                "coresignal_id": match["company_id"],
+                "confidence": match["confidence"],
+                "website": match.get("website"),
+                "employee_count": match.get("employee_count")
+            }
+            print(f"✓ {company_name} → {match['name']} (ID: {match['company_id']}, confidence: {match['confidence']})")
+
+            with claimed_lock:
+                duplicate_of = claimed_ids.setdefault(match["company_id"], company_name)
+            if duplicate_of != company_name:
+                company_match["people_found"] = 0
+                company_match["duplicate_of"] = duplicate_of
+                return company_match, False
+
+            return company_match, True
+
+        def search_company(company_name):
+            # Step 1: Look up CoreSignal company ID
+            company_match, searchable = resolve_company(company_name)
+            if not searchable:
+                return company_match, []
+
+            # Step 2: Search for people at this company
+            people = search_profiles_by_company_id(
+                company_match["coresignal_id"],
+                title=filters.get("title"),
+                seniority=filters.get("seniority"),
+                location=filters.get("location"),
+                max_per_company=max_per_company,
+                request_counter=request_counter
+            )
+            company_match["people_found"] = len(people)
+            return company_match, people
+
+        def run_searches():
+            """Yield (index, company_match, people) as each company completes."""
+            workers = max(1, min(CORESIGNAL_MAX_CONCURRENT, len(company_names)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(search_company, company_name): index
+                    for index, company_name in enumerate(company_names)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        company_match, people = future.result()
+                    except Exception as e:
+                        print(f"✗ {company_names[index]} → Search failed: {e}")
+                        company_match, people = failed_match(company_names[index], str(e)), []
+                    yield index, company_match, people
+
+        def run_combined_searches():
+            """Resolve every company, search them all with chunked terms queries, then yield in input order."""
+            def resolve_safely(company_name):
+                try:
+                    return resolve_company(company_name)
+                except Exception as e:
+                    print(f"✗ {company_name} → Lookup failed: {e}")
+                    return failed_match(company_name, str(e)), False
+
+            workers = max(1, min(CORESIGNAL_MAX_CONCURRENT, len(company_names)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                resolved = list(executor.map(resolve_safely, company_names))
+
+            company_ids = [company_match["coresignal_id"] for company_match, searchable in resolved if searchable]
+            people_by_id = {}
+            for person in search_profiles_by_company_ids(
+                company_ids,
+                title=filters.get("title"),
+                seniority=filters.get("seniority"),
+                location=filters.get("location"),
+                max_per_company=max_per_company,
+                mode="combined",
+                request_counter=request_counter
+            ):
+                people_by_id.setdefault(str(person["company_id"]), []).append(person)
+
+            for index, (company_match, searchable) in enumerate(resolved):
+                people = people_by_id.get(str(company_match["coresignal_id"]), []) if searchable else []
+                if searchable:
+                    company_match["people_found"] = len(people)
+                yield index, company_match, people
+
+        searches = run_combined_searches if search_mode == "combined" else run_searches
+
+        def log_summary(companies_matched, total_people, search_time):
+            print(f"\n{'='*100}")
+            print(f"[COMPANY SEARCH] Search complete")
+            print(f"[COMPANY SEARCH] Companies matched: {companies_matched}/{len(company_names)}")
+            print(f"[COMPANY SEARCH] Total people found: {total_people}")
+            print(f"[COMPANY SEARCH] /preview requests ({search_mode}): {request_counter.count}")
+            print(f"[COMPANY SEARCH] Time: {search_time:.1f}s")
+            print(f"{'='*100}\n")
+
+        if stream:
+            def generate():
+                companies_matched = 0
+                total_people = 0
+                for index, company_match, people in searches():
+                    if company_match.get("coresignal_id"):
+                        companies_matched += 1
+                    total_people += len(people)
+                    yield json.dumps({
+                        'type': 'company',
+                        'index': index,
+                        'match': company_match,
+                        'people': people
+                    }) + "\n"
+
+                search_time = time.time() - start_time
+                log_summary(companies_matched, total_people, search_time)
+                yield json.dumps({
+                    'type': 'done',
+                    'success': companies_matched > 0,
+                    'companies_matched': companies_matched,
+                    'total_people': total_people,
+                    'preview_requests': request_counter.count,
+                    'search_time_seconds': round(search_time, 2)
+                }) + "\n"
+
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'
+            })
 
-        if not coresignal_company_ids:
+        # Collect everything, keeping the input order of company_names
+        company_matches = [None] * len(company_names)
+        people_by_company = [[] for _ in company_names]
+        for index, company_match, people in searches():
+            company_matches[index] = company_match
+            people_by_company[index] = people
+
+        people = [person for company_people in people_by_company for person in company_people]
+        companies_matched = len([m for m in company_matches if m.get('coresignal_id')])
+        search_time = time.time() - start_time
+        log_summary(companies_matched, len(people), search_time)
+
+        if not companies_matched:
             return jsonify({
                 'success': False,
                 'error': 'No matching companies found in CoreSignal database',
                 'company_matches': company_matches
             }), 404
 
-        # Step 2: Search for people at these companies via CoreSignal
-        from coresignal_service import search_profiles_by_company_ids
-
-        people = search_profiles_by_company_ids(
-            company_ids=coresignal_company_ids,
-            title=filters.get("title"),
-            seniority=filters.get("seniority"),
-            location=filters.get("location"),
-            max_per_company=max_per_company
-        )
-
-        # Add people_found count to each company match
-        for match in company_matches:
-            if match.get("coresignal_id"):
-                match["people_found"] = len([
-                    p for p in people
-                    if p.get("company_id") == match["coresignal_id"]
-                ])
-
-        search_time = time.time() - start_time
-
-        print(f"\n{'='*100}")
-        print(f"[COMPANY SEARCH] Search complete")
-        print(f"[COMPANY SEARCH] Companies matched: {len([m for m in company_matches if m.get('coresignal_id')])}/{len(company_names)}")
-        print(f"[COMPANY SEARCH] Total people found: {len(people)}")
-        print(f"[COMPANY SEARCH] Time: {search_time:.1f}s")
-        print(f"{'='*100}\n")
-
         return jsonify({
             'success': True,
             'company_matches': company_matches,
             'people': people,
             'total_people': len(people),
+            'preview_requests': request_counter.count,
             'search_time_seconds': round(search_time, 2)
         })
 
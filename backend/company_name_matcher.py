@@ -0,0 +1,237 @@
+"""
+Company Name Matching
+Normalisation and fuzzy matching of company names so the same company is
+recognised across spellings ("Deepgram, Inc." / "deepgram" / "DeepGram Inc").
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+# Legal-entity suffixes dropped from the end of a name during normalisation
+COMPANY_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company",
+    "ltd", "limited", "llc", "llp", "lp", "plc", "gmbh", "ag", "sa",
+    "sas", "srl", "bv", "nv", "pty", "pvt", "oy", "ab", "as", "kk"
+}
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalise a company name to a stable lookup key.
+
+    Lowercases, strips accents and punctuation, collapses whitespace and
+    removes trailing legal suffixes (Inc, Ltd, LLC, GmbH...).
+
+    Args:
+        name: Raw company name
+
+    Returns:
+        Normalised name (empty string if nothing is left)
+    """
+    if not name:
+        return ""
+
+    # Strip accents ("Nestlé" -> "nestle") and lowercase
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+    # "&" carries meaning in names like "AT&T" - keep it as a word
+    text = text.replace("&", " and ")
+    tokens = _NON_ALPHANUMERIC.sub(" ", text).split()
+
+    # Drop trailing legal suffixes, but never the whole name
+    while len(tokens) > 1 and tokens[-1] in COMPANY_SUFFIXES:
+        tokens.pop()
+
+    return " ".join(tokens)
+
+
+def bounded_levenshtein(s1: str, s2: str, max_distance: int) -> Optional[int]:
+    """
+    Levenshtein distance, giving up as soon as it must exceed max_distance.
+
+    Only the diagonal band |i - j| <= max_distance of the DP matrix is
+    computed, and the scan stops once a whole row is over the bound.
+
+    Args:
+        s1: First string
+        s2: Second string
+        max_distance: Largest distance of interest
+
+    Returns:
+        Edit distance, or None if it is greater than max_distance
+    """
+    if abs(len(s1) - len(s2)) > max_distance:
+        return None
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if not s2:
+        return len(s1)
+
+    over = max_distance + 1
+    previous_row = [j if j <= max_distance else over for j in range(len(s2) + 1)]
+
+    for i, c1 in enumerate(s1, 1):
+        low = max(1, i - max_distance)
+        high = min(len(s2), i + max_distance)
+
+        current_row = [over] * (len(s2) + 1)
+        current_row[0] = i if i <= max_distance else over
+        row_min = current_row[0]
+
+        for j in range(low, high + 1):
+            cost = previous_row[j - 1] + (c1 != s2[j - 1])
+            cost = min(cost, previous_row[j] + 1, current_row[j - 1] + 1)
+            current_row[j] = min(cost, over)
+            row_min = min(row_min, current_row[j])
+
+        # Early exit: every path through this row already exceeds the bound
+        if row_min > max_distance:
+            return None
+        previous_row = current_row
+
+    distance = previous_row[-1]
+    return distance if distance <= max_distance else None
+
+
+def edit_similarity(name1: str, name2: str, min_similarity: float = 0.0) -> float:
+    """
+    Edit-distance similarity (1.0 = identical) with an early-exit floor.
+
+    Returns 0.0 as soon as the similarity is known to be below min_similarity.
+    """
+    if name1 == name2:
+        return 1.0
+
+    max_len = max(len(name1), len(name2))
+    if not name1 or not name2:
+        return 0.0
+
+    # Small epsilon so e.g. 0.9 * 10 chars allows exactly 1 edit despite float error
+    max_distance = int((1.0 - min_similarity) * max_len + 1e-9)
+    distance = bounded_levenshtein(name1, name2, max_distance)
+    if distance is None:
+        return 0.0
+    return 1.0 - (distance / max_len)
+
+
+def name_similarity(name1: str, name2: str, min_similarity: float = 0.5) -> float:
+    """
+    Similarity score between two company names.
+
+    - Exact match (after normalisation): 1.0
+    - One name contains the other: 0.9
+    - Edit-distance based: 0.0-0.8 (0.0 below min_similarity)
+
+    Args:
+        name1: First company name
+        name2: Second company name
+        min_similarity: Edit-distance similarities below this return 0.0 early
+
+    Returns:
+        Similarity score from 0.0 to 1.0
+    """
+    name1 = normalize_company_name(name1)
+    name2 = normalize_company_name(name2)
+
+    if not name1 or not name2:
+        return 0.0
+
+    # Exact match
+    if name1 == name2:
+        return 1.0
+
+    # Substring match
+    if name1 in name2 or name2 in name1:
+        return 0.9
+
+    # Cap at 0.8 for non-exact matches
+    return min(edit_similarity(name1, name2, min_similarity), 0.8)
+
+
+def _trigrams(normalized_name: str) -> Set[str]:
+    padded = f"  {normalized_name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CompanyNameIndex:
+    """
+    In-memory fuzzy index of company names.
+
+    Names are normalised (normalize_company_name) and indexed by character
+    trigrams. A lookup is an exact dict hit or, failing that, scores only the
+    candidates sharing the most trigrams with the query, using a bounded edit
+    distance that exits early.
+    """
+
+    # Fuzzy candidates scored per lookup (most shared trigrams first)
+    MAX_CANDIDATES = 25
+
+    def __init__(self, min_similarity: float = 0.9):
+        """
+        Args:
+            min_similarity: Default edit similarity (0-1) for a fuzzy match
+        """
+        self.min_similarity = min_similarity
+        self._names: List[str] = []
+        self._values: List[Any] = []
+        self._exact: Dict[str, int] = {}
+        self._trigram_index: Dict[str, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, value: Any = None) -> bool:
+        """
+        Index a name with an associated value (defaults to the name itself).
+
+        Returns:
+            False if the name normalises to empty or is already indexed
+        """
+        normalized = normalize_company_name(name)
+        if not normalized or normalized in self._exact:
+            return False
+
+        entry_id = len(self._names)
+        self._names.append(normalized)
+        self._values.append(name if value is None else value)
+        self._exact[normalized] = entry_id
+        for gram in _trigrams(normalized):
+            self._trigram_index[gram].append(entry_id)
+        return True
+
+    def match(self, name: str, min_similarity: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """
+        Find the best indexed match for a name.
+
+        Returns:
+            (value, similarity) or None if nothing reaches min_similarity
+        """
+        normalized = normalize_company_name(name)
+        if not normalized:
+            return None
+
+        entry_id = self._exact.get(normalized)
+        if entry_id is not None:
+            return self._values[entry_id], 1.0
+
+        threshold = self.min_similarity if min_similarity is None else min_similarity
+        shared = Counter()
+        for gram in _trigrams(normalized):
+            for candidate_id in self._trigram_index.get(gram, ()):
+                shared[candidate_id] += 1
+
+        best_id, best_score = None, threshold
+        for candidate_id, _ in shared.most_common(self.MAX_CANDIDATES):
+            score = edit_similarity(normalized, self._names[candidate_id], best_score)
+            if score >= best_score and score > 0:
+                best_id, best_score = candidate_id, score
+
+        if best_id is None:
+            return None
+        return self._values[best_id], best_score
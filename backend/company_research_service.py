@@ -6,14 +6,22 @@ Uses multi-method discovery and AI-powered scoring.
 
 import asyncio
 import aiohttp
+import concurrent.futures
+import contextvars
+import hashlib
 import json
 import os
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Coroutine
 from datetime import datetime, timezone, timedelta
 import re
-from anthropic import Anthropic, RateLimitError
-from supabase import create_client, Client
+from anthropic import AsyncAnthropic, RateLimitError
+from supabase import acreate_client, AsyncClient
 from gpt5_client import GPT5Client
+from research_progress import SessionStatusWriter
+from company_name_matcher import CompanyNameIndex, normalize_company_name
 from config import EXCLUDED_COMPANIES, is_excluded_company
 
 
@@ -26,6 +34,13 @@ class CompanyResearchConfig:
     MIN_COMPANY_SIZE = 10
     MAX_DISCOVERY_TIME_SECONDS = 120
 
+    # Fuzzy name de-duplication (edit similarity after normalisation)
+    DEDUP_NAME_SIMILARITY = 0.9
+
+    # Discovery cache settings (shared across JDs, keyed by normalised seed name)
+    DISCOVERY_CACHE_TTL_DAYS = 7          # LLM-extracted competitors per seed
+    DISCOVERY_SEARCH_CACHE_TTL_DAYS = 7   # Raw Tavily results per seed
+
     # Scoring settings
     MIN_RELEVANCE_SCORE = 5.0
     COMPETITOR_SCORE_BOOST = 2.0
@@ -33,14 +48,32 @@ class CompanyResearchConfig:
     # GPT-5 settings
     USE_GPT5 = True
     GPT5_BATCH_SIZE = 20  # Companies per batch
+    SCREENING_MAX_CONCURRENT_BATCHES = 3  # Screening batches in flight at once
+    SCREENING_MAX_RETRIES = 2             # Re-screens for a failed/mismatched batch
+
+    # Deep research settings
+    DEEP_RESEARCH_MAX_CONCURRENT = 8      # Companies evaluated at once
+    DEEP_RESEARCH_TIMEOUT_SECONDS = 90    # Per-company evaluation timeout
+    DEEP_RESEARCH_MAX_RETRIES = 2         # Retries per company (exponential backoff)
 
     # Fallback settings
     FALLBACK_TO_CLAUDE = True
     CLAUDE_MODEL = "claude-haiku-4-5-20251001"
 
+    # Persistence settings
+    SAVE_CHUNK_SIZE = 500  # Rows per target_companies upsert request
+
+    # Session status settings
+    STATUS_FLUSH_INTERVAL_MS = 1000  # Max one progress write per session per interval
+
     # API settings
     USE_TAVILY = True
     TAVILY_BASE_URL = "https://api.tavily.com/search"
+    TAVILY_MAX_CONCURRENT = 5         # Searches in flight at once
+    TAVILY_REQUESTS_PER_SECOND = 5.0  # Request start rate across all searches
+    WEB_SEARCH_CACHE_TTL_SECONDS = 6 * 60 * 60  # In-process Tavily query-result cache
+    WEB_SEARCH_CACHE_MAX_ENTRIES = 500
+    HTTP_TIMEOUT_SECONDS = 60
 
     # Authoritative Sources for Competitive Intelligence
     # Prioritized list of trusted company directories and comparison sites
@@ -73,6 +106,82 @@ class CompanyResearchConfig:
     USE_CASE_MODE = "competitive_intelligence"  # Changed from recruiting to competitive analysis
 
 
+# Content hashes of result pages already sent to an extraction prompt during
+# the current research run (set per run in research_companies_for_jd; tasks
+# spawned by the run inherit the same set)
+_run_seen_pages: contextvars.ContextVar[Optional[set]] = contextvars.ContextVar(
+    "run_seen_pages", default=None
+)
+
+
+# ========================================
+# Shared Event Loop
+# ========================================
+
+_service_loop: Optional[asyncio.AbstractEventLoop] = None
+_service_loop_lock = threading.Lock()
+
+
+def get_service_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the long-lived event loop that runs all company research coroutines.
+
+    The async clients (AsyncAnthropic, async Supabase, aiohttp session) are bound
+    to the loop they are first used on, so every research run is scheduled onto
+    one background loop instead of a fresh loop per request. This also lets
+    concurrent runs overlap their I/O.
+    """
+    global _service_loop
+    with _service_loop_lock:
+        if _service_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="company-research-loop",
+                daemon=True
+            )
+            thread.start()
+            _service_loop = loop
+    return _service_loop
+
+
+def run_in_service_loop(coro: Coroutine) -> concurrent.futures.Future:
+    """
+    Schedule a coroutine on the shared research loop from sync (Flask) code.
+
+    Returns a concurrent.futures.Future; call .result() to block for the value
+    or ignore it for fire-and-forget background runs.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_service_loop())
+
+
+class AsyncRateLimiter:
+    """
+    Spaces out request starts to at most `rate` per second.
+
+    Shared by all tasks on the research loop; each caller reserves the next
+    free slot and sleeps until it arrives.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait for the next request slot."""
+        if not self.interval:
+            return
+
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
 class CompanyResearchService:
     """
     Discovers and evaluates companies for recruiting based on job requirements.
@@ -88,18 +197,63 @@ class CompanyResearchService:
         if os.getenv("OPENAI_API_KEY"):
             self.gpt5_client = GPT5Client()
 
-        self.claude_client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.claude_client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
         self.tavily_api_key = os.getenv("TAVILY_API_KEY")
         self.coresignal_api_key = os.getenv("CORESIGNAL_API_KEY")
 
-        # Initialize Supabase
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_KEY")
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+        # Supabase async client and shared aiohttp session are created lazily
+        # on the shared research loop (see get_service_loop)
+        self.supabase_url = os.getenv("SUPABASE_URL")
+        self.supabase_key = os.getenv("SUPABASE_KEY")
+        self._supabase: Optional[AsyncClient] = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        self._client_lock = asyncio.Lock()
+
+        # Shared Tavily concurrency and rate cap for all discovery searches
+        self._tavily_semaphore = asyncio.Semaphore(self.config.TAVILY_MAX_CONCURRENT)
+        self._tavily_rate_limiter = AsyncRateLimiter(self.config.TAVILY_REQUESTS_PER_SECOND)
+
+        # Tavily query-result cache (normalised query → (expires_at, results))
+        # and in-flight searches, so identical queries are paid for once
+        self._web_search_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._web_search_inflight: Dict[str, asyncio.Future] = {}
+
+        # Coalesces progress updates into throttled session writes and
+        # publishes every update to the in-process progress bus
+        self.status_writer = SessionStatusWriter(
+            self._get_supabase,
+            flush_interval_ms=self.config.STATUS_FLUSH_INTERVAL_MS
+        )
 
         # Track discovered companies to avoid duplicates
         self.discovered_companies = set()
 
+    # ========================================
+    # Async Client Management
+    # ========================================
+
+    async def _get_supabase(self) -> AsyncClient:
+        """Get the async Supabase client, creating it on first use."""
+        if self._supabase is None:
+            async with self._client_lock:
+                if self._supabase is None:
+                    self._supabase = await acreate_client(self.supabase_url, self.supabase_key)
+        return self._supabase
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it on first use."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.config.HTTP_TIMEOUT_SECONDS)
+            )
+        return self._http_session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session and Anthropic client."""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        await self.claude_client.close()
+
     # ========================================
     # Main Orchestration
     # ========================================
@@ -121,6 +275,9 @@ class CompanyResearchService:
         Returns:
             Research results with discovered companies
         """
+        # Fresh page de-duplication scope for this run's extraction prompts
+        _run_seen_pages.set(set())
+
         try:
             # Create/update research session
             await self._create_research_session(jd_id, jd_data, config)
@@ -254,7 +411,8 @@ class CompanyResearchService:
         """
         try:
             # Retrieve session data
-            session_response = self.supabase.table("company_research_sessions").select("*").eq(
+            supabase = await self._get_supabase()
+            session_response = await supabase.table("company_research_sessions").select("*").eq(
                 "jd_id", jd_id
             ).execute()
 
@@ -262,7 +420,8 @@ class CompanyResearchService:
                 raise ValueError(f"Session not found: {jd_id}")
 
             session = session_response.data[0]
-            search_config = session.get("search_config", {})
+            search_config = session.get("search_config") or {}
+            self.status_writer.start(jd_id, session)
             screened_companies = search_config.get("screened_companies", [])
             jd_context = search_config.get("jd_context", {})
 
@@ -328,7 +487,8 @@ class CompanyResearchService:
         1. Seed expansion (competitors of mentioned companies)
         2. Web search (Tavily)
         """
-        companies = []
+        seed_queries_task = None
+        web_queries_task = None
 
         # Method 1: Expand seed companies (filter excluded companies first)
         if seed_companies:
@@ -349,24 +509,29 @@ class CompanyResearchService:
                 })
 
             # Batch extract: 1 Claude call instead of 15 (3 per seed × 5 seeds)
-            competitors_by_seed = await self.batch_extract_companies_from_seeds(seeds_to_process)
+            seed_queries_task = asyncio.create_task(
+                self.batch_extract_companies_from_seeds(seeds_to_process)
+            )
+
+        # Method 2: Direct web search (runs alongside seed expansion under the Tavily cap)
+        if self.config.USE_TAVILY and self.tavily_api_key:
+            search_queries = self._generate_search_queries(jd_context)[:5]  # Increased to 5 to leverage multiple seed companies
+            web_queries_task = asyncio.create_task(
+                self._discover_from_web_queries(search_queries, jd_id)
+            )
+
+        companies = []
+
+        if seed_queries_task:
+            competitors_by_seed = await seed_queries_task
 
             # Flatten results
             for seed, competitors in competitors_by_seed.items():
                 print(f"   ✅ {seed}: {len(competitors)} competitors found")
                 companies.extend(competitors)
 
-        # Method 2: Direct web search
-        if self.config.USE_TAVILY and self.tavily_api_key:
-            search_queries = self._generate_search_queries(jd_context)
-            for i, query in enumerate(search_queries[:5], 1):  # Increased to 5 to leverage multiple seed companies
-                if jd_id:
-                    await self._update_session_status(jd_id, "running", {
-                        "phase": "discovery",
-                        "action": f"Web search: \"{query[:50]}...\" ({i}/{min(len(search_queries), 5)})"
-                    })
-                web_results = await self._search_web(query)
-                companies.extend(await self._extract_companies_from_web(web_results, query))
+        if web_queries_task:
+            companies.extend(await web_queries_task)
 
         # Deduplicate
         if jd_id:
@@ -406,10 +571,48 @@ class CompanyResearchService:
 
         return enriched
 
+    async def _discover_from_web_queries(
+        self,
+        queries: List[str],
+        jd_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run direct web-search queries concurrently.
+
+        Each query is extracted as soon as its own search returns, so Claude
+        extraction overlaps with the searches still in flight. Results are
+        returned in query order to keep deduplication deterministic.
+        """
+        async def search_and_extract(index: int, query: str):
+            try:
+                web_results = await self._search_web(query)
+                return index, query, await self._extract_companies_from_web(web_results, query)
+            except Exception as e:
+                print(f"Web search discovery failed for \"{query[:50]}\": {e}")
+                return index, query, []
+
+        total = len(queries)
+        results_by_query: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        tasks = [search_and_extract(i, query) for i, query in enumerate(queries)]
+
+        for completed, next_result in enumerate(asyncio.as_completed(tasks), 1):
+            index, query, found = await next_result
+            results_by_query[index] = found
+
+            if jd_id:
+                await self._update_session_status(jd_id, "running", {
+                    "phase": "discovery",
+                    "action": f"Web search: \"{query[:50]}...\" ({completed}/{total}, {len(found)} companies)"
+                })
+
+        return [company for found in results_by_query for company in found]
+
     async def search_competitors_web(self, company_name: str) -> List[Dict[str, Any]]:
         """
         Find competitor companies via web search.
-        Uses company-level cache to avoid redundant API calls (7-day TTL).
+        Uses the shared discovery cache (keyed by normalised company name) to
+        avoid redundant API calls - extracted competitors and raw Tavily
+        results are cached separately (see DISCOVERY_CACHE_TTL_DAYS).
 
         Args:
             company_name: Seed company to find competitors for
@@ -420,65 +623,41 @@ class CompanyResearchService:
         if not self.config.USE_TAVILY or not self.tavily_api_key:
             return []
 
-        # STEP 1: Check cache first (case-insensitive)
-        seed_lower = company_name.lower().strip()
+        # STEP 1: Check cache first (normalised name: case, punctuation, Inc/Ltd...)
+        seed_key = normalize_company_name(company_name)
+        cached_entry = (await self._load_discovery_cache([company_name])).get(seed_key)
 
-        try:
-            cache_result = self.supabase.table("company_discovery_cache").select("*").eq(
-                "seed_company", seed_lower
-            ).execute()
-
-            if cache_result.data:
-                cached_entry = cache_result.data[0]
-                expires_at = datetime.fromisoformat(cached_entry['expires_at'].replace('Z', '+00:00'))
+        cached_companies = self._cached_extraction(cached_entry)
+        if cached_companies is not None:
+            # ✅ Cache hit - return cached results
+            print(f"   ✅ Cache HIT for '{company_name}' - {len(cached_companies)} companies (saved 3 API calls)")
+            return cached_companies
 
-                if datetime.now(timezone.utc) < expires_at:
-                    # ✅ Cache hit - return cached results
-                    cached_companies = cached_entry.get('discovered_companies', [])
-                    print(f"   ✅ Cache HIT for '{company_name}' - {len(cached_companies)} companies (saved 3 API calls)")
-                    return cached_companies
-                else:
-                    # ⏰ Cache expired - delete and refresh
-                    print(f"   ⏰ Cache expired for '{company_name}' - refreshing")
-                    self.supabase.table("company_discovery_cache").delete().eq(
-                        "seed_company", seed_lower
-                    ).execute()
-        except Exception as e:
-            # Cache check failed - continue with fresh discovery (table may not exist yet)
-            if 'PGRST205' not in str(e):  # Only log if not "table not found"
-                print(f"   ⚠️  Cache check failed for '{company_name}': {e}")
+        # STEP 2: Cache miss - run fresh discovery (reusing cached Tavily results if fresh)
+        queries = self._seed_queries(company_name)
+        search_results = self._cached_search_results(cached_entry, queries)
 
-        # STEP 2: Cache miss - run fresh discovery
-        print(f"   🔍 Cache MISS for '{company_name}' - running discovery (3 API calls)")
+        if search_results is None:
+            print(f"   🔍 Cache MISS for '{company_name}' - running discovery (3 API calls)")
 
-        queries = [
-            f"{company_name} competitors",
-            f"companies like {company_name}",
-            f"{company_name} alternatives"
-        ]
+            # Searches run concurrently; _search_web enforces the Tavily rate cap
+            search_results = await asyncio.gather(*[self._search_web(query) for query in queries])
+            await self._save_discovery_search_results({company_name: list(zip(queries, search_results))})
+        else:
+            print(f"   ♻️  Reusing cached search results for '{company_name}' - extracting only")
 
+        # Pages are de-duplicated across this seed's queries only - the result
+        # is cached per seed, so it must not depend on other seeds in the run
+        seed_seen = set()
         competitors = []
-        for query in queries:
-            results = await self._search_web(query)
-            companies = await self._extract_companies_from_web(results, query)
+        for query, results in zip(queries, search_results):
+            companies = await self._extract_companies_from_web(results, query, seed_seen)
             competitors.extend(companies)
-            await asyncio.sleep(0.2)  # 200ms delay to prevent rate limit burst
 
         top_competitors = competitors[:20]  # Keep top 20
 
         # STEP 3: Save to cache
-        try:
-            self.supabase.table("company_discovery_cache").upsert({
-                "seed_company": seed_lower,
-                "discovered_companies": top_competitors,
-                "search_queries": queries,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "expires_at": (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
-            }).execute()
-            print(f"   💾 Cached {len(top_competitors)} companies for '{company_name}' (expires in 7 days)")
-        except Exception as e:
-            # Non-critical - continue even if cache save fails
-            print(f"   ⚠️  Failed to cache results for '{company_name}': {e}")
+        await self._save_discovery_extractions({company_name: top_competitors})
 
         return top_competitors
 
@@ -487,6 +666,10 @@ class CompanyResearchService:
         Extract companies for multiple seeds in a single batched Claude API call.
         This dramatically reduces API calls: 15 individual calls → 1 batched call.
 
+        Checks the shared discovery cache first: seeds with a fresh cached
+        extraction skip Tavily and Claude entirely, and seeds with fresh cached
+        Tavily results skip only the searches.
+
         Args:
             seeds: List of seed company names (max 5)
 
@@ -496,38 +679,93 @@ class CompanyResearchService:
         if not seeds or not self.config.USE_TAVILY or not self.tavily_api_key:
             return {seed: [] for seed in seeds}
 
+        cache = await self._load_discovery_cache(seeds)
+
+        result = {}
+        seeds_to_extract = []
+        for seed in seeds:
+            cached_companies = self._cached_extraction(cache.get(normalize_company_name(seed)))
+            if cached_companies is not None:
+                print(f"   ✅ Cache HIT for '{seed}' - {len(cached_companies)} companies (saved 3 searches + extraction)")
+                result[seed] = cached_companies
+            else:
+                seeds_to_extract.append(seed)
+
+        if seeds_to_extract:
+            result.update(await self._batch_extract_uncached_seeds(seeds_to_extract, cache))
+
+        return result
+
+    async def _batch_extract_uncached_seeds(
+        self,
+        seeds: List[str],
+        cache: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, List[Dict]]:
+        """
+        Batched search + extraction for seeds without a cached extraction.
+
+        Args:
+            seeds: Seed company names to extract
+            cache: Discovery cache rows keyed by normalised seed name
+        """
         print(f"   📦 Batching {len(seeds)} seed companies into 1 Claude call...")
 
         # STEP 1: Gather all web search results first (Tavily - not Claude)
-        all_search_results = {}
+        # Fresh cached Tavily results are reused; all remaining 3 queries × N
+        # seeds are launched at once and _search_web enforces the Tavily
+        # concurrency and rate cap
+        queries_by_seed = {seed: self._seed_queries(seed) for seed in seeds}
+        results_by_seed = {}
+        seeds_to_search = []
+
+        for seed, queries in queries_by_seed.items():
+            cached_results = self._cached_search_results(cache.get(normalize_company_name(seed)), queries)
+            if cached_results is not None:
+                results_by_seed[seed] = cached_results
+            else:
+                seeds_to_search.append(seed)
 
-        for seed in seeds:
-            queries = [
-                f"{seed} competitors",
-                f"companies like {seed}",
-                f"{seed} alternatives"
-            ]
+        if seeds_to_search:
+            flat_queries = [query for seed in seeds_to_search for query in queries_by_seed[seed]]
+            flat_results = await asyncio.gather(*[self._search_web(query) for query in flat_queries])
+            results_by_query = dict(zip(flat_queries, flat_results))
 
-            seed_results = []
-            for query in queries:
-                results = await self._search_web(query)
-                seed_results.append({
-                    "query": query,
-                    "results": results
-                })
+            for seed in seeds_to_search:
+                results_by_seed[seed] = [results_by_query[query] for query in queries_by_seed[seed]]
+
+            await self._save_discovery_search_results({
+                seed: list(zip(queries_by_seed[seed], results_by_seed[seed]))
+                for seed in seeds_to_search
+            })
 
-            all_search_results[seed] = seed_results
+        print(f"   🔍 Searched {len(seeds_to_search)} seeds, reused cached search results for {len(seeds) - len(seeds_to_search)}")
+
+        all_search_results = {
+            seed: [
+                {"query": query, "results": results}
+                for query, results in zip(queries_by_seed[seed], results_by_seed[seed])
+            ]
+            for seed in seeds
+        }
 
         # STEP 2: Build batched prompt
         prompt_sections = []
+        # Pages included in the prompt - marked seen for the run only once extraction succeeds
+        pages_sent = []
 
         for seed, search_results in all_search_results.items():
             # Extract content from search results
             results_text = []
+            # De-duplicate within this seed only: each seed's result is cached
+            # on its own, so a page shared with another seed must stay in both
+            seed_seen = set()
             for i, search_result in enumerate(search_results, 1):
-                tavily_results = search_result.get('results', [])
+                # Top 5 pages not already included for another of this seed's queries
+                tavily_results = self._select_unseen_results(search_result.get('results', []), 5, seed_seen)
+                seed_seen.update(self._page_content_hash(result) for result in tavily_results)
+                pages_sent.extend(tavily_results)
                 results_summary = ""
-                for j, result in enumerate(tavily_results[:5], 1):
+                for j, result in enumerate(tavily_results, 1):
                     results_summary += f"\n{j}. {result.get('title', '')}\n"
                     results_summary += f"   {result.get('content', '')[:200]}...\n"
 
@@ -571,7 +809,7 @@ Return ONLY the JSON object, no other text.
 
         while retry_count < max_retries:
             try:
-                response = self.claude_client.messages.create(
+                response = await self.claude_client.messages.create(
                     model="claude-haiku-4-5-20251001",  # Fast model for extraction
                     max_tokens=8000,  # Higher for batched response
                     temperature=0.1,
@@ -612,9 +850,13 @@ Return ONLY the JSON object, no other text.
                     print(f"⚠️  Could not parse batch response - falling back")
                     return await self._fallback_individual_extraction(seeds)
 
+            # Map Claude's keys back to the input seed names (Claude may re-case them)
+            seeds_by_key = {normalize_company_name(seed): seed for seed in seeds}
+
             # Convert to company objects with metadata
             result = {}
             for seed, company_names in companies_by_seed.items():
+                seed = seeds_by_key.get(normalize_company_name(seed), seed)
                 companies = []
                 for name in company_names:
                     if name and len(name) > 2:
@@ -626,6 +868,11 @@ Return ONLY the JSON object, no other text.
                 result[seed] = companies[:20]  # Limit to top 20 per seed
 
             print(f"   ✅ Batch extracted companies for {len(result)} seeds in 1 API call")
+            self._mark_pages_seen(pages_sent)
+
+            await self._save_discovery_extractions({
+                seed: companies for seed, companies in result.items() if seed in seeds
+            })
             return result
 
         except Exception as e:
@@ -643,6 +890,141 @@ Return ONLY the JSON object, no other text.
             results[seed] = await self.search_competitors_web(seed)
         return results
 
+    # ========================================
+    # Discovery Cache
+    # ========================================
+
+    def _seed_queries(self, seed: str) -> List[str]:
+        """The 3 competitor-discovery queries run for a seed company."""
+        return [
+            f"{seed} competitors",
+            f"companies like {seed}",
+            f"{seed} alternatives"
+        ]
+
+    async def _load_discovery_cache(self, seeds: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load discovery cache rows for seeds in one query.
+
+        Returns:
+            Dict mapping normalised seed name → cache row
+        """
+        keys = list({normalize_company_name(seed) for seed in seeds} - {""})
+        if not keys:
+            return {}
+
+        try:
+            supabase = await self._get_supabase()
+            cache_result = await supabase.table("company_discovery_cache").select("*").in_(
+                "seed_company", keys
+            ).execute()
+            return {row["seed_company"]: row for row in cache_result.data or []}
+        except Exception as e:
+            # Cache check failed - continue with fresh discovery (table may not exist yet)
+            if 'PGRST205' not in str(e):  # Only log if not "table not found"
+                print(f"   ⚠️  Discovery cache check failed: {e}")
+            return {}
+
+    def _cache_entry_fresh(self, entry: Optional[Dict[str, Any]], expires_column: str) -> bool:
+        """Check a cache row's expiry column against now."""
+        if not entry or not entry.get(expires_column):
+            return False
+        expires_at = datetime.fromisoformat(entry[expires_column].replace('Z', '+00:00'))
+        return datetime.now(timezone.utc) < expires_at
+
+    def _cached_extraction(self, entry: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Cached LLM-extracted competitors, or None if missing/expired."""
+        if self._cache_entry_fresh(entry, "expires_at") and entry.get("discovered_companies") is not None:
+            return entry["discovered_companies"]
+        return None
+
+    def _cached_search_results(
+        self,
+        entry: Optional[Dict[str, Any]],
+        queries: List[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Cached Tavily results in query order, or None if missing/expired/incomplete."""
+        if not self._cache_entry_fresh(entry, "search_expires_at"):
+            return None
+
+        cached = entry.get("search_results") or {}
+        if not all(query in cached for query in queries):
+            return None
+        return [cached[query] for query in queries]
+
+    def _trim_search_result(self, web_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the fields extraction reads (drops raw page content)."""
+        return {
+            "answer": web_results.get("answer"),
+            "results": [
+                {
+                    "title": result.get("title"),
+                    "url": result.get("url"),
+                    "content": result.get("content")
+                }
+                for result in web_results.get("results", [])[:10]
+            ]
+        }
+
+    async def _save_discovery_search_results(self, results_by_seed: Dict[str, List[tuple]]) -> None:
+        """
+        Cache Tavily results per seed.
+
+        Args:
+            results_by_seed: Dict mapping seed → list of (query, web_results)
+        """
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(days=self.config.DISCOVERY_SEARCH_CACHE_TTL_DAYS)
+        rows = {}
+
+        for seed, query_results in results_by_seed.items():
+            # Don't cache failed searches (empty results)
+            if not any(results.get("results") for _, results in query_results):
+                continue
+            rows[normalize_company_name(seed)] = {
+                "seed_company": normalize_company_name(seed),
+                "search_queries": [query for query, _ in query_results],
+                "search_results": {
+                    query: self._trim_search_result(results) for query, results in query_results
+                },
+                "search_expires_at": expires_at.isoformat()
+            }
+
+        await self._upsert_discovery_cache([row for key, row in rows.items() if key])
+
+    async def _save_discovery_extractions(self, companies_by_seed: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Cache LLM-extracted competitors per seed."""
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(days=self.config.DISCOVERY_CACHE_TTL_DAYS)
+        rows = {}
+
+        for seed, companies in companies_by_seed.items():
+            rows[normalize_company_name(seed)] = {
+                "seed_company": normalize_company_name(seed),
+                "discovered_companies": companies,
+                "created_at": now.isoformat(),
+                "expires_at": expires_at.isoformat()
+            }
+
+        await self._upsert_discovery_cache([row for key, row in rows.items() if key])
+        if rows:
+            print(f"   💾 Cached extractions for {len(rows)} seeds (expires in {self.config.DISCOVERY_CACHE_TTL_DAYS} days)")
+
+    async def _upsert_discovery_cache(self, rows: List[Dict[str, Any]]) -> None:
+        """Upsert cache rows (all rows must share the same columns)."""
+        if not rows:
+            return
+
+        try:
+            supabase = await self._get_supabase()
+            await supabase.table("company_discovery_cache").upsert(
+                rows,
+                on_conflict="seed_company"
+            ).execute()
+        except Exception as e:
+            # Non-critical - continue even if cache save fails
+            print(f"   ⚠️  Failed to save discovery cache: {e}")
+
     # ========================================
     # Evaluation Methods
     # ========================================
@@ -729,7 +1111,7 @@ Provide JSON response:
 
 DO NOT include recruiting/hiring/talent fields. This is competitive intelligence, not recruiting."""
 
-        response = self.claude_client.messages.create(
+        response = await self.claude_client.messages.create(
             model=self.config.CLAUDE_MODEL,
             max_tokens=1000,
             temperature=0.1,
@@ -767,12 +1149,33 @@ DO NOT include recruiting/hiring/talent fields. This is competitive intelligence
             # Return default scores if GPT-5 not available
             return [5.0] * len(companies)
 
-        try:
-            return await self.gpt5_client.batch_screen(companies, jd_context)
-        except Exception as e:
-            print(f"Batch screening error: {e}")
-            # Return default scores on error
-            return [5.0] * len(companies)
+        # Re-screen this batch only if the call fails or the scores array
+        # doesn't line up with the companies sent
+        max_retries = self.config.SCREENING_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            try:
+                scores = await self.gpt5_client.batch_screen(companies, jd_context)
+                if self._valid_screening_scores(scores, len(companies)):
+                    return [float(score) for score in scores]
+                print(f"⚠️  Batch screening returned {len(scores) if isinstance(scores, list) else 'invalid'} scores for {len(companies)} companies")
+            except Exception as e:
+                print(f"Batch screening error: {e}")
+
+            if attempt < max_retries:
+                print(f"   🔄 Re-screening batch ({attempt + 1}/{max_retries})")
+
+        # Still unusable after retries - fall back to neutral scores for this batch only
+        print(f"❌ Batch screening failed after {max_retries} retries - using default 5.0 for {len(companies)} companies: {[c.get('name') for c in companies]}")
+        return [5.0] * len(companies)
+
+    def _valid_screening_scores(self, scores: Any, expected_count: int) -> bool:
+        """Check that a screening response has one numeric score per company."""
+        if not isinstance(scores, list) or len(scores) != expected_count:
+            return False
+        return all(
+            isinstance(score, (int, float)) and not isinstance(score, bool)
+            for score in scores
+        )
 
     # ========================================
     # Categorization
@@ -900,10 +1303,103 @@ DO NOT include recruiting/hiring/talent fields. This is competitive intelligence
         return queries[:6]  # Return top 6 queries (2 domain + 3 seed + 1 fallback)
 
     async def _search_web(self, query: str) -> Dict[str, Any]:
-        """Execute web search using Tavily API with enhanced parameters."""
+        """
+        Execute web search using Tavily API with enhanced parameters.
+
+        Results are cached in-process for WEB_SEARCH_CACHE_TTL_SECONDS, keyed by
+        the normalised query, and concurrent identical queries share one request.
+        """
         if not self.tavily_api_key:
             return {"results": [], "answer": None}
 
+        cache_key = " ".join(query.lower().split())
+
+        cached = self._web_search_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            self._web_search_cache.move_to_end(cache_key)
+            print(f"   ✅ Web search cache HIT: \"{query[:50]}\" (saved 2 Tavily credits)")
+            return cached[1]
+
+        inflight = self._web_search_inflight.get(cache_key)
+        if inflight:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._web_search_inflight[cache_key] = future
+        try:
+            async with self._tavily_semaphore:
+                await self._tavily_rate_limiter.wait()
+                results = await self._post_tavily_search(query)
+
+            # Only successful searches are cached; raw page content is dropped
+            if results.get("results"):
+                results = self._trim_search_result(results)
+                self._web_search_cache[cache_key] = (
+                    time.monotonic() + self.config.WEB_SEARCH_CACHE_TTL_SECONDS,
+                    results
+                )
+                while len(self._web_search_cache) > self.config.WEB_SEARCH_CACHE_MAX_ENTRIES:
+                    self._web_search_cache.popitem(last=False)
+
+            future.set_result(results)
+            return results
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._web_search_inflight.pop(cache_key, None)
+
+    def _page_content_hash(self, result: Dict[str, Any]) -> str:
+        """Hash a result page by its normalised content (URL if no content)."""
+        content = " ".join((result.get("content") or "").lower().split())
+        return hashlib.sha1((content or result.get("url") or "").encode("utf-8")).hexdigest()
+
+    def _select_unseen_results(
+        self,
+        results: List[Dict[str, Any]],
+        limit: int,
+        seen: Optional[set] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick up to `limit` result pages whose hash is not in `seen`.
+
+        `seen` defaults to the pages already extracted in this research run;
+        with no scope at all this is just results[:limit]. Selected pages are
+        not marked - call _mark_pages_seen once extraction succeeds.
+        """
+        if seen is None:
+            seen = _run_seen_pages.get()
+        if seen is None:
+            return results[:limit]
+
+        selected = []
+        selected_hashes = set()
+        for result in results:
+            if len(selected) >= limit:
+                break
+            page_hash = self._page_content_hash(result)
+            if page_hash in seen or page_hash in selected_hashes:
+                continue
+            selected_hashes.add(page_hash)
+            selected.append(result)
+
+        return selected
+
+    def _mark_pages_seen(self, results: List[Dict[str, Any]], seen: Optional[set] = None) -> None:
+        """Record extracted pages in `seen` (if given) and in the run's scope."""
+        scopes = [scope for scope in (seen, _run_seen_pages.get()) if scope is not None]
+        for result in results:
+            page_hash = self._page_content_hash(result)
+            for scope in scopes:
+                scope.add(page_hash)
+
+    async def _post_tavily_search(self, query: str) -> Dict[str, Any]:
+        """Send a single Tavily search request (callers hold the Tavily cap)."""
         headers = {
             "Content-Type": "application/json"
         }
@@ -919,28 +1415,44 @@ DO NOT include recruiting/hiring/talent fields. This is competitive intelligence
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.config.TAVILY_BASE_URL,
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        error_text = await response.text()
-                        print(f"Tavily search failed ({response.status}): {error_text}")
-                        return {"results": [], "answer": None}
+            session = await self._get_http_session()
+            async with session.post(
+                self.config.TAVILY_BASE_URL,
+                json=payload,
+                headers=headers
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+                else:
+                    error_text = await response.text()
+                    print(f"Tavily search failed ({response.status}): {error_text}")
+                    return {"results": [], "answer": None}
         except Exception as e:
             print(f"Tavily search error: {e}")
             return {"results": [], "answer": None}
 
-    async def _extract_companies_from_web(self, web_results: Dict[str, Any], search_query: str = "") -> List[Dict[str, Any]]:
-        """Extract company names using Claude to parse Tavily results intelligently."""
+    async def _extract_companies_from_web(
+        self,
+        web_results: Dict[str, Any],
+        search_query: str = "",
+        seen: Optional[set] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract company names using Claude to parse Tavily results intelligently.
+
+        Pages already extracted are skipped: those in `seen` when given (a
+        per-seed scope, so per-seed cached results don't depend on the rest of
+        the run), otherwise those extracted earlier in this run.
+        """
 
         # Prepare context for Claude
         llm_answer = web_results.get("answer", "")
-        search_results = web_results.get("results", [])[:5]  # Top 5 results
+        # Top 5 results, skipping pages already extracted
+        search_results = self._select_unseen_results(web_results.get("results", []), 5, seen)
+
+        if not llm_answer and not search_results:
+            print(f"✓ No new pages for \"{search_query[:50]}\" - skipping extraction")
+            return []
 
         # Build condensed context from search results
         results_text = ""
@@ -977,7 +1489,7 @@ If no clear company names are found, return an empty array: []"""
 
         while retry_count < max_retries:
             try:
-                response = self.claude_client.messages.create(
+                response = await self.claude_client.messages.create(
                     model=self.config.CLAUDE_MODEL,
                     max_tokens=1000,
                     temperature=0.1,
@@ -1033,6 +1545,7 @@ If no clear company names are found, return an empty array: []"""
                     self.discovered_companies.add(name)
 
             print(f"✓ Claude extracted {len(companies)} companies from Tavily results")
+            self._mark_pages_seen(search_results, seen)
             return companies
 
         except Exception as e:
@@ -1042,33 +1555,39 @@ If no clear company names are found, return an empty array: []"""
     def _deduplicate_companies(self, companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Remove duplicate companies based on name.
+        Names are matched fuzzily through a CompanyNameIndex, so spellings like
+        "ElevenLabs", "Eleven Labs" and "ElevenLabs, Inc." collapse to the
+        first one seen (DEDUP_NAME_SIMILARITY).
         Also filters out excluded companies (DLAI, Deep Learning.AI, AI Fund).
         """
-        seen = set()
+        index = CompanyNameIndex(min_similarity=self.config.DEDUP_NAME_SIMILARITY)
+        excluded_index = CompanyNameIndex(min_similarity=1.0)
         unique = []
         excluded_found = []
 
         for company in companies:
-            name = company.get("name", "").lower().strip()
-            if not name:
+            name = company.get("name", "").strip()
+            if not normalize_company_name(name):
                 continue
 
             # Check if this company should be excluded
             if is_excluded_company(name):
-                if name not in seen:
-                    excluded_found.append(company.get("name", ""))
-                    seen.add(name)
+                if excluded_index.add(name):
+                    excluded_found.append(name)
                 continue
 
             # Add unique, non-excluded companies
-            if name not in seen:
-                seen.add(name)
+            if index.match(name) is None:
+                index.add(name)
                 unique.append(company)
 
         # Log excluded companies for debugging
         if excluded_found:
             print(f"\n[EXCLUDED] Filtered {len(excluded_found)} excluded companies: {excluded_found}\n")
 
+        if len(unique) + len(excluded_found) < len(companies):
+            print(f"[DEDUP] {len(companies)} → {len(unique)} unique companies")
+
         return unique
 
     async def _enrich_companies(self, companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1104,7 +1623,7 @@ If no clear company names are found, return an empty array: []"""
             print(f"\n[SCREENING] Skipped {excluded_count} excluded companies during screening\n")
 
         total = len(filtered_companies)
-        batch_size = 20  # GPT-5-mini processes 20 companies per batch
+        batch_size = self.config.GPT5_BATCH_SIZE  # GPT-5-mini processes 20 companies per batch
 
         if jd_id:
             await self._update_session_status(jd_id, "running", {
@@ -1113,22 +1632,32 @@ If no clear company names are found, return an empty array: []"""
                 "total_evaluated": 0
             })
 
-        # Process in batches with progress updates
-        all_scores = []
-        for i in range(0, total, batch_size):
-            batch = filtered_companies[i:i+batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (total + batch_size - 1) // batch_size
+        # Dispatch batches concurrently (capped) with progress updates as each finishes
+        batches = [filtered_companies[i:i+batch_size] for i in range(0, total, batch_size)]
+        total_batches = len(batches)
+        semaphore = asyncio.Semaphore(self.config.SCREENING_MAX_CONCURRENT_BATCHES)
+        completed_batches = 0
+        screened_count = 0
 
+        async def screen_batch(batch: List[Dict[str, Any]]) -> List[float]:
+            nonlocal completed_batches, screened_count
+            async with semaphore:
+                batch_scores = await self.batch_screen_companies_gpt5(batch, jd_context)
+
+            completed_batches += 1
+            screened_count += len(batch)
             if jd_id:
                 await self._update_session_status(jd_id, "running", {
                     "phase": "screening",
-                    "action": f"Screening batch {batch_num}/{total_batches} ({len(batch)} companies)...",
-                    "total_evaluated": i
+                    "action": f"Screened batch {completed_batches}/{total_batches} ({len(batch)} companies)",
+                    "total_evaluated": screened_count
                 })
 
-            batch_scores = await self.batch_screen_companies_gpt5(batch, jd_context)
-            all_scores.extend(batch_scores)
+            return batch_scores
+
+        # Merge positionally: gather() returns batch scores in batch order
+        batch_results = await asyncio.gather(*[screen_batch(batch) for batch in batches])
+        all_scores = [score for batch_scores in batch_results for score in batch_scores]
 
         # Add scores to filtered companies
         for i, company in enumerate(filtered_companies):
@@ -1168,31 +1697,79 @@ If no clear company names are found, return an empty array: []"""
         if excluded_count > 0:
             print(f"\n[DEEP RESEARCH] Skipped {excluded_count} excluded companies during deep research\n")
 
-        evaluated = []
         total = len(filtered_companies)
+        completed = 0
+        semaphore = asyncio.Semaphore(self.config.DEEP_RESEARCH_MAX_CONCURRENT)
 
-        for i, company in enumerate(filtered_companies, 1):
+        async def evaluate(company: Dict[str, Any]) -> Dict[str, Any]:
+            nonlocal completed
             company_name = company.get("name", "Unknown")
 
-            # Update status with current company being evaluated
+            async with semaphore:
+                evaluation = await self._evaluate_company_with_retry(company, jd_context)
+
+            company["relevance_score"] = evaluation.get("relevance_score", 5.0)
+            company["category"] = evaluation.get("category", "talent_pool")
+            company["reasoning"] = evaluation.get("reasoning", "")
+            company["gpt5_analysis"] = evaluation
+
+            # Update status as each company finishes (completion order)
+            completed += 1
             if jd_id:
                 await self._update_session_status(jd_id, "running", {
                     "phase": "deep_research",
-                    "action": f"Evaluating {company_name} ({i}/{total})...",
+                    "action": f"Evaluated {company_name} ({completed}/{total})",
                     "current_company": company_name,
-                    "total_evaluated": i
+                    "total_evaluated": completed
                 })
 
-            evaluation = await self.evaluate_company_relevance_gpt5(company, jd_context)
+            return company
 
-            company["relevance_score"] = evaluation.get("relevance_score", 5.0)
-            company["category"] = evaluation.get("category", "talent_pool")
-            company["reasoning"] = evaluation.get("reasoning", "")
-            company["gpt5_analysis"] = evaluation
+        # gather() keeps results in screening order regardless of completion order
+        evaluated = await asyncio.gather(*[evaluate(company) for company in filtered_companies])
+
+        return list(evaluated)
+
+    async def _evaluate_company_with_retry(
+        self,
+        company: Dict[str, Any],
+        jd_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Evaluate one company with a per-company timeout and exponential backoff.
+
+        Falls back to a neutral evaluation once retries are exhausted so one slow
+        or failing company never blocks the rest of the batch.
+        """
+        company_name = company.get("name", "Unknown")
+        max_retries = self.config.DEEP_RESEARCH_MAX_RETRIES
+        last_error = None
+
+        for attempt in range(max_retries + 1):
+            try:
+                return await asyncio.wait_for(
+                    self.evaluate_company_relevance_gpt5(company, jd_context),
+                    timeout=self.config.DEEP_RESEARCH_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                last_error = f"timed out after {self.config.DEEP_RESEARCH_TIMEOUT_SECONDS}s"
+            except Exception as e:
+                last_error = str(e)
 
-            evaluated.append(company)
+            if attempt < max_retries:
+                wait_time = 2 ** (attempt + 1)  # Exponential backoff: 2s, 4s
+                print(f"⚠️  Deep research for {company_name} failed ({last_error}) - retry {attempt + 1}/{max_retries} after {wait_time}s")
+                await asyncio.sleep(wait_time)
 
-        return evaluated
+        print(f"❌ Deep research for {company_name} failed after {max_retries} retries: {last_error}")
+        return {
+            "relevance_score": 5.0,
+            "category": "talent_pool",
+            "reasoning": f"Error during analysis: {last_error[:100]}",
+            "talent_assessment": {},
+            "poaching_strategy": {},
+            "specific_targets": []
+        }
 
     def _map_category_for_db(self, category: str) -> str:
         """
@@ -1214,15 +1791,30 @@ If no clear company names are found, return an empty array: []"""
         return category_mapping.get(category, "talent_pool")
 
     async def _save_companies(self, jd_id: str, categorized: Dict[str, List]) -> None:
-        """Save discovered companies to database."""
+        """
+        Save evaluated companies to database.
+
+        Rows are upserted in bulk on (jd_id, company_name), chunked by
+        SAVE_CHUNK_SIZE, so re-evaluating a company (e.g. via
+        /evaluate-more-companies) updates its row instead of duplicating it.
+        Rows are also de-duplicated on company_id, within the batch and against
+        rows already stored for the JD under another name (UNIQUE(jd_id,
+        company_id) would otherwise fail the whole chunk).
+        """
+        rows_by_name: Dict[str, Dict[str, Any]] = {}
+
         for category, companies in categorized.items():
             # Map category to database-compatible value
             db_category = self._map_category_for_db(category)
 
             for company in companies:
+                name = company.get("name")
+                if not name:
+                    continue
+
                 data = {
                     "jd_id": jd_id,
-                    "company_name": company.get("name"),
+                    "company_name": name,
                     "company_id": company.get("company_id"),
                     "relevance_score": company.get("relevance_score"),
                     "relevance_reasoning": company.get("reasoning"),
@@ -1232,7 +1824,59 @@ If no clear company names are found, return an empty array: []"""
                     "gpt5_analysis": company.get("gpt5_analysis")
                 }
 
-                self.supabase.table("target_companies").insert(data).execute()
+                # One row per name per upsert (Postgres rejects a batch that
+                # hits the same conflict key twice) - keep the higher score
+                existing = rows_by_name.get(name)
+                if existing is None or (data["relevance_score"] or 0) > (existing["relevance_score"] or 0):
+                    rows_by_name[name] = data
+
+        # Two names can resolve to the same CoreSignal company - keep one row
+        # per company_id too, so the same company isn't saved twice
+        rows_by_company_id: Dict[Any, Dict[str, Any]] = {}
+        rows = []
+        for data in rows_by_name.values():
+            company_id = data["company_id"]
+            if company_id is None:
+                rows.append(data)
+                continue
+            existing = rows_by_company_id.get(company_id)
+            if existing is None or (data["relevance_score"] or 0) > (existing["relevance_score"] or 0):
+                rows_by_company_id[company_id] = data
+        rows.extend(rows_by_company_id.values())
+        if not rows:
+            return
+
+        supabase = await self._get_supabase()
+        chunk_size = self.config.SAVE_CHUNK_SIZE
+
+        # A company_id already saved for this JD under a different name (an
+        # earlier run or /evaluate-more-companies) is the same company - skip it
+        company_ids = list(rows_by_company_id)
+        stored_names = {}
+        for i in range(0, len(company_ids), chunk_size):
+            result = await supabase.table("target_companies").select("company_id,company_name").eq(
+                "jd_id", jd_id
+            ).in_("company_id", company_ids[i:i + chunk_size]).execute()
+            for stored in result.data or []:
+                stored_names[stored["company_id"]] = stored["company_name"]
+
+        skipped = [
+            row for row in rows
+            if stored_names.get(row["company_id"], row["company_name"]) != row["company_name"]
+        ]
+        if skipped:
+            print(f"   ⏭️  Skipping {len(skipped)} companies already saved under another name: {[row['company_name'] for row in skipped]}")
+            rows = [row for row in rows if row not in skipped]
+            if not rows:
+                return
+
+        for i in range(0, len(rows), chunk_size):
+            await supabase.table("target_companies").upsert(
+                rows[i:i + chunk_size],
+                on_conflict="jd_id,company_name"
+            ).execute()
+
+        print(f"💾 Saved {len(rows)} companies for {jd_id} in {(len(rows) + chunk_size - 1) // chunk_size} request(s)")
 
     async def _create_research_session(
         self,
@@ -1251,7 +1895,16 @@ If no clear company names are found, return an empty array: []"""
             "created_at": datetime.now().isoformat()
         }
 
-        self.supabase.table("company_research_sessions").upsert(session_data).execute()
+        supabase = await self._get_supabase()
+        await supabase.table("company_research_sessions").upsert(session_data).execute()
+        self.status_writer.start(jd_id, session_data)
+
+    async def mark_session_failed(self, jd_id: str, error: str) -> None:
+        """Mark a research session failed (used when a background run dies); never raises."""
+        try:
+            await self._update_session_status(jd_id, "failed", {"error": error})
+        except Exception as e:
+            print(f"❌ Could not mark research session {jd_id} failed: {e}")
 
     async def _update_session_status(
         self,
@@ -1267,65 +1920,13 @@ If no clear company names are found, return an empty array: []"""
         - current_action: Detailed description of what's happening now
         - discovered_companies_list: Names of companies found so far
         - phase_progress: Progress breakdown by phase
+
+        Writes go through SessionStatusWriter: micro-step updates are coalesced
+        and flushed at most every STATUS_FLUSH_INTERVAL_MS, while status/phase
+        changes are written immediately. Progress keys are merged into the
+        stored search_config instead of replacing it.
         """
-        update_data = {"status": status}
-
-        if metadata:
-            # Existing metrics
-            if "total_discovered" in metadata:
-                update_data["total_discovered"] = metadata["total_discovered"]
-            if "total_evaluated" in metadata:
-                update_data["total_evaluated"] = metadata["total_evaluated"]
-            if "total_selected" in metadata:
-                update_data["total_selected"] = metadata["total_selected"]
-            if "error" in metadata:
-                update_data["error_message"] = metadata["error"]
-
-            # NEW: Detailed progress tracking
-            if "phase" in metadata:
-                # Store in search_config JSONB field (reusing existing field)
-                current_config = update_data.get("search_config", {}) or {}
-                current_config["current_phase"] = metadata["phase"]
-                update_data["search_config"] = current_config
-
-            if "action" in metadata:
-                current_config = update_data.get("search_config", {}) or {}
-                current_config["current_action"] = metadata["action"]
-                update_data["search_config"] = current_config
-
-            if "discovered_companies" in metadata:
-                current_config = update_data.get("search_config", {}) or {}
-                current_config["discovered_companies"] = metadata["discovered_companies"]
-                update_data["search_config"] = current_config
-
-            if "discovered_companies_list" in metadata:
-                current_config = update_data.get("search_config", {}) or {}
-                current_config["discovered_companies_list"] = metadata["discovered_companies_list"]
-                update_data["search_config"] = current_config
-
-            if "current_company" in metadata:
-                current_config = update_data.get("search_config", {}) or {}
-                current_config["current_company"] = metadata["current_company"]
-                update_data["search_config"] = current_config
-
-            # NEW: Save screened companies for progressive evaluation
-            if "screened_companies" in metadata:
-                current_config = update_data.get("search_config", {}) or {}
-                current_config["screened_companies"] = metadata["screened_companies"]
-                update_data["search_config"] = current_config
-
-            # NEW: Save JD context for future evaluations
-            if "jd_context" in metadata:
-                current_config = update_data.get("search_config", {}) or {}
-                current_config["jd_context"] = metadata["jd_context"]
-                update_data["search_config"] = current_config
-
-        if status == "completed":
-            update_data["completed_at"] = datetime.now().isoformat()
-
-        self.supabase.table("company_research_sessions").update(update_data).eq(
-            "jd_id", jd_id
-        ).execute()
+        await self.status_writer.update(jd_id, status, metadata)
 
     def _generate_summary(self, categorized: Dict[str, List]) -> Dict[str, Any]:
         """Generate summary statistics."""
@@ -0,0 +1,270 @@
+"""
+Company Resolution Cache
+Persistent company name → CoreSignal company_id resolutions (Supabase table
+company_id_resolutions), so names resolved once are never searched again
+until their TTL runs out.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+from company_name_matcher import normalize_company_name
+
+
+class CompanyResolutionCache:
+    """
+    Reads and writes company_id_resolutions via PostgREST.
+
+    Rows are keyed by normalised name and hold the best CoreSignal candidate
+    with its confidence, whatever the caller's threshold; a NULL company_id
+    records that the search found nothing. Every method fails soft: when
+    Supabase is unavailable the cache behaves as empty.
+    """
+
+    TABLE = "company_id_resolutions"
+
+    # Resolved names are trusted as long as stored company data (30 days)
+    RESOLUTION_TTL_DAYS = 30
+    # "No match" results are retried sooner - the company may be indexed since
+    NO_MATCH_TTL_DAYS = 3
+
+    # Rows per upsert / names per in.(...) lookup
+    WRITE_CHUNK_SIZE = 500
+    READ_CHUNK_SIZE = 100
+
+    # stored_companies is seeded into the table once per process, on a
+    # background thread; a failed seed is retried after SEED_RETRY_SECONDS
+    SEED_RETRY_SECONDS = 300
+    _seeded = False
+    _seeding = False
+    _last_seed_attempt: Optional[float] = None
+    _seed_lock = threading.Lock()
+
+    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None):
+        self.supabase_url = supabase_url or os.getenv("SUPABASE_URL")
+        self.supabase_key = supabase_key or os.getenv("SUPABASE_KEY")
+        self.enabled = bool(self.supabase_url and self.supabase_key)
+        self.headers = {
+            'apikey': self.supabase_key,
+            'Authorization': f'Bearer {self.supabase_key}',
+            'Content-Type': 'application/json'
+        }
+
+    def get_many(self, company_names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up fresh resolutions for many names in as few queries as possible.
+
+        Returns:
+            Dict mapping normalised name -> resolution row (expired rows omitted)
+        """
+        keys = sorted({key for key in map(normalize_company_name, company_names) if key})
+        if not self.enabled or not keys:
+            return {}
+
+        self.start_seeding()
+
+        now = datetime.now(timezone.utc).isoformat()
+        resolutions = {}
+
+        for i in range(0, len(keys), self.READ_CHUNK_SIZE):
+            chunk = keys[i:i + self.READ_CHUNK_SIZE]
+            try:
+                response = requests.get(
+                    f"{self.supabase_url}/rest/v1/{self.TABLE}",
+                    headers=self.headers,
+                    params={
+                        'normalized_name': f'in.({",".join(_quote(key) for key in chunk)})',
+                        'expires_at': f'gt.{now}'
+                    },
+                    timeout=10
+                )
+                if not response.ok:
+                    print(f"⚠️ Company resolution lookup failed: {response.status_code}")
+                    continue
+                for row in response.json():
+                    resolutions[row['normalized_name']] = row
+            except Exception as e:
+                print(f"⚠️ Error reading company resolutions: {e}")
+
+        return resolutions
+
+    def get(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """Fresh resolution row for one name, or None."""
+        return self.get_many([company_name]).get(normalize_company_name(company_name))
+
+    def save(self, company_name: str, candidate: Optional[Dict[str, Any]], source: str = "search") -> None:
+        """
+        Store the best candidate found for a name (None = search found nothing).
+
+        Args:
+            company_name: Name as the user typed it
+            candidate: Dict with company_id, name, website, employee_count, confidence
+            source: Where the resolution came from ("search" or "stored_companies")
+        """
+        key = normalize_company_name(company_name)
+        if not self.enabled or not key:
+            return
+
+        self._upsert([self._row(company_name, key, candidate, source)])
+
+    def start_seeding(self) -> None:
+        """
+        Seed from stored_companies on a background thread (never blocks the caller).
+
+        Runs once per process; a failed seed is retried on a later call once
+        SEED_RETRY_SECONDS have passed.
+        """
+        cls = type(self)
+        if cls._seeded or not self.enabled:
+            return
+
+        with cls._seed_lock:
+            if cls._seeded or cls._seeding:
+                return
+            if cls._last_seed_attempt is not None and time.monotonic() - cls._last_seed_attempt < self.SEED_RETRY_SECONDS:
+                return
+            cls._seeding = True
+            cls._last_seed_attempt = time.monotonic()
+
+        threading.Thread(target=self._seed_in_background, name="company-resolution-seed", daemon=True).start()
+
+    def _seed_in_background(self) -> None:
+        cls = type(self)
+        seeded = False
+        try:
+            seeded = self.seed_from_stored_companies()
+        finally:
+            with cls._seed_lock:
+                cls._seeding = False
+                cls._seeded = cls._seeded or seeded
+
+    def seed_from_stored_companies(self) -> bool:
+        """
+        Seed resolutions from stored_companies (exact CoreSignal names, confidence 1.0).
+
+        Existing resolutions are never overwritten. Synchronous - request
+        paths should use start_seeding instead.
+
+        Returns:
+            True if every page was read and written
+        """
+        if not self.enabled:
+            return False
+
+        rows = {}
+        offset = 0
+        page_size = 1000
+        try:
+            while True:
+                response = requests.get(
+                    f"{self.supabase_url}/rest/v1/stored_companies",
+                    headers=self.headers,
+                    params={
+                        'select': 'company_id,name:company_data->>name,website:company_data->>website,'
+                                  'employee_count:company_data->>employees_count',
+                        'order': 'company_id',
+                        'limit': page_size,
+                        'offset': offset
+                    },
+                    timeout=30
+                )
+                if not response.ok:
+                    print(f"⚠️ Could not read stored_companies for seeding: {response.status_code}")
+                    return False
+
+                page = response.json()
+                for company in page:
+                    key = normalize_company_name(company.get('name') or '')
+                    if key and key not in rows:
+                        rows[key] = self._row(company['name'], key, {
+                            'company_id': company['company_id'],
+                            'name': company['name'],
+                            'website': company.get('website'),
+                            'employee_count': _to_int(company.get('employee_count')),
+                            'confidence': 1.0
+                        }, source="stored_companies")
+
+                if len(page) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            print(f"⚠️ Error seeding company resolutions: {e}")
+            return False
+
+        if not rows:
+            return True
+
+        if self._upsert(list(rows.values()), overwrite=False):
+            print(f"💾 Seeded {len(rows)} company resolutions from stored_companies")
+            return True
+        return False
+
+    # ========================================
+    # Internals
+    # ========================================
+
+    def _row(
+        self,
+        company_name: str,
+        key: str,
+        candidate: Optional[Dict[str, Any]],
+        source: str
+    ) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        ttl_days = self.RESOLUTION_TTL_DAYS if candidate else self.NO_MATCH_TTL_DAYS
+        candidate = candidate or {}
+
+        return {
+            'normalized_name': key,
+            'input_name': company_name,
+            'company_id': candidate.get('company_id'),
+            'coresignal_name': candidate.get('name'),
+            'website': candidate.get('website'),
+            'employee_count': candidate.get('employee_count'),
+            'confidence': candidate.get('confidence', 0.0),
+            'source': source,
+            'resolved_at': now.isoformat(),
+            'expires_at': (now + timedelta(days=ttl_days)).isoformat()
+        }
+
+    def _upsert(self, rows: List[Dict[str, Any]], overwrite: bool = True) -> bool:
+        """Upsert rows in chunks; True if every chunk was written."""
+        resolution = 'merge-duplicates' if overwrite else 'ignore-duplicates'
+        headers = {**self.headers, 'Prefer': f'resolution={resolution},return=minimal'}
+        success = True
+
+        for i in range(0, len(rows), self.WRITE_CHUNK_SIZE):
+            try:
+                response = requests.post(
+                    f"{self.supabase_url}/rest/v1/{self.TABLE}",
+                    headers=headers,
+                    params={'on_conflict': 'normalized_name'},
+                    json=rows[i:i + self.WRITE_CHUNK_SIZE],
+                    timeout=30
+                )
+                if not response.ok:
+                    print(f"⚠️ Failed to save company resolutions: {response.status_code} {response.text[:200]}")
+                    success = False
+            except Exception as e:
+                print(f"⚠️ Error saving company resolutions: {e}")
+                success = False
+
+        return success
+
+
+def _quote(value: str) -> str:
+    """Quote a value for a PostgREST in.(...) filter."""
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -2,13 +2,18 @@
 CoreSignal Company ID Lookup Service
 
 Maps company names to CoreSignal company_ids for employee search.
-Uses CoreSignal Company Search API to find matching companies.
+Uses CoreSignal Company Search API to find matching companies; resolutions
+are persisted in company_id_resolutions and reused until they expire.
 """
 
 import os
+import threading
 import requests
 from typing import Optional, Dict, Any, List
 import time
+from company_name_matcher import name_similarity, normalize_company_name
+from coresignal_rate_limit import coresignal_rate_limiter
+from company_resolution_cache import CompanyResolutionCache
 
 
 class CoreSignalCompanyLookup:
@@ -16,14 +21,21 @@ class CoreSignalCompanyLookup:
     Service for looking up CoreSignal company IDs by company name.
 
     Uses the CoreSignal Company Search API to find companies and extract their IDs.
+    One instance may be shared by worker threads; the resolution memo is
+    guarded by a lock, network and database calls run outside it.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        resolution_cache: Optional[CompanyResolutionCache] = None
+    ):
         """
         Initialize the CoreSignal company lookup service.
 
         Args:
             api_key: Optional CoreSignal API key, defaults to env var
+            resolution_cache: Optional persistent resolution cache (defaults to Supabase-backed)
         """
         self.api_key = api_key or os.getenv("CORESIGNAL_API_KEY")
         if not self.api_key:
@@ -35,10 +47,16 @@ class CoreSignalCompanyLookup:
             "Content-Type": "application/json"
         }
 
+        self.resolution_cache = resolution_cache or CompanyResolutionCache()
+        # Best candidate per normalised name for this instance (None = no results)
+        self._resolved: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
     def search_company_by_name(
         self,
         company_name: str,
-        limit: int = 5
+        limit: int = 5,
+        raise_errors: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Search for companies by name using CoreSignal API.
@@ -46,6 +64,8 @@ class CoreSignalCompanyLookup:
         Args:
             company_name: Company name to search for
             limit: Maximum number of results to return
+            raise_errors: Re-raise API errors (e.g. 503 rate limits) instead of
+                returning [], so a failed search isn't mistaken for "no match"
 
         Returns:
             List of company data dictionaries with company_id, name, website, etc.
@@ -84,6 +104,7 @@ class CoreSignalCompanyLookup:
         }
 
         try:
+            coresignal_rate_limiter.acquire()
             response = requests.post(url, json=payload, headers=self.headers, timeout=10)
             response.raise_for_status()
 
@@ -107,6 +128,8 @@ class CoreSignalCompanyLookup:
 
         except requests.exceptions.RequestException as e:
             print(f"[CORESIGNAL LOOKUP] Error searching for company '{company_name}': {e}")
+            if raise_errors:
+                raise
             return []
 
     def get_best_match(
@@ -117,6 +140,8 @@ class CoreSignalCompanyLookup:
         """
         Get the best matching company ID for a company name.
 
+        Checks stored resolutions before calling the CoreSignal API.
+
         Args:
             company_name: Company name to look up
             confidence_threshold: Minimum confidence score (0-1) for a match
@@ -124,7 +149,63 @@ class CoreSignalCompanyLookup:
         Returns:
             Dictionary with company_id, name, and confidence score, or None if no good match
         """
-        results = self.search_company_by_name(company_name, limit=5)
+        candidate = self.find_best_candidate(company_name)
+
+        if candidate and candidate["confidence"] >= confidence_threshold:
+            return dict(candidate)
+
+        return None
+
+    def find_best_candidate(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Best CoreSignal candidate for a name, regardless of confidence threshold.
+
+        Resolution order: this instance's memo, the company_id_resolutions
+        table, then the CoreSignal search API (whose result is stored). All
+        three are keyed by the exact normalised name - close spellings are
+        never aliased, since "Lyra Health" and "Lyra Wealth" are different
+        companies.
+
+        Returns:
+            Dictionary with company_id, name, website, confidence, employee_count,
+            or None if CoreSignal has no results for the name
+
+        Raises:
+            requests.exceptions.RequestException: If the CoreSignal search failed
+                (nothing is stored, so the name is searched again next time)
+        """
+        key = normalize_company_name(company_name)
+        with self._lock:
+            if key in self._resolved:
+                return self._resolved[key]
+
+        row = self.resolution_cache.get(company_name)
+        if row is not None:
+            candidate = self._candidate_from_row(row)
+        else:
+            candidate = self._search_best_candidate(company_name)
+            self.resolution_cache.save(company_name, candidate)
+
+        with self._lock:
+            # Another thread may have resolved the same name meanwhile; keep the first
+            return self._resolved.setdefault(key, candidate)
+
+    def prefetch(self, company_names: List[str]) -> int:
+        """
+        Load stored resolutions for many names in one round trip.
+
+        Returns:
+            Number of names resolved without touching the CoreSignal API
+        """
+        rows = self.resolution_cache.get_many(company_names)
+        with self._lock:
+            for key, row in rows.items():
+                self._resolved[key] = self._candidate_from_row(row)
+        return len(rows)
+
+    def _search_best_candidate(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """Search CoreSignal and score the top result (None if nothing came back)."""
+        results = self.search_company_by_name(company_name, limit=5, raise_errors=True)
 
         if not results:
             return None
@@ -133,27 +214,37 @@ class CoreSignalCompanyLookup:
         best_match = results[0]
 
         # Calculate confidence based on name similarity and score
-        name_similarity = self._calculate_name_similarity(
-            company_name.lower(),
-            best_match["name"].lower() if best_match["name"] else ""
+        similarity = self._calculate_name_similarity(
+            company_name,
+            best_match["name"] or ""
         )
 
         # Normalize score (CoreSignal scores are typically 0-10+)
-        normalized_score = min(best_match.get("score", 0) / 10.0, 1.0)
+        normalized_score = min((best_match.get("score") or 0) / 10.0, 1.0)
 
         # Combined confidence: 70% name similarity, 30% search score
-        confidence = (name_similarity * 0.7) + (normalized_score * 0.3)
-
-        if confidence >= confidence_threshold:
-            return {
-                "company_id": best_match["company_id"],
-                "name": best_match["name"],
-                "website": best_match.get("website"),
-                "confidence": round(confidence, 2),
-                "employee_count": best_match.get("employee_count")
-            }
+        confidence = (similarity * 0.7) + (normalized_score * 0.3)
+
+        return {
+            "company_id": best_match["company_id"],
+            "name": best_match["name"],
+            "website": best_match.get("website"),
+            "confidence": round(confidence, 2),
+            "employee_count": best_match.get("employee_count")
+        }
 
-        return None
+    @staticmethod
+    def _candidate_from_row(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Convert a company_id_resolutions row to a candidate (None for a stored no-match)."""
+        if row.get("company_id") is None:
+            return None
+        return {
+            "company_id": row["company_id"],
+            "name": row.get("coresignal_name"),
+            "website": row.get("website"),
+            "confidence": row.get("confidence") or 0.0,
+            "employee_count": row.get("employee_count")
+        }
 
     def batch_lookup(
         self,
@@ -173,81 +264,38 @@ class CoreSignalCompanyLookup:
             Dictionary mapping company names to their CoreSignal data (or None if no match)
         """
         results = {}
+        self.prefetch(company_names)
 
         for company_name in company_names:
-            match = self.get_best_match(company_name, confidence_threshold)
-            results[company_name] = match
+            # Spellings that normalise the same ("Deepgram" / "Deepgram, Inc.") share one lookup
+            with self._lock:
+                needs_api_call = normalize_company_name(company_name) not in self._resolved
+            try:
+                results[company_name] = self.get_best_match(company_name, confidence_threshold)
+            except requests.exceptions.RequestException:
+                results[company_name] = None
 
             # Rate limiting
-            if delay_between_requests > 0:
+            if needs_api_call and delay_between_requests > 0:
                 time.sleep(delay_between_requests)
 
         return results
 
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
         """
-        Calculate simple similarity score between two company names.
+        Calculate similarity score between two company names.
 
-        Uses a basic approach:
+        Names are normalised first (case, punctuation, Inc/Ltd suffixes), then:
         - Exact match: 1.0
         - Name1 contains name2 or vice versa: 0.9
-        - Levenshtein distance-based: 0.0-0.8
+        - Bounded edit distance: 0.5-0.8 (0.0 once it's clearly below 0.5,
+          which can never reach a usable confidence)
 
         Args:
-            name1: First company name (lowercase)
-            name2: Second company name (lowercase)
+            name1: First company name
+            name2: Second company name
 
         Returns:
             Similarity score from 0.0 to 1.0
         """
-        if not name1 or not name2:
-            return 0.0
-
-        # Exact match
-        if name1 == name2:
-            return 1.0
-
-        # Substring match
-        if name1 in name2 or name2 in name1:
-            return 0.9
-
-        # Simple Levenshtein distance
-        distance = self._levenshtein_distance(name1, name2)
-        max_len = max(len(name1), len(name2))
-
-        # Normalize: 1.0 = identical, 0.0 = completely different
-        if max_len == 0:
-            return 0.0
-
-        similarity = 1.0 - (distance / max_len)
-        return max(0.0, min(similarity, 0.8))  # Cap at 0.8 for non-exact matches
-
-    def _levenshtein_distance(self, s1: str, s2: str) -> int:
-        """
-        Calculate Levenshtein distance between two strings.
-
-        Args:
-            s1: First string
-            s2: Second string
-
-        Returns:
-            Edit distance
-        """
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-
-        if len(s2) == 0:
-            return len(s1)
-
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                # Cost of insertions, deletions, or substitutions
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-
-        return previous_row[-1]
+        return name_similarity(name1, name2, min_similarity=0.5)
@@ -0,0 +1,239 @@
+"""
+CoreSignal Preview Pagination
+Shared engine for fetching several /preview pages of one search concurrently.
+
+Page requests are scheduled on a small thread pool. Each request that actually
+goes out (not a preview_search_cache hit) takes a token from the shared
+CoreSignal rate limiter in cached_preview_post, so pages arrive in parallel
+without exceeding the account's request budget (no fixed sleeps between pages).
+Results always come back in the order the pages were requested.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from coresignal_rate_limit import CORESIGNAL_MAX_CONCURRENT, coresignal_rate_limiter
+from search_result_cache import preview_cache_key, preview_search_cache
+
+
+# /preview returns at most 20 profiles per page and only serves pages 1-5
+PREVIEW_PAGE_SIZE = 20
+PREVIEW_MAX_PAGES = 5
+
+# Fields kept in ID-only mode: identifiers plus what a results list/CSV shows.
+# Full profiles are collected later (/fetch-profile) for candidates actually opened.
+LIGHT_PREVIEW_FIELDS = (
+    "id", "full_name", "name_first", "name_last",
+    "headline", "generated_headline",
+    "job_title", "active_experience_title", "current_title", "company_name",
+    "location", "location_full", "location_raw_address",
+    "websites_linkedin", "linkedin_url", "professional_network_url"
+)
+
+# fetch_page(page) -> (success, results, error_msg)
+PageFetcher = Callable[[int], Tuple[bool, Optional[List[Any]], Optional[str]]]
+
+
+def fetch_pages_concurrently(
+    fetch_page: PageFetcher,
+    pages: List[int],
+    page_size: int = PREVIEW_PAGE_SIZE,
+    max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch several result pages concurrently within the CoreSignal rate limit.
+
+    A short page (fewer than page_size results) marks the end of the result
+    set: pages numbered after it are cancelled if not yet started, and
+    dropped from the output if they already ran.
+
+    Args:
+        fetch_page: Fetches one page, returning (success, results, error_msg)
+        pages: Page numbers to fetch, in the order results should be returned
+        page_size: Full page size (used to detect the last page)
+        max_workers: Concurrent page requests (defaults to CORESIGNAL_MAX_CONCURRENT)
+
+    Returns:
+        One dict per fetched page, in `pages` order:
+        {"page": int, "success": bool, "results": list, "error": str | None}
+    """
+    if not pages:
+        return []
+
+    def fetch(page):
+        try:
+            return fetch_page(page)
+        except Exception as e:
+            return False, None, f"Request exception: {str(e)}"
+
+    workers = min(max_workers or CORESIGNAL_MAX_CONCURRENT, len(pages))
+    outcomes = {}
+    last_page = None  # Lowest page number known to be the end of the results
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Submitted lowest page first so an early short page can cancel the rest
+        futures = {page: executor.submit(fetch, page) for page in sorted(pages)}
+
+        for page in sorted(pages):
+            if last_page is not None and page > last_page:
+                futures[page].cancel()
+                continue
+
+            success, results, error_msg = futures[page].result()
+            results = (results or []) if success else []
+            outcomes[page] = {
+                "page": page,
+                "success": success,
+                "results": results,
+                "error": None if success else error_msg
+            }
+
+            if success and len(results) < page_size:
+                last_page = page
+
+    return [outcomes[page] for page in pages if page in outcomes]
+
+
+def cached_preview_post(
+    url: str,
+    query: Dict[str, Any],
+    headers: Dict[str, str],
+    timeout: int = 30,
+    acquire_token: Optional[Callable[[], None]] = coresignal_rate_limiter.acquire
+) -> Tuple[Optional[Any], Optional[requests.Response]]:
+    """
+    POST a CoreSignal /preview search, serving repeats from preview_search_cache.
+
+    Every /preview call site goes through here so they all share one cache.
+    Requests to other URLs are sent uncached.
+
+    Args:
+        url: Full request URL (including ?page=N)
+        query: ES DSL query
+        headers: CoreSignal request headers
+        timeout: Request timeout in seconds
+        acquire_token: Called just before an actual HTTP request (never on a
+            cache hit); defaults to the shared rate limiter's acquire. Pass
+            None only if the caller already holds a token.
+
+    Returns:
+        (data, response) - data is the parsed JSON on a cache hit or a 200
+        (response is None on a cache hit); otherwise data is None and response
+        is the failed response for the caller's retry/error handling.
+        Request exceptions propagate.
+    """
+    cache_key = preview_cache_key(url, query)
+    if cache_key:
+        cached = preview_search_cache.get(cache_key)
+        if cached is not None:
+            return cached, None
+
+    if acquire_token is not None:
+        acquire_token()
+
+    response = requests.post(url, json=query, headers=headers, timeout=timeout)
+    if response.status_code != 200:
+        return None, response
+
+    data = response.json()
+    if cache_key:
+        preview_search_cache.set(cache_key, data)
+    return data, response
+
+
+def request_preview_page(
+    url: str,
+    payload: Dict[str, Any],
+    headers: Dict[str, str],
+    page: int,
+    max_retries: int = 3,
+    timeout: int = 30,
+    acquire_token: Optional[Callable[[], None]] = coresignal_rate_limiter.acquire
+) -> Tuple[bool, Optional[List[Any]], Optional[str]]:
+    """
+    POST one /preview page, retrying 503s (CoreSignal's rate-limit response).
+
+    Every attempt that reaches the API takes a rate limiter token via
+    acquire_token (see cached_preview_post); retries also back off. Pages
+    seen recently for the same query are served from preview_search_cache.
+
+    Returns:
+        (success, results, error_msg) - results is the list of profiles
+    """
+    page_url = f"{url}?page={page}"
+
+    for attempt in range(max_retries + 1):
+        try:
+            data, response = cached_preview_post(
+                page_url, payload, headers, timeout, acquire_token=acquire_token
+            )
+
+            if data is not None:
+                # Preview endpoint returns list of full profile objects
+                if isinstance(data, list):
+                    return True, data, None
+                return True, data.get("hits", []), None
+
+            if response.status_code == 503 and attempt < max_retries:
+                wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
+                print(f"   ⚠️  Rate limit (503) on page {page} - retrying in {wait_time}s...")
+                time.sleep(wait_time)
+                continue
+
+            error_body = response.text[:200] if response.text else "No response body"
+            return False, None, f"API error {response.status_code}: {error_body}"
+
+        except requests.exceptions.Timeout:
+            if attempt < max_retries:
+                print(f"   ⚠️  Timeout on page {page} - retrying...")
+                time.sleep(2)
+                continue
+            return False, None, f"Request timeout after {timeout}s"
+
+        except Exception as e:
+            return False, None, f"Request exception: {str(e)}"
+
+    return False, None, "Max retries exceeded"
+
+
+def preview_profile_id(profile: Any) -> Optional[str]:
+    """Stable identifier for a preview profile (employee ID, else LinkedIn URL)."""
+    if not isinstance(profile, dict):
+        return str(profile) if profile is not None else None
+
+    for field in ("id", "websites_linkedin", "linkedin_url", "professional_network_url"):
+        value = profile.get(field)
+        if value:
+            return str(value)
+    return None
+
+
+def dedupe_profiles(profiles: List[Any], seen_ids: Optional[set] = None) -> List[Any]:
+    """
+    Drop profiles whose ID was already seen (in this list or in seen_ids).
+
+    Order is preserved. seen_ids, if given, is updated with the IDs kept, so
+    it can be carried across pages or requests.
+    """
+    seen = seen_ids if seen_ids is not None else set()
+    unique = []
+
+    for profile in profiles:
+        profile_id = preview_profile_id(profile)
+        if profile_id is not None:
+            if profile_id in seen:
+                continue
+            seen.add(profile_id)
+        unique.append(profile)
+
+    return unique
+
+
+def to_light_profile(profile: Any) -> Any:
+    """Project a preview profile onto LIGHT_PREVIEW_FIELDS (ID-only mode)."""
+    if not isinstance(profile, dict):
+        return profile
+    return {field: profile[field] for field in LIGHT_PREVIEW_FIELDS if field in profile}
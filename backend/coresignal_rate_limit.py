@@ -0,0 +1,77 @@
+"""
+CoreSignal Rate Limit
+Process-wide request throttle shared by every CoreSignal caller.
+
+CoreSignal allows 18 requests/second per API key and answers 503 (not 429)
+when that is exceeded. Concurrent callers (thread pools, parallel company
+lookups) take a token here before each request so they never burst past it.
+"""
+
+import os
+import threading
+import time
+
+
+class CoreSignalRateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `burst`; acquire()
+    blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        """
+        Args:
+            rate: Requests per second
+            burst: Maximum requests allowed back-to-back (defaults to one second's worth)
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+    def try_acquire(self, reserve: float = 0.0) -> bool:
+        """
+        Take a token only if one is available right now, leaving `reserve`
+        tokens untouched for foreground requests.
+
+        Returns:
+            True if a token was taken
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            if self._tokens >= 1 + reserve:
+                self._tokens -= 1
+                return True
+            return False
+
+
+# Requests/second for this process. With several gunicorn workers sharing one key,
+# set CORESIGNAL_REQUESTS_PER_SECOND to the account limit divided by the worker count.
+CORESIGNAL_REQUESTS_PER_SECOND = float(os.getenv("CORESIGNAL_REQUESTS_PER_SECOND", "18"))
+
+# Max CoreSignal requests in flight from one request handler's thread pool
+CORESIGNAL_MAX_CONCURRENT = int(os.getenv("CORESIGNAL_MAX_CONCURRENT", "8"))
+
+coresignal_rate_limiter = CoreSignalRateLimiter(CORESIGNAL_REQUESTS_PER_SECOND)
@@ -11,8 +11,11 @@ Key Changes:
 import requests
 import json
 import os
+import threading
 from typing import List, Dict, Any, Optional
 
+from coresignal_pagination import PREVIEW_MAX_PAGES, PREVIEW_PAGE_SIZE, cached_preview_post
+
 
 class CoreSignalService:
     def __init__(self):
@@ -1115,114 +1118,340 @@ class CoreSignalService:
             return None
 
 
+# Combined ("terms") company search: at most this many company IDs per query.
+# /preview returns at most PREVIEW_MAX_PAGES x PREVIEW_PAGE_SIZE (5 x 20 = 100)
+# hits per query, so a chunk's companies share those 100 hits unevenly.
+COMPANY_IDS_PER_TERMS_QUERY = 50
+
+
+class PreviewRequestCounter:
+    """Thread-safe count of /preview HTTP requests made by one search (cache hits excluded)."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self) -> None:
+        with self._lock:
+            self.count += 1
+
+
 def search_profiles_by_company_ids(
     company_ids: List[int],
     title: Optional[str] = None,
     seniority: Optional[str] = None,
     location: Optional[str] = None,
-    max_per_company: int = 20
+    max_per_company: int = 20,
+    max_workers: Optional[int] = None,
+    mode: str = "per_company",
+    request_counter: Optional[PreviewRequestCounter] = None
 ) -> List[Dict[str, Any]]:
     """
     Search for employee profiles at multiple companies using CoreSignal.
 
+    Modes:
+    - "per_company": one preview search per company, run concurrently under
+      the shared CoreSignal rate limit (1-5 requests per company).
+    - "combined": up to 50 company IDs per `terms` query, paged only as far
+      as the chunk's total need (companies x max_per_company, at most 5 pages
+      of 20). Hits are split back out per company and capped at
+      max_per_company each; the split is uneven - a large company can take
+      most of a chunk's 100 hits. Only companies that got nothing from a
+      response whose last page was still full (i.e. possibly crowded out) are
+      searched again, together, in another combined round. For 50 companies
+      this is typically 5-10 requests instead of 50+, but the result is less
+      balanced than per-company mode; pass request_counter to measure.
+
+    Profiles are returned grouped in company_ids order.
+
     Args:
         company_ids: List of CoreSignal company IDs to search
         title: Optional job title filter (e.g., "engineer")
         seniority: Optional seniority level (e.g., "senior")
         location: Optional location filter (e.g., "San Francisco")
         max_per_company: Maximum profiles per company
+        max_workers: Concurrent searches (defaults to CORESIGNAL_MAX_CONCURRENT)
+        mode: "per_company" or "combined"
+        request_counter: Optional counter incremented per /preview HTTP request
 
     Returns:
         List of employee profile dictionaries
     """
-    import os
-    import requests
+    from concurrent.futures import ThreadPoolExecutor
+    from coresignal_rate_limit import CORESIGNAL_MAX_CONCURRENT
+
+    if not company_ids:
+        return []
+
+    if mode not in ("per_company", "combined"):
+        raise ValueError(f"Unknown company search mode: {mode}")
+
+    filters = {"title": title, "seniority": seniority, "location": location}
+    request_counter = request_counter or PreviewRequestCounter()
+    requests_before = request_counter.count
+
+    if mode == "combined":
+        profiles = _search_profiles_combined(
+            company_ids, filters, max_per_company, max_workers, request_counter
+        )
+    else:
+        workers = min(max_workers or CORESIGNAL_MAX_CONCURRENT, len(company_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda company_id: search_profiles_by_company_id(
+                    company_id,
+                    max_per_company=max_per_company,
+                    request_counter=request_counter,
+                    **filters
+                ),
+                company_ids
+            )
+            profiles = [profile for company_profiles in results for profile in company_profiles]
 
-    api_key = os.getenv("CORESIGNAL_API_KEY")
-    if not api_key:
-        raise ValueError("CORESIGNAL_API_KEY not found")
+    print(f"[CORESIGNAL] {mode} search: {len(company_ids)} companies, "
+          f"{request_counter.count - requests_before} /preview requests, {len(profiles)} profiles")
+    return profiles
 
-    base_url = "https://api.coresignal.com"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
 
-    all_profiles = []
+def search_profiles_by_company_id(
+    company_id: int,
+    title: Optional[str] = None,
+    seniority: Optional[str] = None,
+    location: Optional[str] = None,
+    max_per_company: int = 20,
+    request_counter: Optional[PreviewRequestCounter] = None
+) -> List[Dict[str, Any]]:
+    """
+    Search for employee profiles at a single company using CoreSignal.
+
+    Safe to call from worker threads; waits on the shared CoreSignal rate limit.
+
+    Args:
+        company_id: CoreSignal company ID to search
+        title: Optional job title filter (e.g., "engineer")
+        seniority: Optional seniority level (e.g., "senior")
+        location: Optional location filter (e.g., "San Francisco")
+        max_per_company: Maximum profiles to return
+        request_counter: Optional counter incremented per /preview HTTP request
+
+    Returns:
+        List of employee profile dictionaries (empty on API error)
+    """
+    payload = _build_company_people_query(
+        {"term": {"last_company_id": company_id}},
+        title, seniority, location
+    )
+
+    hits = []
+    # /preview serves 20 hits per page (pages 1-5); stop at a short page
+    for page in range(1, PREVIEW_MAX_PAGES + 1):
+        try:
+            page_hits = _post_employee_preview_search(payload, page, request_counter)
+        except requests.exceptions.RequestException as e:
+            print(f"[CORESIGNAL] Error searching company {company_id} (page {page}): {e}")
+            break
+
+        hits.extend(page_hits)
+        if len(hits) >= max_per_company or len(page_hits) < PREVIEW_PAGE_SIZE:
+            break
 
-    for company_id in company_ids:
-        # Build query for this company
-        must_clauses = [
-            {"term": {"last_company_id": company_id}}
+    return [_profile_from_hit(hit, company_id) for hit in hits[:max_per_company]]
+
+
+def _search_profiles_combined(
+    company_ids: List[int],
+    filters: Dict[str, Optional[str]],
+    max_per_company: int,
+    max_workers: Optional[int],
+    request_counter: PreviewRequestCounter
+) -> List[Dict[str, Any]]:
+    """Run chunked `terms` queries in rounds and split the hits back out per company."""
+    from concurrent.futures import ThreadPoolExecutor
+    from coresignal_rate_limit import CORESIGNAL_MAX_CONCURRENT
+
+    def search_chunk(chunk):
+        """(hits by company, companies that got nothing while the last page was full)."""
+        payload = _build_company_people_query(
+            {"terms": {"last_company_id": chunk}},
+            filters["title"], filters["seniority"], filters["location"]
+        )
+
+        # Keys as strings so int and str IDs from the API line up with the input
+        by_company = {str(company_id): [] for company_id in chunk}
+
+        def empty_companies():
+            return [company_id for company_id in chunk if not by_company[str(company_id)]]
+
+        # Page only as far as the chunk could use: companies x max_per_company hits
+        pages_needed = -(-len(chunk) * max(max_per_company, 1) // PREVIEW_PAGE_SIZE)
+        for page in range(1, min(pages_needed, PREVIEW_MAX_PAGES) + 1):
+            try:
+                hits = _post_employee_preview_search(payload, page, request_counter)
+            except requests.exceptions.RequestException as e:
+                print(f"[CORESIGNAL] Error searching {len(chunk)} companies (page {page}): {e}")
+                # Not retried here; companies already served keep their hits
+                return by_company, []
+
+            for hit in hits:
+                company_key = str(_hit_source(hit).get("last_company_id"))
+                company_profiles = by_company.get(company_key)
+                # Enforce max_per_company client-side
+                if company_profiles is not None and len(company_profiles) < max_per_company:
+                    company_profiles.append(hit)
+
+            # A short page is the end of the result set - nobody was crowded out
+            if len(hits) < PREVIEW_PAGE_SIZE:
+                return by_company, []
+            if all(len(profiles) >= max_per_company for profiles in by_company.values()):
+                return by_company, []
+
+        # Last page was still full: companies with nothing may have been crowded out
+        return by_company, empty_companies()
+
+    hits_by_company = {}
+    pending_ids = list(company_ids)
+    rounds = 0
+
+    # Each round queries only companies crowded out of the previous one. A full
+    # response serves at least 100 / max_per_company of them, so rounds shrink.
+    while pending_ids:
+        rounds += 1
+        chunks = [
+            pending_ids[i:i + COMPANY_IDS_PER_TERMS_QUERY]
+            for i in range(0, len(pending_ids), COMPANY_IDS_PER_TERMS_QUERY)
         ]
+        workers = min(max_workers or CORESIGNAL_MAX_CONCURRENT, len(chunks))
+
+        crowded_out = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for by_company, starved in executor.map(search_chunk, chunks):
+                hits_by_company.update(by_company)
+                crowded_out.extend(starved)
+
+        if len(crowded_out) >= len(pending_ids):
+            # No company was served - repeating the same query would not help
+            break
+        if crowded_out:
+            print(f"[CORESIGNAL] Combined search: {len(crowded_out)} companies crowded out, searching them again")
+        pending_ids = crowded_out
+
+    print(f"[CORESIGNAL] Combined search: {len(company_ids)} companies in {rounds} rounds")
+
+    return [
+        _profile_from_hit(hit, company_id)
+        for company_id in company_ids
+        for hit in hits_by_company.get(str(company_id), [])
+    ]
+
+
+def _build_company_people_query(
+    company_clause: Dict[str, Any],
+    title: Optional[str],
+    seniority: Optional[str],
+    location: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Build the ES DSL payload for a people search at one or more companies.
 
-        if title:
-            must_clauses.append({
-                "match": {
-                    "title": {
-                        "query": title,
-                        "fuzziness": "AUTO"
-                    }
+    No "size": /preview rejects it (HTTP 422) and always pages 20 hits at a time.
+    """
+    must_clauses = [company_clause]
+
+    if title:
+        must_clauses.append({
+            "match": {
+                "title": {
+                    "query": title,
+                    "fuzziness": "AUTO"
                 }
-            })
-
-        if seniority:
-            must_clauses.append({
-                "match": {
-                    "title": {
-                        "query": seniority,
-                        "fuzziness": "AUTO"
-                    }
+            }
+        })
+
+    if seniority:
+        must_clauses.append({
+            "match": {
+                "title": {
+                    "query": seniority,
+                    "fuzziness": "AUTO"
                 }
-            })
-
-        if location:
-            must_clauses.append({
-                "match": {
-                    "location": {
-                        "query": location,
-                        "fuzziness": "AUTO"
-                    }
+            }
+        })
+
+    if location:
+        must_clauses.append({
+            "match": {
+                "location": {
+                    "query": location,
+                    "fuzziness": "AUTO"
                 }
-            })
+            }
+        })
 
-        payload = {
-            "query": {
-                "bool": {
-                    "must": must_clauses
-                }
-            },
-            "size": max_per_company
+    return {
+        "query": {
+            "bool": {
+                "must": must_clauses
+            }
         }
+    }
 
-        try:
-            response = requests.post(
-                f"{base_url}/v2/employee_clean/search/es_dsl/preview",
-                json=payload,
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
 
-            data = response.json()
-            hits = data.get("hits", {}).get("hits", [])
+def _post_employee_preview_search(
+    payload: Dict[str, Any],
+    page: int = 1,
+    request_counter: Optional[PreviewRequestCounter] = None
+) -> List[Dict[str, Any]]:
+    """
+    POST one page (up to PREVIEW_PAGE_SIZE hits) of an employee preview search.
 
-            for hit in hits:
-                source = hit.get("_source", {})
-                all_profiles.append({
-                    "employee_id": source.get("id"),
-                    "full_name": source.get("name"),
-                    "title": source.get("title"),
-                    "company_id": company_id,
-                    "company_name": source.get("last_company_name"),
-                    "location": source.get("location"),
-                    "linkedin_url": source.get("url"),
-                    "headline": source.get("headline"),
-                    "score": hit.get("_score")
-                })
+    Repeated pages come from preview_search_cache; otherwise waits on the
+    shared CoreSignal rate limit (in cached_preview_post) and counts the
+    request on request_counter.
+    Raises RequestException on failure.
+    """
+    api_key = os.getenv("CORESIGNAL_API_KEY")
+    if not api_key:
+        raise ValueError("CORESIGNAL_API_KEY not found")
 
-        except requests.exceptions.RequestException as e:
-            print(f"[CORESIGNAL] Error searching company {company_id}: {e}")
-            continue
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
 
-    return all_profiles
+    data, response = cached_preview_post(
+        f"https://api.coresignal.com/v2/employee_clean/search/es_dsl/preview?page={page}",
+        payload,
+        headers,
+        timeout=10
+    )
+    if response is not None and request_counter is not None:
+        request_counter.add()
+    if data is None:
+        response.raise_for_status()
+        raise requests.exceptions.HTTPError(f"Unexpected status {response.status_code}", response=response)
+
+    # Preview returns a list of profiles; ES-style {"hits": {"hits": [...]}} is also accepted
+    if isinstance(data, list):
+        return data
+    return data.get("hits", {}).get("hits", [])
+
+
+def _hit_source(hit: Dict[str, Any]) -> Dict[str, Any]:
+    """Profile fields of a hit (ES hits wrap them in _source, preview profiles don't)."""
+    return hit.get("_source", hit)
+
+
+def _profile_from_hit(hit: Dict[str, Any], company_id: int) -> Dict[str, Any]:
+    """Convert an employee search hit to the profile dict returned to callers."""
+    source = _hit_source(hit)
+    return {
+        "employee_id": source.get("id"),
+        "full_name": source.get("name"),
+        "title": source.get("title"),
+        "company_id": company_id,
+        "company_name": source.get("last_company_name"),
+        "location": source.get("location"),
+        "linkedin_url": source.get("url"),
+        "headline": source.get("headline"),
+        "score": hit.get("_score")
+    }
@@ -6,61 +6,18 @@ function to support fetching more than 20 candidates.
 """
 
 import os
-import requests
-import time
 import math
 from typing import Dict, Any, List, Optional
 
-
-def make_coresignal_request_with_retry(url, payload, headers, max_retries=3, timeout=30):
-    """
-    Make CoreSignal API request with retry logic for 503 errors.
-
-    CoreSignal uses 18 requests/second rate limit and returns 503 for rate limiting.
-
-    Args:
-        url: CoreSignal API endpoint URL
-        payload: Request payload (query)
-        headers: Request headers with API key
-        max_retries: Maximum number of retries (default 3)
-        timeout: Request timeout in seconds (default 30)
-
-    Returns:
-        tuple: (success: bool, response_json: dict/list, error_msg: str)
-    """
-    for attempt in range(max_retries + 1):
-        try:
-            response = requests.post(url, json=payload, headers=headers, timeout=timeout)
-
-            if response.status_code == 200:
-                return (True, response.json(), None)
-
-            # Retry on 503 (rate limiting)
-            if response.status_code == 503 and attempt < max_retries:
-                wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                print(f"   ⚠️  Rate limit (503) - retrying in {wait_time}s (attempt {attempt + 1}/{max_retries + 1})...")
-                time.sleep(wait_time)
-                continue
-
-            # Return error for non-retryable status codes or max retries reached
-            error_body = response.text[:200] if response.text else "No response body"
-            return (False, None, f"API error {response.status_code}: {error_body}")
-
-        except requests.exceptions.Timeout:
-            if attempt < max_retries:
-                print(f"   ⚠️  Timeout - retrying...")
-                time.sleep(2)
-                continue
-            return (False, None, f"Request timeout after {timeout}s")
-
-        except Exception as e:
-            if attempt < max_retries:
-                print(f"   ⚠️  Error: {e} - retrying...")
-                time.sleep(2)
-                continue
-            return (False, None, f"Request exception: {str(e)}")
-
-    return (False, None, "Max retries exceeded")
+from coresignal_pagination import (
+    PREVIEW_MAX_PAGES,
+    PREVIEW_PAGE_SIZE,
+    dedupe_profiles,
+    fetch_pages_concurrently,
+    preview_profile_id,
+    request_preview_page,
+    to_light_profile
+)
 
 
 def search_profiles_with_endpoint_paginated(
@@ -68,23 +25,30 @@ def search_profiles_with_endpoint_paginated(
     endpoint: str = "employee_clean",
     max_results: int = 20,
     page_start: int = 1,
-    delay_between_pages: float = 4.0  # Increased from 2.0 to prevent rate limits
+    id_only: bool = False,
+    seen_ids: Optional[set] = None
 ) -> Dict[str, Any]:
     """
     Execute custom ES DSL search with PAGINATION support.
 
     CoreSignal's preview endpoint returns max 20 results per page.
-    This function can fetch multiple pages to get up to 100 results.
+    This function can fetch multiple pages to get up to 100 results; pages are
+    requested concurrently under the shared CoreSignal rate limit. Profiles are
+    de-duplicated by employee ID across pages.
 
     Args:
         query: Elasticsearch DSL query dict
         endpoint: CoreSignal endpoint (employee_base, employee_clean, multi_source_employee)
         max_results: Maximum number of results to return (can be > 20)
         page_start: Starting page number (for "Load More" functionality)
-        delay_between_pages: Seconds to wait between page requests (rate limit protection)
+        id_only: Return only identifier/headline fields (LIGHT_PREVIEW_FIELDS)
+        seen_ids: IDs already returned earlier (e.g. previous pages); the IDs
+            returned by this call are added in place
 
     Returns:
-        Dict with 'success', 'results', 'total', 'pages_fetched', 'has_more'
+        Dict with 'success', 'results', 'total', 'pages_fetched', 'has_more'.
+        If profiles had to be trimmed to max_results, pagination.last_page
+        stops before the page they came from, so a later call returns them.
     """
     api_key = os.getenv("CORESIGNAL_API_KEY")
     if not api_key:
@@ -96,12 +60,9 @@ def search_profiles_with_endpoint_paginated(
         "Content-Type": "application/json"
     }
 
-    # Calculate pagination
-    RESULTS_PER_PAGE = 20
-    MAX_PAGES = 5  # CoreSignal limits to 5 pages (100 results max)
-
-    total_pages_needed = math.ceil(max_results / RESULTS_PER_PAGE)
-    pages_to_fetch = min(total_pages_needed, MAX_PAGES - page_start + 1)
+    # Calculate pagination (CoreSignal limits to 5 pages, 100 results max)
+    total_pages_needed = math.ceil(max_results / PREVIEW_PAGE_SIZE)
+    pages_to_fetch = min(total_pages_needed, PREVIEW_MAX_PAGES - page_start + 1)
 
     # Build base URL
     base_url = f"https://api.coresignal.com/cdapi/v2/{endpoint}/search/es_dsl/preview"
@@ -110,84 +71,80 @@ def search_profiles_with_endpoint_paginated(
     if "size" in query:
         del query["size"]
 
-    all_results = []
-    pages_fetched = 0
-    total_found = 0
-
     print(f"🔍 Paginated search on {endpoint}")
     print(f"   Target: {max_results} results")
     print(f"   Starting from page: {page_start}")
     print(f"   Pages to fetch: {pages_to_fetch}")
 
-    for page_num in range(page_start, page_start + pages_to_fetch):
-        # Add delay between pages (except for first page)
-        if page_num > page_start:
-            print(f"   ⏱️  Waiting {delay_between_pages}s before next page (rate limit protection)...")
-            time.sleep(delay_between_pages)
-
-        print(f"   📄 Fetching page {page_num}...")
+    page_outcomes = fetch_pages_concurrently(
+        lambda page: request_preview_page(base_url, query, headers, page, max_retries=3, timeout=30),
+        list(range(page_start, page_start + pages_to_fetch))
+    )
 
-        # Add page parameter to URL
-        url_with_page = f"{base_url}?page={page_num}"
+    all_results = []
+    result_pages = []  # Page each entry of all_results came from
+    pages_fetched = 0
+    # Only profiles actually returned are added to seen_ids (after trimming)
+    seen_before = set(seen_ids) if seen_ids is not None else set()
+    fetched_count = 0
 
-        # Use retry logic for 503 errors
-        success, data, error_msg = make_coresignal_request_with_retry(
-            url=url_with_page,
-            payload=query,
-            headers=headers,
-            max_retries=3,
-            timeout=30
-        )
+    for outcome in page_outcomes:
+        page_num = outcome["page"]
 
-        if not success:
-            print(f"   ⚠️  Page {page_num} failed: {error_msg}")
+        if not outcome["success"]:
+            print(f"   ⚠️  Page {page_num} failed: {outcome['error']}")
             # If first page fails, return error
             if page_num == page_start:
                 return {
                     "success": False,
-                    "error": f"Search failed: {error_msg}",
-                    "details": error_msg
+                    "error": f"Search failed: {outcome['error']}",
+                    "details": outcome["error"]
                 }
             # Otherwise, return what we have so far
             break
 
-        # Handle response format
-        if isinstance(data, list):
-            # Preview endpoint returns list of employee IDs/profiles
-            page_results = data
-            print(f"   ✅ Page {page_num}: {len(page_results)} results")
-        else:
-            # Should not happen with preview endpoint
-            page_results = []
-            print(f"   ⚠️  Unexpected response format on page {page_num}")
-
+        print(f"   ✅ Page {page_num}: {len(outcome['results'])} results")
+        fetched_count += len(outcome["results"])
+        # Drop employees repeated across pages (or already returned earlier)
+        page_results = dedupe_profiles(outcome["results"], seen_before)
         all_results.extend(page_results)
+        result_pages.extend([page_num] * len(page_results))
         pages_fetched += 1
 
-        # Stop if we have enough results
-        if len(all_results) >= max_results:
-            all_results = all_results[:max_results]
-            print(f"   ✂️  Trimmed to {max_results} results")
-            break
-
-        # Stop if page returned less than full page (no more results)
-        if len(page_results) < RESULTS_PER_PAGE:
-            print(f"   📍 Reached end of results (page {page_num} had {len(page_results)} results)")
-            break
-
-    # Calculate if there are more results available
+    # Calculate if there are more results available (from raw page sizes)
     last_page_fetched = page_start + pages_fetched - 1
     has_more = (
-        last_page_fetched < MAX_PAGES and  # Haven't reached API limit
-        len(all_results) == pages_fetched * RESULTS_PER_PAGE  # Last page was full
+        last_page_fetched < PREVIEW_MAX_PAGES and  # Haven't reached API limit
+        fetched_count == pages_fetched * PREVIEW_PAGE_SIZE  # Last page was full
     )
 
+    duplicates_removed = fetched_count - len(all_results)
+    if duplicates_removed:
+        print(f"   🔁 Removed {duplicates_removed} duplicate profiles")
+
+    # Stop if we have enough results
+    if len(all_results) > max_results:
+        # The cursor stays before the first page with profiles left over
+        last_page_fetched = result_pages[max_results] - 1
+        has_more = True
+        all_results = all_results[:max_results]
+        print(f"   ✂️  Trimmed to {max_results} results (next call resumes at page {last_page_fetched + 1})")
+
+    if seen_ids is not None:
+        seen_ids.update(
+            profile_id for profile_id in map(preview_profile_id, all_results) if profile_id is not None
+        )
+
+    if id_only:
+        all_results = [to_light_profile(profile) for profile in all_results]
+
     print(f"   🎯 Total fetched: {len(all_results)} results across {pages_fetched} pages")
 
     return {
         "success": True,
         "results": all_results,
         "total": len(all_results),
+        "duplicates_removed": duplicates_removed,
         "endpoint": endpoint,
         "pagination": {
             "pages_fetched": pages_fetched,
@@ -201,35 +158,29 @@ def search_profiles_with_endpoint_paginated(
 def fetch_more_previews(
     session_id: str,
     current_count: int,
-    additional_count: int = 20
+    additional_count: int = 20,
+    id_only: bool = False
 ) -> Dict[str, Any]:
     """
     Fetch additional preview candidates for an existing search session.
 
     This function would be called by a "Load More" button in the UI.
+    Pages the session has already fetched are never requested again, and the
+    following page is prefetched in the background.
 
     Args:
         session_id: The domain search session ID
         current_count: How many candidates are already loaded
         additional_count: How many more to fetch (default 20)
+        id_only: Return only identifier/headline fields for each preview
 
     Returns:
         Dict with new previews and pagination info
     """
-    # Calculate which page to start from
-    current_pages = math.ceil(current_count / 20)
-    next_page = current_pages + 1
-
-    if next_page > 5:
-        return {
-            "success": False,
-            "error": "Maximum results reached (100 candidates)",
-            "previews": [],
-            "has_more": False
-        }
+    from preview_prefetch import preview_prefetcher
+    preview_prefetcher.touch(session_id)
 
     # Load the saved query from session
-    # (This would need to be implemented - save query in session storage)
     saved_query = load_query_from_session(session_id)
 
     if not saved_query:
@@ -239,12 +190,28 @@ def fetch_more_previews(
             "previews": []
         }
 
+    # Continue after the session's cursor (falls back to the client's count).
+    # Only fully returned pages count - a partly returned page is revisited and
+    # its already-returned profiles are filtered out via returned_ids.
+    current_pages = current_count // PREVIEW_PAGE_SIZE
+    next_page = max(current_pages, saved_query["last_page"]) + 1
+
+    if next_page > PREVIEW_MAX_PAGES:
+        return {
+            "success": False,
+            "error": "Maximum results reached (100 candidates)",
+            "previews": [],
+            "has_more": False
+        }
+
     # Fetch additional pages
     result = search_profiles_with_endpoint_paginated(
         query=saved_query["query"],
         endpoint=saved_query["endpoint"],
         max_results=additional_count,
-        page_start=next_page
+        page_start=next_page,
+        id_only=id_only,
+        seen_ids=set(map(str, saved_query["returned_ids"]))
     )
 
     if not result["success"]:
@@ -254,36 +221,60 @@ def fetch_more_previews(
             "previews": []
         }
 
+    pagination = result["pagination"]
+    if pagination["pages_fetched"]:
+        from search_session_store import search_session_store
+        search_session_store.save(
+            session_id,
+            fetched_pages=range(next_page, pagination["last_page"] + 1),
+            returned_ids=[preview_profile_id(profile) for profile in result["results"]],
+            last_page=pagination["last_page"],
+            added_fetched=len(result["results"])
+        )
+
+    # Users who load more usually load more again - warm the next page
+    if pagination["has_more"]:
+        preview_prefetcher.schedule(
+            session_id,
+            f"https://api.coresignal.com/cdapi/v2/{saved_query['endpoint']}/search/es_dsl/preview",
+            saved_query["query"],
+            {
+                "accept": "application/json",
+                "apikey": os.getenv("CORESIGNAL_API_KEY"),
+                "Content-Type": "application/json"
+            },
+            pagination["next_page"]
+        )
+
     return {
         "success": True,
         "previews": result["results"],
         "total_loaded": current_count + len(result["results"]),
-        "has_more": result["pagination"]["has_more"],
-        "next_page": result["pagination"]["next_page"]
+        "has_more": pagination["has_more"],
+        "next_page": pagination["next_page"]
     }
 
 
 def load_query_from_session(session_id: str) -> Optional[Dict[str, Any]]:
     """
-    Load saved query from session storage.
+    Load saved query from session storage (search_sessions).
 
-    In production, this would load from:
-    - Redis cache
-    - Supabase session table
-    - Or filesystem (current approach)
+    Returns:
+        Dict with 'query', 'endpoint', 'last_page' and 'returned_ids', or None
+        if the session is missing, expired or has no query
     """
-    import json
-    session_dir = f"/backend/logs/domain_search_sessions/{session_id}"
-    query_file = f"{session_dir}/02_preview_query.json"
-
-    if os.path.exists(query_file):
-        with open(query_file, 'r') as f:
-            data = json.load(f)
-            return {
-                "query": data.get("query"),
-                "endpoint": data.get("input", {}).get("endpoint", "employee_clean")
-            }
-    return None
+    from search_session_store import search_session_store
+
+    session = search_session_store.get(session_id)
+    if not session or session.get("query") is None:
+        return None
+
+    return {
+        "query": session["query"],
+        "endpoint": session.get("endpoint") or "employee_clean",
+        "last_page": session.get("last_page") or 0,
+        "returned_ids": session.get("returned_ids") or []
+    }
 
 
 # Example usage
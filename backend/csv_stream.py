@@ -0,0 +1,67 @@
+"""
+CSV Streaming
+Generator-based CSV writer for chunked (streamed) HTTP downloads.
+
+Rows are encoded a batch at a time through a small reusable buffer, so an
+export starts downloading immediately and the worker never holds the whole
+file (or a JSON copy of it) in memory.
+"""
+
+import csv
+from io import StringIO
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+# Rows encoded per yielded chunk
+CSV_ROWS_PER_CHUNK = 200
+
+
+def iter_csv(
+    header: Optional[Sequence[Any]],
+    rows: Iterable[Sequence[Any]],
+    rows_per_chunk: int = CSV_ROWS_PER_CHUNK
+) -> Iterator[str]:
+    """
+    Yield CSV text in chunks of rows_per_chunk rows.
+
+    Args:
+        header: Header row (written first), or None for no header
+        rows: Row iterable - may itself be a generator that fetches lazily
+        rows_per_chunk: Rows encoded per yielded chunk
+
+    Yields:
+        CSV text chunks; joined, they equal the full CSV document
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+
+    if header is not None:
+        writer.writerow(header)
+        pending += 1
+
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+
+    if pending:
+        yield buffer.getvalue()
+
+
+def csv_string(header: Optional[Sequence[Any]], rows: Iterable[Sequence[Any]]) -> str:
+    """Whole CSV document as one string (for callers that still embed it in JSON)."""
+    return "".join(iter_csv(header, rows))
+
+
+def csv_download_headers(filename: str) -> dict:
+    """Response headers for a streamed CSV attachment."""
+    return {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        # Stop reverse proxies from buffering the stream into one response
+        'X-Accel-Buffering': 'no',
+        'Cache-Control': 'no-cache'
+    }
@@ -6,12 +6,29 @@ quick profile adds, and assessment triggers.
 
 import requests
 import os
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from supabase_pagination import keyset_params, split_page
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
+# IDs per `in.(...)` filter - keeps PostgREST URLs well under proxy limits
+IN_FILTER_CHUNK_SIZE = 200
+
+# Columns list views render - the profile_data JSONB is only loaded by get_profile()
+PROFILE_LIST_COLUMNS = (
+    'id,list_id,linkedin_url,name,headline,location,current_company,current_title,'
+    'profile_picture_url,assessed,assessment_id,assessment_score,status,'
+    'exported_to_recruiter,exported_at,added_by,added_at'
+)
+
+# How long list stats are served from memory (writes through this service invalidate them sooner)
+LIST_STATS_CACHE_SECONDS = 30
+
 class ExtensionService:
     """Service for Chrome extension operations"""
 
@@ -21,6 +38,8 @@ class ExtensionService:
             'Authorization': f'Bearer {SUPABASE_KEY}',
             'Content-Type': 'application/json'
         }
+        self._stats_cache = {}  # list_id -> (expires_at, stats)
+        self._stats_lock = threading.Lock()
 
     # ==================== LIST MANAGEMENT ====================
 
@@ -84,6 +103,7 @@ class ExtensionService:
             updates['updated_at'] = datetime.utcnow().isoformat()
 
             response = requests.patch(url, json=updates, headers=self.headers, params=params)
+            self._invalidate_stats(list_id)
 
             return response.ok
         except Exception as e:
@@ -94,67 +114,115 @@ class ExtensionService:
         """Soft delete a list (set is_active = false)"""
         return self.update_list(list_id, {'is_active': False})
 
-    def get_list_stats(self, list_id: str) -> Optional[Dict]:
-        """Get statistics for a list"""
+    def get_list(self, list_id: str) -> Optional[Dict]:
+        """Get a list's own row (name, template) without any profile data"""
         try:
-            # Get the list
-            list_url = f"{SUPABASE_URL}/rest/v1/recruiter_lists"
-            list_params = {'id': f'eq.{list_id}'}
-
-            list_response = requests.get(list_url, headers=self.headers, params=list_params)
+            url = f"{SUPABASE_URL}/rest/v1/recruiter_lists"
+            params = {
+                'select': 'id,list_name,job_template_id,recruiter_name',
+                'id': f'eq.{list_id}'
+            }
 
-            if not list_response.ok:
-                return None
+            response = requests.get(url, headers=self.headers, params=params)
 
-            lists = list_response.json()
-            if not lists:
+            if response.ok:
+                lists = response.json()
+                return lists[0] if lists else None
+            else:
+                print(f"Failed to get list: {response.status_code}")
                 return None
+        except Exception as e:
+            print(f"Error getting list: {e}")
+            return None
 
-            list_data = lists[0]
+    def get_list_stats(self, list_id: str) -> Optional[Dict]:
+        """
+        Get statistics for a list.
 
-            # Get profile stats
-            profiles_url = f"{SUPABASE_URL}/rest/v1/extension_profiles"
-            profiles_params = {'list_id': f'eq.{list_id}'}
+        Aggregated in Postgres by the get_list_stats RPC (one row back however
+        large the list) and cached for LIST_STATS_CACHE_SECONDS.
+        """
+        with self._stats_lock:
+            cached = self._stats_cache.get(list_id)
+            if cached and cached[0] > time.monotonic():
+                return dict(cached[1])
 
-            profiles_response = requests.get(profiles_url, headers=self.headers, params=profiles_params)
+        try:
+            url = f"{SUPABASE_URL}/rest/v1/rpc/get_list_stats"
+            response = requests.post(url, json={'list_uuid': list_id}, headers=self.headers)
 
-            if profiles_response.ok:
-                profiles = profiles_response.json()
+            if response.ok:
+                stats = response.json()
+            else:
+                # RPC not deployed yet (migrations/create_list_stats_rpc.sql)
+                print(f"get_list_stats RPC failed ({response.status_code}), aggregating client-side")
+                stats = self._compute_list_stats(list_id)
+        except Exception as e:
+            print(f"Error getting list stats: {e}")
+            return None
 
-                # Calculate stats
-                total = len(profiles)
-                assessed = sum(1 for p in profiles if p.get('assessed'))
-                exported = sum(1 for p in profiles if p.get('exported_to_recruiter'))
+        if stats:
+            with self._stats_lock:
+                self._stats_cache[list_id] = (time.monotonic() + LIST_STATS_CACHE_SECONDS, stats)
+            return dict(stats)
+        return None
 
-                scores = [p.get('assessment_score') for p in profiles if p.get('assessment_score')]
-                avg_score = sum(scores) / len(scores) if scores else None
+    def _compute_list_stats(self, list_id: str) -> Optional[Dict]:
+        """Fallback for get_list_stats: aggregate in Python from the stat columns only"""
+        list_data = self.get_list(list_id)
+        if not list_data:
+            return None
 
-                # Score distribution
-                score_dist = {
-                    '90-100': sum(1 for s in scores if 90 <= s <= 100),
-                    '80-89': sum(1 for s in scores if 80 <= s < 90),
-                    '70-79': sum(1 for s in scores if 70 <= s < 80),
-                    '60-69': sum(1 for s in scores if 60 <= s < 70),
-                    '<60': sum(1 for s in scores if s < 60)
-                }
+        profiles_url = f"{SUPABASE_URL}/rest/v1/extension_profiles"
+        profiles_params = {
+            'select': 'assessed,exported_to_recruiter,assessment_score',
+            'list_id': f'eq.{list_id}'
+        }
 
-                return {
-                    'list_id': list_id,
-                    'list_name': list_data.get('list_name'),
-                    'total_profiles': total,
-                    'assessed': assessed,
-                    'pending_assessment': total - assessed,
-                    'exported': exported,
-                    'avg_score': round(avg_score, 1) if avg_score else None,
-                    'score_distribution': score_dist,
-                    'job_template_id': list_data.get('job_template_id')
-                }
+        profiles_response = requests.get(profiles_url, headers=self.headers, params=profiles_params)
 
-            return None
-        except Exception as e:
-            print(f"Error getting list stats: {e}")
+        if not profiles_response.ok:
             return None
 
+        profiles = profiles_response.json()
+
+        # Calculate stats
+        total = len(profiles)
+        assessed = sum(1 for p in profiles if p.get('assessed'))
+        exported = sum(1 for p in profiles if p.get('exported_to_recruiter'))
+
+        scores = [p.get('assessment_score') for p in profiles if p.get('assessment_score')]
+        avg_score = sum(scores) / len(scores) if scores else None
+
+        # Score distribution
+        score_dist = {
+            '90-100': sum(1 for s in scores if 90 <= s <= 100),
+            '80-89': sum(1 for s in scores if 80 <= s < 90),
+            '70-79': sum(1 for s in scores if 70 <= s < 80),
+            '60-69': sum(1 for s in scores if 60 <= s < 70),
+            '<60': sum(1 for s in scores if s < 60)
+        }
+
+        return {
+            'list_id': list_id,
+            'list_name': list_data.get('list_name'),
+            'total_profiles': total,
+            'assessed': assessed,
+            'pending_assessment': total - assessed,
+            'exported': exported,
+            'avg_score': round(avg_score, 1) if avg_score else None,
+            'score_distribution': score_dist,
+            'job_template_id': list_data.get('job_template_id')
+        }
+
+    def _invalidate_stats(self, list_id: Optional[str] = None):
+        """Drop cached stats for a list (or for every list when it isn't known)"""
+        with self._stats_lock:
+            if list_id is None:
+                self._stats_cache.clear()
+            else:
+                self._stats_cache.pop(list_id, None)
+
     # ==================== PROFILE MANAGEMENT ====================
 
     def add_profile(self, profile_data: Dict) -> Optional[Dict]:
@@ -192,6 +260,7 @@ class ExtensionService:
                 # Update list counts
                 if profile and profile_data.get('list_id'):
                     self._update_list_counts(profile_data.get('list_id'))
+                    self._invalidate_stats(profile_data.get('list_id'))
 
                 return profile
             else:
@@ -228,6 +297,8 @@ class ExtensionService:
             headers = {**self.headers, 'Prefer': 'return=representation'}
 
             response = requests.patch(url, json=updates, headers=headers, params=params)
+            # The profile may have moved from another list
+            self._invalidate_stats()
 
             if response.ok:
                 result = response.json()
@@ -238,24 +309,14 @@ class ExtensionService:
             print(f"Error updating existing profile: {e}")
             return None
 
-    def get_profiles_in_list(self, list_id: str, filters: Optional[Dict] = None) -> List[Dict]:
-        """Get all profiles in a list with optional filters"""
+    def get_profiles_in_list(self, list_id: str, filters: Optional[Dict] = None, columns: str = '*') -> List[Dict]:
+        """Get all profiles in a list with optional filters (columns: PostgREST select list)"""
         try:
             url = f"{SUPABASE_URL}/rest/v1/extension_profiles"
 
-            params = {
-                'list_id': f'eq.{list_id}',
-                'order': 'added_at.desc'
-            }
-
-            # Apply filters
-            if filters:
-                if filters.get('assessed') is not None:
-                    params['assessed'] = f'eq.{filters["assessed"]}'
-                if filters.get('min_score'):
-                    params['assessment_score'] = f'gte.{filters["min_score"]}'
-                if filters.get('status'):
-                    params['status'] = f'eq.{filters["status"]}'
+            params = self._profile_filter_params(list_id, filters)
+            params['select'] = columns
+            params['order'] = 'added_at.desc'
 
             response = requests.get(url, headers=self.headers, params=params)
 
@@ -268,6 +329,74 @@ class ExtensionService:
             print(f"Error getting profiles: {e}")
             return []
 
+    def get_profiles_page(
+        self,
+        list_id: str,
+        filters: Optional[Dict] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of a list's profiles, newest first (keyset on added_at, id).
+
+        Only PROFILE_LIST_COLUMNS are returned; use get_profile() for profile_data.
+
+        Returns:
+            (profiles, next_cursor) - next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        params = self._profile_filter_params(list_id, filters)
+        params['select'] = PROFILE_LIST_COLUMNS
+        params.update(keyset_params('added_at', limit, cursor))
+
+        try:
+            url = f"{SUPABASE_URL}/rest/v1/extension_profiles"
+            response = requests.get(url, headers=self.headers, params=params)
+
+            if response.ok:
+                return split_page(response.json(), limit, 'added_at')
+            else:
+                print(f"Failed to get profiles page: {response.status_code}")
+                return [], None
+        except Exception as e:
+            print(f"Error getting profiles page: {e}")
+            return [], None
+
+    def get_profile(self, profile_id: str) -> Optional[Dict]:
+        """Get one profile with every column, including profile_data"""
+        try:
+            url = f"{SUPABASE_URL}/rest/v1/extension_profiles"
+            params = {'id': f'eq.{profile_id}'}
+
+            response = requests.get(url, headers=self.headers, params=params)
+
+            if response.ok:
+                profiles = response.json()
+                return profiles[0] if profiles else None
+            else:
+                print(f"Failed to get profile: {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"Error getting profile: {e}")
+            return None
+
+    def _profile_filter_params(self, list_id: str, filters: Optional[Dict]) -> Dict:
+        """PostgREST filters for a list's profiles"""
+        params = {'list_id': f'eq.{list_id}'}
+
+        # Apply filters
+        if filters:
+            if filters.get('assessed') is not None:
+                params['assessed'] = f'eq.{filters["assessed"]}'
+            if filters.get('min_score'):
+                params['assessment_score'] = f'gte.{filters["min_score"]}'
+            if filters.get('status'):
+                params['status'] = f'eq.{filters["status"]}'
+
+        return params
+
     def update_profile(self, profile_id: str, updates: Dict) -> bool:
         """Update a profile"""
         try:
@@ -275,6 +404,7 @@ class ExtensionService:
             params = {'id': f'eq.{profile_id}'}
 
             response = requests.patch(url, json=updates, headers=self.headers, params=params)
+            self._invalidate_stats()
 
             return response.ok
         except Exception as e:
@@ -294,8 +424,39 @@ class ExtensionService:
         }
         return self.update_profile(profile_id, updates)
 
+    def link_assessments(self, links: List[Dict]) -> int:
+        """
+        Link many profiles to their assessments in one request.
+
+        Args:
+            links: Dicts with profile_id, assessment_id and assessment_score
+
+        Returns:
+            Number of profiles linked
+        """
+        if not links:
+            return 0
+
+        try:
+            url = f"{SUPABASE_URL}/rest/v1/rpc/link_extension_assessments"
+            response = requests.post(url, json={'links': links}, headers=self.headers)
+            self._invalidate_stats()
+
+            if response.ok:
+                return response.json() or 0
+
+            # RPC not deployed yet (migrations/create_link_extension_assessments.sql) - link one by one
+            print(f"Bulk link failed ({response.status_code}), linking profiles individually")
+            return sum(
+                1 for link in links
+                if self.link_assessment(link['profile_id'], link['assessment_id'], link['assessment_score'])
+            )
+        except Exception as e:
+            print(f"Error linking assessments: {e}")
+            return 0
+
     def mark_exported(self, profile_ids: List[str]) -> bool:
-        """Mark profiles as exported to LinkedIn Recruiter"""
+        """Mark profiles as exported to LinkedIn Recruiter (one PATCH per chunk of IDs)"""
         try:
             url = f"{SUPABASE_URL}/rest/v1/extension_profiles"
 
@@ -305,18 +466,56 @@ class ExtensionService:
                 'status': 'exported'
             }
 
-            # Update each profile
-            for profile_id in profile_ids:
-                params = {'id': f'eq.{profile_id}'}
+            all_ok = True
+            for chunk in _chunks(profile_ids, IN_FILTER_CHUNK_SIZE):
+                params = {'id': f'in.({",".join(str(profile_id) for profile_id in chunk)})'}
                 response = requests.patch(url, json=updates, headers=self.headers, params=params)
                 if not response.ok:
-                    print(f"Failed to mark profile {profile_id} as exported")
+                    print(f"Failed to mark {len(chunk)} profiles as exported: {response.status_code}")
+                    all_ok = False
 
-            return True
+            self._invalidate_stats()
+            return all_ok
         except Exception as e:
             print(f"Error marking profiles as exported: {e}")
             return False
 
+    # ==================== ASSESSMENTS ====================
+
+    def get_assessments_by_ids(self, assessment_ids: List, columns: str = 'id,assessment_data') -> Dict:
+        """
+        Fetch candidate_assessments rows by ID in bulk (one request per chunk of IDs).
+
+        Args:
+            assessment_ids: candidate_assessments IDs (duplicates/None ignored)
+            columns: PostgREST select list (must include id)
+
+        Returns:
+            Dict of assessment ID (as str) -> row
+        """
+        unique_ids = list(dict.fromkeys(str(a_id) for a_id in assessment_ids if a_id is not None))
+        assessments = {}
+
+        try:
+            url = f"{SUPABASE_URL}/rest/v1/candidate_assessments"
+
+            for chunk in _chunks(unique_ids, IN_FILTER_CHUNK_SIZE):
+                params = {
+                    'select': columns,
+                    'id': f'in.({",".join(chunk)})'
+                }
+                response = requests.get(url, headers=self.headers, params=params)
+
+                if response.ok:
+                    for row in response.json():
+                        assessments[str(row['id'])] = row
+                else:
+                    print(f"Failed to get assessments: {response.status_code}")
+        except Exception as e:
+            print(f"Error getting assessments: {e}")
+
+        return assessments
+
     # ==================== UTILITY FUNCTIONS ====================
 
     def _update_list_counts(self, list_id: str):
@@ -353,4 +552,10 @@ class ExtensionService:
                 return None
         except Exception as e:
             print(f"Error recording export: {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+def _chunks(items: List, size: int):
+    """Split a list into consecutive chunks of at most `size` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
@@ -0,0 +1,270 @@
+"""
+Feedback Service
+Recruiter feedback for the candidate list (table recruiter_feedback).
+
+The results list shows a feedback indicator per candidate. Summaries for a
+whole page of candidates come from one `in.(...)` query, and each URL's
+summary is cached briefly in process. /save-feedback and /clear-feedback
+invalidate the URL they touch; other workers catch up within the TTL.
+
+Auto-saved notes are drafts: each save upserts one row per (candidate,
+recruiter, draft_id), and saves arriving within a short window are coalesced
+so only the latest text is written.
+"""
+
+import atexit
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from search_result_cache import SearchResultCache
+
+# URLs per `in.(...)` filter - LinkedIn URLs are long, keep PostgREST URLs short
+FEEDBACK_URLS_PER_QUERY = 50
+
+FEEDBACK_SUMMARY_TTL_SECONDS = float(os.getenv("FEEDBACK_SUMMARY_TTL_SECONDS", "60"))
+FEEDBACK_SUMMARY_MAX_ENTRIES = int(os.getenv("FEEDBACK_SUMMARY_MAX_ENTRIES", "5000"))
+
+# Draft saves for the same note within this window are merged into one write
+NOTE_COALESCE_SECONDS = float(os.getenv("NOTE_COALESCE_SECONDS", "3"))
+
+# Draft writes time out after this long; /clear-feedback waits a little longer for them
+DRAFT_WRITE_TIMEOUT_SECONDS = 10
+
+DraftKey = Tuple[str, str, str]  # (linkedin_url, recruiter_name, draft_id)
+
+
+class FeedbackService:
+    """Bulk feedback summaries with a per-URL cache, and coalesced note drafts"""
+
+    TABLE = "recruiter_feedback"
+
+    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None):
+        self.supabase_url = supabase_url or os.getenv("SUPABASE_URL")
+        self.supabase_key = supabase_key or os.getenv("SUPABASE_KEY")
+        self.headers = {
+            'apikey': self.supabase_key,
+            'Authorization': f'Bearer {self.supabase_key}',
+            'Content-Type': 'application/json'
+        }
+        self.summary_cache = SearchResultCache(FEEDBACK_SUMMARY_TTL_SECONDS, FEEDBACK_SUMMARY_MAX_ENTRIES)
+        self._drafts_lock = threading.Lock()
+        self._pending_drafts: Dict[DraftKey, Dict] = {}  # key -> {"text", "revision", "timer"}
+        self._writing_drafts: Dict[DraftKey, int] = {}  # key -> draft writes in flight
+        self._drafts_changed = threading.Condition(self._drafts_lock)
+        # Don't drop buffered notes when a worker shuts down
+        atexit.register(self.flush_all_drafts)
+
+    def get_summaries(self, linkedin_urls: List[str]) -> Dict[str, Dict]:
+        """
+        Feedback summary for each candidate URL.
+
+        Returns:
+            Dict of linkedin_url -> {"count", "likes", "dislikes", "notes", "latest"}
+            (latest is the newest feedback row, or None when there is none)
+        """
+        urls = list(dict.fromkeys(url for url in linkedin_urls if url))
+        summaries = {}
+        missing = []
+
+        for url in urls:
+            cached = self.summary_cache.get(url)
+            if cached is None:
+                missing.append(url)
+            else:
+                summaries[url] = cached
+
+        if missing:
+            fetched = self._fetch_summaries(missing)
+            for url in missing:
+                summary = fetched.get(url) or _empty_summary()
+                self.summary_cache.set(url, summary)
+                summaries[url] = summary
+
+        return summaries
+
+    def invalidate(self, linkedin_url: str) -> None:
+        """Forget the cached summary for a candidate (after its feedback changes)"""
+        self.summary_cache.delete(linkedin_url)
+
+    def save_note_draft(
+        self,
+        linkedin_url: str,
+        recruiter_name: str,
+        draft_id: str,
+        feedback_text: str,
+        revision: int,
+        flush: bool = False
+    ) -> Tuple[bool, Optional[Dict]]:
+        """
+        Save an auto-saved note draft, coalescing rapid saves.
+
+        Without flush the text is buffered and written NOTE_COALESCE_SECONDS
+        after the first save of the burst (later saves just replace the
+        buffered text). With flush (blur, drawer close) it is written now.
+
+        Returns:
+            (success, row) - row is None while the save is only buffered
+        """
+        key = (linkedin_url, recruiter_name, draft_id)
+
+        with self._drafts_lock:
+            pending = self._pending_drafts.get(key)
+            if pending is None or revision >= pending["revision"]:
+                text = feedback_text
+            else:
+                text, revision = pending["text"], pending["revision"]
+
+            if not flush:
+                if pending is None:
+                    timer = threading.Timer(NOTE_COALESCE_SECONDS, self._flush_draft, args=(key,))
+                    timer.daemon = True
+                    self._pending_drafts[key] = {"text": text, "revision": revision, "timer": timer}
+                    timer.start()
+                else:
+                    pending["text"], pending["revision"] = text, revision
+                return True, None
+
+            if pending is not None:
+                pending["timer"].cancel()
+                del self._pending_drafts[key]
+            self._writing_drafts[key] = self._writing_drafts.get(key, 0) + 1
+
+        return self._tracked_write(key, text, revision)
+
+    def discard_drafts(self, linkedin_url: str, recruiter_name: str) -> None:
+        """
+        Drop buffered drafts for a candidate/recruiter (their feedback is being cleared).
+
+        Cancelling a timer doesn't stop a write that has already started, so
+        this also waits for in-flight draft writes - otherwise one could land
+        after the delete and bring the note back.
+        """
+        owner = (linkedin_url, recruiter_name)
+        with self._drafts_changed:
+            for key in [key for key in self._pending_drafts if key[:2] == owner]:
+                self._pending_drafts.pop(key)["timer"].cancel()
+
+            finished = self._drafts_changed.wait_for(
+                lambda: not any(key[:2] == owner for key in self._writing_drafts),
+                timeout=DRAFT_WRITE_TIMEOUT_SECONDS + 5
+            )
+        if not finished:
+            print(f"⚠️ Note draft write for {linkedin_url} still running after clear-feedback wait")
+
+    def flush_all_drafts(self) -> None:
+        """Write every buffered draft now"""
+        with self._drafts_lock:
+            keys = list(self._pending_drafts)
+        for key in keys:
+            self._flush_draft(key)
+
+    def _flush_draft(self, key: DraftKey) -> None:
+        with self._drafts_lock:
+            pending = self._pending_drafts.pop(key, None)
+            if pending is None:
+                return
+            pending["timer"].cancel()
+            # Counted as in flight before the lock is released, so discard_drafts sees it
+            self._writing_drafts[key] = self._writing_drafts.get(key, 0) + 1
+        self._tracked_write(key, pending["text"], pending["revision"])
+
+    def _tracked_write(self, key: DraftKey, feedback_text: str, revision: int) -> Tuple[bool, Optional[Dict]]:
+        """Write a draft already counted in _writing_drafts, then release it"""
+        try:
+            return self._write_draft(key, feedback_text, revision)
+        finally:
+            with self._drafts_changed:
+                remaining = self._writing_drafts.pop(key) - 1
+                if remaining:
+                    self._writing_drafts[key] = remaining
+                self._drafts_changed.notify_all()
+
+    def _write_draft(self, key: DraftKey, feedback_text: str, revision: int) -> Tuple[bool, Optional[Dict]]:
+        """Upsert a draft via the save_feedback_draft RPC (older revisions are ignored there)"""
+        linkedin_url, recruiter_name, draft_id = key
+
+        try:
+            response = requests.post(
+                f"{self.supabase_url}/rest/v1/rpc/save_feedback_draft",
+                headers=self.headers,
+                json={
+                    'p_linkedin_url': linkedin_url,
+                    'p_recruiter_name': recruiter_name,
+                    'p_draft_id': draft_id,
+                    'p_feedback_text': feedback_text,
+                    'p_revision': revision
+                },
+                timeout=DRAFT_WRITE_TIMEOUT_SECONDS
+            )
+            self.invalidate(linkedin_url)
+
+            if response.ok:
+                rows = response.json()
+                print(f"✅ Saved note draft {draft_id} (rev {revision}) from {recruiter_name} for {linkedin_url}")
+                return True, rows[0] if rows else None
+
+            if response.status_code == 404:
+                # A plain insert per flush would bring back one row per auto-save
+                print("❌ save_feedback_draft RPC not found - apply migrations/add_recruiter_feedback_drafts.sql")
+
+            print(f"❌ Failed to save note draft: {response.status_code} - {response.text[:200]}")
+            return False, None
+        except Exception as e:
+            print(f"❌ Error saving note draft: {e}")
+            return False, None
+
+    def _fetch_summaries(self, linkedin_urls: List[str]) -> Dict[str, Dict]:
+        """
+        Build summaries from one query per chunk of URLs.
+
+        Rows are read most recently written first (updated_at - a note draft
+        keeps its created_at while it is edited), so `latest` is the last write.
+        """
+        summaries: Dict[str, Dict] = {}
+        url = f"{self.supabase_url}/rest/v1/{self.TABLE}"
+
+        for start in range(0, len(linkedin_urls), FEEDBACK_URLS_PER_QUERY):
+            chunk = linkedin_urls[start:start + FEEDBACK_URLS_PER_QUERY]
+            params = {
+                'select': 'candidate_linkedin_url,feedback_type,feedback_text,recruiter_name,created_at,updated_at',
+                'candidate_linkedin_url': f'in.({",".join(_quote(value) for value in chunk)})',
+                'order': 'updated_at.desc,id.desc'
+            }
+
+            # Errors propagate so a failed read is not cached as "no feedback"
+            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response.raise_for_status()
+
+            for row in response.json():
+                summary = summaries.setdefault(row['candidate_linkedin_url'], _empty_summary())
+                summary['count'] += 1
+                key = {'like': 'likes', 'dislike': 'dislikes', 'note': 'notes'}.get(row.get('feedback_type'))
+                if key:
+                    summary[key] += 1
+                if summary['latest'] is None:
+                    summary['latest'] = {
+                        'feedback_type': row.get('feedback_type'),
+                        'feedback_text': row.get('feedback_text'),
+                        'recruiter_name': row.get('recruiter_name'),
+                        'created_at': row.get('created_at'),
+                        'updated_at': row.get('updated_at')
+                    }
+
+        return summaries
+
+
+def _empty_summary() -> Dict:
+    return {'count': 0, 'likes': 0, 'dislikes': 0, 'notes': 0, 'latest': None}
+
+
+def _quote(value: str) -> str:
+    """Quote a value for a PostgREST in.(...) filter."""
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+# Process-wide service used by the feedback endpoints
+feedback_service = FeedbackService()
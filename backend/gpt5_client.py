@@ -127,7 +127,10 @@ class GPT5Client:
     ) -> List[float]:
         """
         Batch screening with optimal model.
-        Returns relevance scores for each company.
+        Returns relevance scores for each company, in input order.
+
+        The scores array is returned as-is; callers must check its length
+        against the companies sent.
         """
         if not self.async_client:
             error_msg = "OpenAI client not initialized"
@@ -153,14 +156,13 @@ class GPT5Client:
                 response_format={"type": "json_object"}
             )
 
-            # Parse scores from response
+            # Parse scores from response (caller validates the array length)
             result = json.loads(response.choices[0].message.content)
 
-            return result.get("scores", [5.0] * len(companies))
+            return result.get("scores", [])
         except Exception as e:
             print(f"Batch screening error: {e}")
-            # Return default scores on error
-            return [5.0] * len(companies)
+            raise
 
     async def deep_research(
         self,
@@ -170,6 +172,8 @@ class GPT5Client:
         """
         Deep research with best available model.
         Returns comprehensive analysis.
+
+        Raises on API/parse errors so the caller can retry.
         """
         if not self.async_client:
             error_msg = "OpenAI client not initialized"
@@ -209,15 +213,8 @@ class GPT5Client:
             return json.loads(response.choices[0].message.content)
         except Exception as e:
             print(f"Deep research error: {e}")
-            # Return fallback structure
-            return {
-                "relevance_score": 5.0,
-                "category": "talent_pool",
-                "reasoning": f"Error during analysis: {str(e)[:100]}",
-                "talent_assessment": {},
-                "poaching_strategy": {},
-                "specific_targets": []
-            }
+            # Caller (CompanyResearchService) retries and owns the fallback
+            raise
 
     def _build_screening_prompt(
         self,
@@ -5,12 +5,11 @@ Adds "Load More" functionality to fetch candidates beyond the initial 20.
 This module can be integrated into the existing domain_search.py.
 """
 
-import json
 import os
 import time
 import math
+from datetime import datetime
 from typing import Dict, Any, List, Optional
-from pathlib import Path
 
 
 class DomainSearchPagination:
@@ -19,7 +18,6 @@ class DomainSearchPagination:
     RESULTS_PER_PAGE = 20
     MAX_PAGES = 5  # CoreSignal limit
     MAX_TOTAL_RESULTS = 100
-    RATE_LIMIT_DELAY = 4.0  # Seconds between pages (increased from 2.0 to prevent rate limits)
 
     def __init__(self, session_id: str):
         """
@@ -28,10 +26,20 @@ class DomainSearchPagination:
         Args:
             session_id: The domain search session ID
         """
-        self.session_id = session_id
-        self.session_dir = Path(f"logs/domain_search_sessions/{session_id}")
+        from search_session_store import search_session_store
 
-    def save_pagination_state(self, query: Dict, endpoint: str, current_page: int, total_fetched: int):
+        self.session_id = session_id
+        # Shared by all workers (Supabase), so "Load More" works whichever one serves it
+        self.store = search_session_store
+
+    def save_pagination_state(
+        self,
+        query: Dict,
+        endpoint: str,
+        current_page: int,
+        total_fetched: int,
+        candidates: Optional[List[Dict]] = None
+    ):
         """
         Save pagination state to session storage.
 
@@ -40,8 +48,22 @@ class DomainSearchPagination:
             endpoint: The CoreSignal endpoint
             current_page: Last page fetched
             total_fetched: Total candidates fetched so far
+            candidates: Candidates just returned (their IDs are remembered for
+                de-duplication and their count is added to the stored total)
         """
-        state = {
+        from coresignal_pagination import preview_profile_id
+
+        self.store.save(
+            self.session_id,
+            query=query,
+            endpoint=endpoint,
+            fetched_pages=range(1, current_page + 1),
+            returned_ids=[preview_profile_id(candidate) for candidate in candidates or []],
+            last_page=current_page,
+            added_fetched=len(candidates or [])
+        )
+
+        return {
             "session_id": self.session_id,
             "query": query,
             "endpoint": endpoint,
@@ -52,15 +74,6 @@ class DomainSearchPagination:
             }
         }
 
-        # Save to session directory
-        pagination_file = self.session_dir / "pagination_state.json"
-        pagination_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(pagination_file, 'w') as f:
-            json.dump(state, f, indent=2)
-
-        return state
-
     def load_pagination_state(self) -> Optional[Dict]:
         """
         Load saved pagination state from session.
@@ -68,19 +81,35 @@ class DomainSearchPagination:
         Returns:
             Saved state dict or None if not found
         """
-        pagination_file = self.session_dir / "pagination_state.json"
+        session = self.store.get(self.session_id)
+        if not session or session.get("query") is None:
+            return None
+
+        updated_at = session.get("updated_at")
+        timestamp = datetime.fromisoformat(updated_at.replace("Z", "+00:00")).timestamp() if updated_at else time.time()
 
-        if pagination_file.exists():
-            with open(pagination_file, 'r') as f:
-                return json.load(f)
-        return None
+        return {
+            "session_id": self.session_id,
+            "query": session["query"],
+            "endpoint": session["endpoint"],
+            "pagination": {
+                "last_page_fetched": session["last_page"],
+                "total_fetched": session["total_fetched"],
+                "timestamp": timestamp
+            },
+            "returned_ids": session["returned_ids"]
+        }
 
-    def fetch_next_page(self, api_key: str) -> Dict[str, Any]:
+    def fetch_next_page(self, api_key: str, pages: int = 1) -> Dict[str, Any]:
         """
-        Fetch the next page of results for this session.
+        Fetch the next page(s) of results for this session.
+
+        Several pages are requested concurrently under the shared CoreSignal
+        rate limit and returned in page order.
 
         Args:
             api_key: CoreSignal API key
+            pages: Number of consecutive pages to fetch (capped at the API limit)
 
         Returns:
             Dict with new candidates and pagination info
@@ -117,11 +146,13 @@ class DomainSearchPagination:
                 "has_more": False
             }
 
-        # Fetch next page
-        print(f"\n📄 Fetching page {next_page} for session {self.session_id}")
+        page_numbers = list(range(next_page, min(next_page + max(pages, 1), self.MAX_PAGES + 1)))
+
+        # Fetch next page(s)
+        print(f"\n📄 Fetching page(s) {page_numbers} for session {self.session_id}")
         print(f"   Current total: {total_fetched} candidates")
 
-        import requests
+        from coresignal_pagination import dedupe_profiles, fetch_pages_concurrently, request_preview_page
 
         headers = {
             "accept": "application/json",
@@ -129,49 +160,57 @@ class DomainSearchPagination:
             "Content-Type": "application/json"
         }
 
-        url = f"https://api.coresignal.com/cdapi/v2/{endpoint}/search/es_dsl/preview?page={next_page}"
-
-        try:
-            response = requests.post(url, json=query, headers=headers, timeout=30)
-
-            if response.status_code != 200:
-                return {
-                    "success": False,
-                    "error": f"API request failed: HTTP {response.status_code}",
-                    "candidates": []
-                }
+        url = f"https://api.coresignal.com/cdapi/v2/{endpoint}/search/es_dsl/preview"
 
-            candidates = response.json()
-
-            # Update pagination state
-            new_total = total_fetched + len(candidates)
-            self.save_pagination_state(query, endpoint, next_page, new_total)
-
-            # Check if there are more pages
-            has_more = (
-                len(candidates) == self.RESULTS_PER_PAGE and
-                next_page < self.MAX_PAGES and
-                new_total < self.MAX_TOTAL_RESULTS
-            )
+        page_outcomes = fetch_pages_concurrently(
+            lambda page: request_preview_page(url, query, headers, page, max_retries=2, timeout=30),
+            page_numbers,
+            page_size=self.RESULTS_PER_PAGE
+        )
 
-            print(f"   ✅ Fetched {len(candidates)} more candidates")
-            print(f"   📊 New total: {new_total} candidates")
+        candidates = []
+        last_fetched = last_page
+        for outcome in page_outcomes:
+            if not outcome["success"]:
+                # Keep the pages before the failure; fail only if nothing came back
+                if last_fetched == last_page:
+                    return {
+                        "success": False,
+                        "error": f"API request failed: {outcome['error']}",
+                        "candidates": []
+                    }
+                break
+            candidates.extend(outcome["results"])
+            last_fetched = outcome["page"]
+
+        # Last page was full (checked before de-duplication shrinks the list)
+        pages_full = len(candidates) == (last_fetched - last_page) * self.RESULTS_PER_PAGE
+
+        # Drop employees already returned on earlier pages of this session
+        candidates = dedupe_profiles(candidates, set(map(str, state.get("returned_ids", []))))
+
+        # Update pagination state
+        new_total = total_fetched + len(candidates)
+        self.save_pagination_state(query, endpoint, last_fetched, new_total, candidates)
+
+        # Check if there are more pages
+        has_more = (
+            pages_full and
+            last_fetched < self.MAX_PAGES and
+            new_total < self.MAX_TOTAL_RESULTS
+        )
 
-            return {
-                "success": True,
-                "candidates": candidates,
-                "page_fetched": next_page,
-                "total_fetched": new_total,
-                "has_more": has_more,
-                "remaining_pages": self.MAX_PAGES - next_page if has_more else 0
-            }
+        print(f"   ✅ Fetched {len(candidates)} more candidates")
+        print(f"   📊 New total: {new_total} candidates")
 
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to fetch page: {str(e)}",
-                "candidates": []
-            }
+        return {
+            "success": True,
+            "candidates": candidates,
+            "page_fetched": last_fetched,
+            "total_fetched": new_total,
+            "has_more": has_more,
+            "remaining_pages": self.MAX_PAGES - last_fetched if has_more else 0
+        }
 
 
 async def enhanced_stage2_preview_search(
@@ -200,7 +239,6 @@ async def enhanced_stage2_preview_search(
         Enhanced results with pagination info
     """
     from coresignal_service import search_profiles_with_endpoint
-    import os
 
     print("\n" + "="*80)
     print("STAGE 2: Enhanced Preview Search (with Pagination)")
@@ -235,53 +273,43 @@ async def enhanced_stage2_preview_search(
     session_id = session_logger.session_id if hasattr(session_logger, 'session_id') else "default"
     pagination = DomainSearchPagination(session_id)
 
-    # Fetch pages
-    for page_num in range(1, pages_to_fetch + 1):
-        if page_num > 1:
-            print(f"   ⏱️  Rate limit delay: {DomainSearchPagination.RATE_LIMIT_DELAY}s")
-            time.sleep(DomainSearchPagination.RATE_LIMIT_DELAY)
-
-        print(f"\n📄 Fetching page {page_num}/{pages_to_fetch}")
+    # Fetch page 1
+    print(f"\n📄 Fetching page 1/{pages_to_fetch}")
+    result = search_profiles_with_endpoint(
+        query=query,
+        endpoint=endpoint,
+        max_results=20
+    )
 
-        # For first page, use existing function
-        if page_num == 1:
-            result = search_profiles_with_endpoint(
-                query=query,
-                endpoint=endpoint,
-                max_results=20
-            )
+    if not result.get("success"):
+        return {
+            "success": False,
+            "error": result.get("error"),
+            "previews": []
+        }
 
-            if not result.get("success"):
-                return {
-                    "success": False,
-                    "error": result.get("error"),
-                    "previews": []
-                }
+    candidates = result.get("results", [])
+    all_candidates.extend(candidates)
+    pages_fetched = 1
+    print(f"   ✅ Page 1: {len(candidates)} candidates")
 
-            candidates = result.get("results", [])
-            all_candidates.extend(candidates)
+    # Save pagination state for potential "Load More"
+    pagination.save_pagination_state(query, endpoint, 1, len(candidates), candidates)
 
-            # Save pagination state for potential "Load More"
-            pagination.save_pagination_state(query, endpoint, 1, len(candidates))
+    # Fetch the remaining pages concurrently (skipped if page 1 was already the last)
+    if pages_to_fetch > 1 and len(candidates) == DomainSearchPagination.RESULTS_PER_PAGE:
+        result = pagination.fetch_next_page(api_key, pages=pages_to_fetch - 1)
 
+        if result.get("success"):
+            all_candidates.extend(result.get("candidates", []))
+            pages_fetched = result["page_fetched"]
         else:
-            # Fetch additional pages
-            result = pagination.fetch_next_page(api_key)
-
-            if not result.get("success"):
-                print(f"   ⚠️  Failed to fetch page {page_num}: {result.get('error')}")
-                break  # Return what we have so far
-
-            candidates = result.get("candidates", [])
-            all_candidates.extend(candidates)
+            print(f"   ⚠️  Failed to fetch more pages: {result.get('error')}")
 
-        print(f"   ✅ Page {page_num}: {len(candidates)} candidates")
-
-        # Stop if we have enough
-        if len(all_candidates) >= max_previews:
-            all_candidates = all_candidates[:max_previews]
-            print(f"   ✂️  Trimmed to {max_previews} candidates")
-            break
+    # Stop if we have enough
+    if len(all_candidates) > max_previews:
+        all_candidates = all_candidates[:max_previews]
+        print(f"   ✂️  Trimmed to {max_previews} candidates")
 
     # Calculate pagination info
     has_more = (
@@ -292,7 +320,7 @@ async def enhanced_stage2_preview_search(
 
     print(f"\n📊 Preview Search Results:")
     print(f"   Total candidates: {len(all_candidates)}")
-    print(f"   Pages fetched: {min(pages_to_fetch, page_num)}")
+    print(f"   Pages fetched: {pages_fetched}")
     print(f"   Has more available: {has_more}")
 
     return {
@@ -300,7 +328,7 @@ async def enhanced_stage2_preview_search(
         "total_found": len(all_candidates),
         "pagination": {
             "session_id": session_id,
-            "pages_fetched": min(pages_to_fetch, page_num),
+            "pages_fetched": pages_fetched,
             "has_more": has_more,
             "can_load_more": has_more,
             "max_available": min(100, pages_to_fetch * 20)  # Estimate
@@ -349,7 +377,10 @@ async def load_more_previews(session_id: str, api_key: str) -> Dict[str, Any]:
     Returns:
         Additional candidates with pagination info
     """
+    from preview_prefetch import preview_prefetcher
+
     print(f"\n🔄 Load More Request for session: {session_id}")
+    preview_prefetcher.touch(session_id)
 
     pagination = DomainSearchPagination(session_id)
     state = pagination.load_pagination_state()
@@ -370,15 +401,26 @@ async def load_more_previews(session_id: str, api_key: str) -> Dict[str, Any]:
             "candidates": []
         }
 
-    # Add rate limit protection
-    time.sleep(DomainSearchPagination.RATE_LIMIT_DELAY)
-
-    # Fetch next page
+    # Fetch next page (throttled by the shared CoreSignal rate limiter)
     result = pagination.fetch_next_page(api_key)
 
     if result.get("success"):
         print(f"   ✅ Loaded {len(result['candidates'])} more candidates")
         print(f"   📊 Total now: {result['total_fetched']} candidates")
+
+        # Warm the next page so the following "Load More" is served from memory
+        if result.get("has_more"):
+            preview_prefetcher.schedule(
+                session_id,
+                f"https://api.coresignal.com/cdapi/v2/{state['endpoint']}/search/es_dsl/preview",
+                state["query"],
+                {
+                    "accept": "application/json",
+                    "apikey": api_key,
+                    "Content-Type": "application/json"
+                },
+                result["page_fetched"] + 1
+            )
     else:
         print(f"   ❌ Failed: {result.get('error')}")
 
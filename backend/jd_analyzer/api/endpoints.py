@@ -5,7 +5,7 @@ Flask routes for integrating JD analysis into the application.
 Add these to your main app.py file.
 """
 
-from flask import request, jsonify
+from flask import request, jsonify, Response, stream_with_context
 from jd_analyzer.core.jd_parser import JDParser
 from jd_analyzer.core.weight_generator import WeightGenerator
 from jd_analyzer.core.shortlist_analyzer import ShortlistAnalyzer
@@ -17,8 +17,6 @@ from pydantic import ValidationError
 import os
 import tempfile
 import requests
-import csv
-from io import StringIO
 import logging
 import sys
 import time
@@ -85,16 +83,19 @@ def make_coresignal_request_with_retry(url, payload, headers, max_retries=2, tim
     Returns:
         tuple: (success: bool, response_json: dict/list, error_msg: str)
     """
+    from coresignal_pagination import cached_preview_post
+
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"CoreSignal API request (attempt {attempt + 1}/{max_retries + 1})")
             logger.debug(f"Request payload: {payload}")
 
-            response = requests.post(url, json=payload, headers=headers, timeout=timeout)
+            # Repeated /preview pages are served from the in-process cache
+            data, response = cached_preview_post(url, payload, headers, timeout)
 
-            if response.status_code == 200:
-                logger.info(f"CoreSignal API success (status 200)")
-                return (True, response.json(), None)
+            if data is not None:
+                logger.info(f"CoreSignal API success ({'cache' if response is None else 'status 200'})")
+                return (True, data, None)
 
             # Log error details
             error_body = response.text[:500] if response.text else "No response body"
@@ -472,7 +473,9 @@ def register_jd_analyzer_routes(app):
         Request:
             {
                 "jd_requirements": {...},  // from /api/jd/parse
-                "max_results": 100  // optional, default 100
+                "max_results": 100,  // optional, default 100
+                "id_only": false,  // optional - profiles carry only IDs + headline fields (no csv_data)
+                "format": "json"  // optional - "csv" streams the CSV download instead
             }
 
         Response:
@@ -484,12 +487,17 @@ def register_jd_analyzer_routes(app):
                 "total_found": 47,
                 "csv_data": "..."  // CSV string for download
             }
+
+            With "format": "csv" the response body is the CSV itself (chunked),
+            with the result count in the X-Total-Found header.
         """
         try:
             data = request.json
             jd_requirements = data.get('jd_requirements')
             raw_query = data.get('query')  # Accept pre-generated query
             max_results = data.get('max_results', 100)
+            id_only = bool(data.get('id_only', False))
+            stream_csv = data.get('format') == 'csv'
 
             if not jd_requirements and not raw_query:
                 return jsonify({
@@ -520,22 +528,12 @@ def register_jd_analyzer_routes(app):
                 "Content-Type": "application/json"
             }
 
-            profiles = []
             pages_to_fetch = min(5, (max_results // 20) + 1)  # Preview API limited to pages 1-5
 
             logger.info(f"Fetching {pages_to_fetch} pages to get ~{max_results} candidates...")
 
-            for page in range(1, pages_to_fetch + 1):
-                # Add delay between page requests to avoid rate limiting
-                # Each request takes ~10s, so 2s delay gives CoreSignal's rate limiter breathing room
-                if page > 1:
-                    time.sleep(2)  # 2s delay between pages to prevent burst rate limit violations
-
-                logger.info(f"Fetching page {page}/{pages_to_fetch}...")
-
+            def fetch_page(page):
                 # Use retry logic for CoreSignal API
-                # Note: The preview endpoint doesn't support POST with page param
-                # It uses GET with query in URL, so we need to adjust
                 success, result, error_msg = make_coresignal_request_with_retry(
                     f"{search_url}?page={page}",
                     query,
@@ -543,39 +541,63 @@ def register_jd_analyzer_routes(app):
                     max_retries=2,
                     timeout=30
                 )
-
                 if not success:
-                    logger.error(f"Failed to fetch page {page}: {error_msg}")
-                    return jsonify({
-                        "success": False,
-                        "error": error_msg
-                    }), 500
-
+                    return success, None, error_msg
                 # Preview endpoint returns list of full profile objects
-                if isinstance(result, list):
-                    profiles.extend(result)
-                else:
-                    profiles.extend(result.get("hits", []))
+                return True, result if isinstance(result, list) else result.get("hits", []), None
 
-                logger.info(f"Page {page} returned {len(result) if isinstance(result, list) else len(result.get('hits', []))} profiles (total: {len(profiles)})")
+            # Pages are requested concurrently under the shared CoreSignal rate limit
+            from coresignal_pagination import dedupe_profiles, fetch_pages_concurrently, to_light_profile
+            page_outcomes = fetch_pages_concurrently(fetch_page, list(range(1, pages_to_fetch + 1)))
 
-                # Stop if we've reached max results
-                if len(profiles) >= max_results:
-                    profiles = profiles[:max_results]
-                    logger.info(f"Reached target of {max_results} candidates, stopping pagination")
-                    break
+            profiles = []
+            for outcome in page_outcomes:
+                if not outcome["success"]:
+                    logger.error(f"Failed to fetch page {outcome['page']}: {outcome['error']}")
+                    return jsonify({
+                        "success": False,
+                        "error": outcome["error"]
+                    }), 500
 
-            # Generate CSV data
-            csv_data = generate_csv_from_profiles(profiles)
+                profiles.extend(outcome["results"])
+                logger.info(f"Page {outcome['page']} returned {len(outcome['results'])} profiles (total: {len(profiles)})")
+
+            # Drop employees repeated across pages
+            fetched_count = len(profiles)
+            profiles = dedupe_profiles(profiles)
+            if fetched_count > len(profiles):
+                logger.info(f"Removed {fetched_count - len(profiles)} duplicate profiles")
+
+            # Stop if we've reached max results
+            if len(profiles) > max_results:
+                profiles = profiles[:max_results]
+                logger.info(f"Trimmed to target of {max_results} candidates")
+
+            if id_only:
+                profiles = [to_light_profile(profile) for profile in profiles]
+
+            if stream_csv:
+                from csv_stream import csv_download_headers, iter_csv
+                headers = csv_download_headers(f"candidates_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+                headers['X-Total-Found'] = str(len(profiles))
+                return Response(
+                    stream_with_context(iter_csv(PROFILE_CSV_HEADER, iter_profile_csv_rows(profiles))),
+                    mimetype='text/csv',
+                    headers=headers
+                )
 
-            return jsonify({
+            response = {
                 "success": True,
                 "query": query,
                 "query_explanation": query_explanation,
                 "profiles": profiles,
-                "total_found": len(profiles),
-                "csv_data": csv_data
-            })
+                "total_found": len(profiles)
+            }
+            # ID-only responses carry just the light profiles
+            if not id_only:
+                response["csv_data"] = generate_csv_from_profiles(profiles)
+
+            return jsonify(response)
 
         except Exception as e:
             return jsonify({
@@ -1472,31 +1494,24 @@ def register_jd_analyzer_routes(app):
             }), 500
 
 
-def generate_csv_from_profiles(profiles):
+PROFILE_CSV_HEADER = [
+    "Full Name",
+    "Headline",
+    "LinkedIn URL",
+    "Location",
+    "Current Company",
+    "Current Title",
+    "Total Experience (Years)"
+]
+
+
+def iter_profile_csv_rows(profiles):
     """
-    Generate CSV data from CoreSignal profile results.
+    Yield one CSV row per CoreSignal profile (columns of PROFILE_CSV_HEADER).
 
     Args:
-        profiles: List of CoreSignal employee profiles
-
-    Returns:
-        CSV string with columns: Full Name, Headline, LinkedIn URL, Location, Current Company
+        profiles: Iterable of CoreSignal employee profiles
     """
-    output = StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow([
-        "Full Name",
-        "Headline",
-        "LinkedIn URL",
-        "Location",
-        "Current Company",
-        "Current Title",
-        "Total Experience (Years)"
-    ])
-
-    # Write data rows
     for profile in profiles:
         full_name = profile.get("full_name", "")
         headline = profile.get("generated_headline") or profile.get("headline") or ""
@@ -1507,7 +1522,7 @@ def generate_csv_from_profiles(profiles):
         current_company = profile.get("company_name", "")
         current_title = profile.get("current_title") or profile.get("active_experience_title", "")
 
-        writer.writerow([
+        yield [
             full_name,
             headline,
             linkedin_url,
@@ -1515,6 +1530,18 @@ def generate_csv_from_profiles(profiles):
             current_company,
             current_title,
             ""  # No experience data in preview endpoint
-        ])
+        ]
 
-    return output.getvalue()
+
+def generate_csv_from_profiles(profiles):
+    """
+    Generate CSV data from CoreSignal profile results.
+
+    Args:
+        profiles: List of CoreSignal employee profiles
+
+    Returns:
+        CSV string with columns: Full Name, Headline, LinkedIn URL, Location, Current Company
+    """
+    from csv_stream import csv_string
+    return csv_string(PROFILE_CSV_HEADER, iter_profile_csv_rows(profiles))
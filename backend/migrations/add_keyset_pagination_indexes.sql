@@ -0,0 +1,10 @@
+-- Keyset Pagination Indexes
+-- Back the newest-first (timestamp, id) cursors used by /load-assessments and
+-- /extension/profiles/<list_id>, so each page is an index range scan
+-- regardless of table size or how deep the caller has paged.
+
+CREATE INDEX IF NOT EXISTS idx_candidate_assessments_created_id
+    ON candidate_assessments(created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_extension_profiles_list_added_id
+    ON extension_profiles(list_id, added_at DESC, id DESC);
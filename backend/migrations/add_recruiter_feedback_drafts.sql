@@ -0,0 +1,47 @@
+-- Recruiter Feedback Drafts
+-- Auto-saved notes upsert one row per (candidate, recruiter, draft) instead of
+-- inserting a new row on every debounced save.
+--
+-- draft_id: client-generated ID for one note being edited (NULL for legacy rows,
+--           likes and dislikes - NULLs never conflict in the unique index)
+-- draft_revision: client-side counter; older revisions never overwrite newer ones,
+--                 so a late write from another worker can't roll a note back
+
+ALTER TABLE recruiter_feedback ADD COLUMN IF NOT EXISTS draft_id TEXT;
+ALTER TABLE recruiter_feedback ADD COLUMN IF NOT EXISTS draft_revision INTEGER;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_recruiter_feedback_draft
+    ON recruiter_feedback(candidate_linkedin_url, recruiter_name, draft_id);
+
+-- Drafts keep their created_at while edited, so readers (/get-feedback and the
+-- bulk summaries) order by updated_at - the time of the last write
+CREATE INDEX IF NOT EXISTS idx_recruiter_feedback_url_updated
+    ON recruiter_feedback(candidate_linkedin_url, updated_at DESC);
+
+CREATE OR REPLACE FUNCTION save_feedback_draft(
+    p_linkedin_url TEXT,
+    p_recruiter_name TEXT,
+    p_draft_id TEXT,
+    p_feedback_text TEXT,
+    p_revision INTEGER
+)
+RETURNS SETOF recruiter_feedback
+LANGUAGE SQL
+AS $$
+    INSERT INTO recruiter_feedback (
+        candidate_linkedin_url, feedback_type, feedback_text, recruiter_name, draft_id, draft_revision
+    )
+    VALUES (p_linkedin_url, 'note', p_feedback_text, p_recruiter_name, p_draft_id, p_revision)
+    ON CONFLICT (candidate_linkedin_url, recruiter_name, draft_id)
+    DO UPDATE SET
+        feedback_text = EXCLUDED.feedback_text,
+        draft_revision = EXCLUDED.draft_revision,
+        updated_at = NOW()
+    WHERE recruiter_feedback.draft_revision IS NULL
+       OR recruiter_feedback.draft_revision < EXCLUDED.draft_revision
+    RETURNING *;
+$$;
+
+COMMENT ON COLUMN recruiter_feedback.draft_id IS 'Client ID of the note being edited - auto-saves upsert this row';
+COMMENT ON COLUMN recruiter_feedback.draft_revision IS 'Latest client revision written for this draft';
+COMMENT ON FUNCTION save_feedback_draft(TEXT, TEXT, TEXT, TEXT, INTEGER) IS 'Upsert an auto-saved note draft, ignoring out-of-order revisions';
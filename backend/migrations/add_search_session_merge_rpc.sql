@@ -0,0 +1,63 @@
+-- Search Session Merge RPC
+-- Saves merge fetched pages and returned profile IDs in one statement, so two
+-- "Load More" calls served by different gunicorn workers can't overwrite each
+-- other's pages and IDs (the old client-side read-merge-upsert could).
+--
+-- Pages and IDs are only ever added; query/endpoint are replaced when given,
+-- last_page only moves forward and total_fetched is incremented. An expired
+-- session is replaced rather than merged into.
+
+CREATE OR REPLACE FUNCTION save_search_session(
+    p_session_id TEXT,
+    p_query JSONB,
+    p_endpoint TEXT,
+    p_fetched_pages JSONB,
+    p_returned_ids JSONB,
+    p_last_page INTEGER,
+    p_added_fetched INTEGER,
+    p_ttl_hours INTEGER
+)
+RETURNS SETOF search_sessions
+LANGUAGE SQL
+AS $$
+    DELETE FROM search_sessions
+    WHERE session_id = p_session_id AND expires_at <= NOW();
+
+    INSERT INTO search_sessions AS s (
+        session_id, query, endpoint, fetched_pages, last_page, total_fetched, returned_ids,
+        updated_at, expires_at
+    )
+    VALUES (
+        p_session_id,
+        p_query,
+        p_endpoint,
+        (SELECT COALESCE(jsonb_agg(DISTINCT page ORDER BY page), '[]'::jsonb)
+         FROM jsonb_array_elements(p_fetched_pages) AS page),
+        COALESCE(p_last_page, 0),
+        p_added_fetched,
+        p_returned_ids,
+        NOW(),
+        NOW() + make_interval(hours => p_ttl_hours)
+    )
+    ON CONFLICT (session_id) DO UPDATE SET
+        query = COALESCE(EXCLUDED.query, s.query),
+        endpoint = COALESCE(EXCLUDED.endpoint, s.endpoint),
+        fetched_pages = (
+            SELECT COALESCE(jsonb_agg(DISTINCT page ORDER BY page), '[]'::jsonb)
+            FROM jsonb_array_elements(s.fetched_pages || EXCLUDED.fetched_pages) AS page
+        ),
+        last_page = GREATEST(s.last_page, EXCLUDED.last_page),
+        total_fetched = s.total_fetched + EXCLUDED.total_fetched,
+        -- New IDs are appended in the order given, skipping ones already stored
+        returned_ids = s.returned_ids || COALESCE((
+            SELECT jsonb_agg(new_ids.id ORDER BY new_ids.position)
+            FROM jsonb_array_elements(EXCLUDED.returned_ids) WITH ORDINALITY AS new_ids(id, position)
+            WHERE NOT s.returned_ids @> jsonb_build_array(new_ids.id)
+        ), '[]'::jsonb),
+        updated_at = NOW(),
+        expires_at = EXCLUDED.expires_at
+    RETURNING *;
+$$;
+
+COMMENT ON FUNCTION save_search_session(TEXT, JSONB, TEXT, JSONB, JSONB, INTEGER, INTEGER, INTEGER)
+    IS 'Create or update a search session, merging pages and returned IDs atomically';
@@ -0,0 +1,29 @@
+-- Unique (jd_id, company_name) on target_companies
+-- Lets _save_companies bulk-upsert evaluated companies so re-running
+-- /evaluate-more-companies updates rows instead of inserting duplicates.
+
+-- Remove existing duplicates, keeping the most recently created row per (jd_id, company_name)
+DELETE FROM target_companies a
+USING target_companies b
+WHERE a.jd_id = b.jd_id
+  AND a.company_name = b.company_name
+  AND (a.created_at < b.created_at OR (a.created_at = b.created_at AND a.id < b.id));
+
+ALTER TABLE target_companies
+    ADD CONSTRAINT target_companies_jd_company_name_unique UNIQUE (jd_id, company_name);
+
+-- target_companies_jd_company_unique (jd_id, company_id) stays as the guard
+-- against saving one CoreSignal company twice under different names;
+-- _save_companies skips company_ids already stored for the JD so a chunk
+-- never trips it. Restore it where an earlier revision of this migration dropped it.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'target_companies_jd_company_unique'
+    ) THEN
+        ALTER TABLE target_companies
+            ADD CONSTRAINT target_companies_jd_company_unique UNIQUE (jd_id, company_id);
+    END IF;
+END $$;
+
+COMMENT ON CONSTRAINT target_companies_jd_company_name_unique ON target_companies IS 'Conflict target for bulk upserts from CompanyResearchService._save_companies';
@@ -0,0 +1,28 @@
+-- Company ID Resolution Cache Table
+-- Persists company name → CoreSignal company_id resolutions so /search-by-company-list
+-- doesn't re-run the CoreSignal company search for names resolved before.
+-- TTL: 30 days for resolved names, 3 days for "no match" (company_id NULL)
+-- Seeded at runtime from stored_companies (exact CoreSignal names, confidence 1.0)
+
+CREATE TABLE IF NOT EXISTS company_id_resolutions (
+    normalized_name TEXT PRIMARY KEY,  -- normalize_company_name(): lowercase, no punctuation/legal suffix
+    input_name TEXT NOT NULL,
+    company_id BIGINT,  -- NULL = CoreSignal search returned nothing
+    coresignal_name TEXT,
+    website TEXT,
+    employee_count INTEGER,
+    confidence REAL NOT NULL DEFAULT 0,
+    source TEXT NOT NULL DEFAULT 'search',  -- 'search' or 'stored_companies'
+    resolved_at TIMESTAMPTZ DEFAULT NOW(),
+    expires_at TIMESTAMPTZ DEFAULT (NOW() + INTERVAL '30 days')
+);
+
+-- Index for cleanup queries (find expired entries)
+CREATE INDEX IF NOT EXISTS idx_company_id_resolutions_expiry ON company_id_resolutions(expires_at);
+
+-- Comments for documentation
+COMMENT ON TABLE company_id_resolutions IS 'Company name → CoreSignal company_id resolutions, consulted before the company search API';
+COMMENT ON COLUMN company_id_resolutions.normalized_name IS 'Normalised company name (lookup key shared by spellings like "Deepgram, Inc." / "deepgram")';
+COMMENT ON COLUMN company_id_resolutions.company_id IS 'Best CoreSignal candidate (NULL when the search found nothing)';
+COMMENT ON COLUMN company_id_resolutions.confidence IS 'Match confidence (0-1); callers apply their own threshold';
+COMMENT ON COLUMN company_id_resolutions.expires_at IS 'Expiration timestamp - entries older than this are re-resolved via the API';
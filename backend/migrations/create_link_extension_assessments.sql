@@ -0,0 +1,24 @@
+-- link_extension_assessments RPC
+-- Links many extension_profiles rows to their candidate_assessments in one statement.
+-- Used by /lists/<list_id>/assess instead of one PATCH per profile.
+--
+-- links: JSON array of {"profile_id": uuid, "assessment_id": integer, "assessment_score": float}
+-- Returns the number of profiles updated.
+
+CREATE OR REPLACE FUNCTION link_extension_assessments(links JSONB)
+RETURNS INTEGER
+LANGUAGE SQL
+AS $$
+    WITH updated AS (
+        UPDATE extension_profiles AS p
+        SET assessed = TRUE,
+            assessment_id = l.assessment_id,
+            assessment_score = l.assessment_score
+        FROM jsonb_to_recordset(links) AS l(profile_id UUID, assessment_id INTEGER, assessment_score FLOAT)
+        WHERE p.id = l.profile_id
+        RETURNING p.id
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$;
+
+COMMENT ON FUNCTION link_extension_assessments(JSONB) IS 'Bulk-link extension profiles to their assessments (assessed, assessment_id, assessment_score)';
@@ -0,0 +1,41 @@
+-- get_list_stats RPC
+-- Aggregates extension_profiles stats for one recruiter list inside Postgres,
+-- so /lists/<list_id>/stats no longer downloads every profile row of the list.
+-- Returns NULL when the list does not exist.
+--
+-- Score buckets (width_bucket over 60/70/80/90): '<60', '60-69', '70-79', '80-89', '90-100'.
+-- Like the original Python implementation, NULL and 0 scores count as "no score".
+
+CREATE INDEX IF NOT EXISTS idx_extension_profiles_list_id ON extension_profiles(list_id);
+
+CREATE OR REPLACE FUNCTION get_list_stats(list_uuid UUID)
+RETURNS JSONB
+LANGUAGE SQL
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'list_id', l.id,
+        'list_name', l.list_name,
+        'total_profiles', COUNT(p.id),
+        'assessed', COUNT(p.id) FILTER (WHERE p.assessed),
+        'pending_assessment', COUNT(p.id) FILTER (WHERE NOT COALESCE(p.assessed, FALSE)),
+        'exported', COUNT(p.id) FILTER (WHERE p.exported_to_recruiter),
+        'avg_score', ROUND(AVG(p.assessment_score) FILTER (WHERE p.assessment_score <> 0)::NUMERIC, 1),
+        'score_distribution', jsonb_build_object(
+            '90-100', COUNT(p.id) FILTER (WHERE p.assessment_score <> 0 AND p.assessment_score <= 100
+                                          AND width_bucket(p.assessment_score, ARRAY[60, 70, 80, 90]::FLOAT8[]) = 4),
+            '80-89', COUNT(p.id) FILTER (WHERE width_bucket(p.assessment_score, ARRAY[60, 70, 80, 90]::FLOAT8[]) = 3),
+            '70-79', COUNT(p.id) FILTER (WHERE width_bucket(p.assessment_score, ARRAY[60, 70, 80, 90]::FLOAT8[]) = 2),
+            '60-69', COUNT(p.id) FILTER (WHERE width_bucket(p.assessment_score, ARRAY[60, 70, 80, 90]::FLOAT8[]) = 1),
+            '<60', COUNT(p.id) FILTER (WHERE p.assessment_score <> 0
+                                       AND width_bucket(p.assessment_score, ARRAY[60, 70, 80, 90]::FLOAT8[]) = 0)
+        ),
+        'job_template_id', l.job_template_id
+    )
+    FROM recruiter_lists l
+    LEFT JOIN extension_profiles p ON p.list_id = l.id
+    WHERE l.id = list_uuid
+    GROUP BY l.id, l.list_name, l.job_template_id;
+$$;
+
+COMMENT ON FUNCTION get_list_stats(UUID) IS 'Profile counts, average score and score histogram for one recruiter list';
@@ -0,0 +1,27 @@
+-- Search Sessions Table
+-- Preview-search session state shared by all gunicorn workers and kept across restarts.
+-- Replaces the in-memory used_pages_tracker and logs/domain_search_sessions/*.json files.
+-- TTL: 24 hours since last use
+
+CREATE TABLE IF NOT EXISTS search_sessions (
+    session_id TEXT PRIMARY KEY,
+    query JSONB,  -- ES DSL query for this session
+    endpoint TEXT,  -- CoreSignal endpoint (employee_clean, employee_multi_source...)
+    fetched_pages JSONB NOT NULL DEFAULT '[]',  -- Preview pages already fetched (paid for)
+    last_page INTEGER NOT NULL DEFAULT 0,  -- Pagination cursor for "Load More"
+    total_fetched INTEGER NOT NULL DEFAULT 0,
+    returned_ids JSONB NOT NULL DEFAULT '[]',  -- Profile IDs already returned to the user
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    expires_at TIMESTAMPTZ DEFAULT (NOW() + INTERVAL '24 hours')
+);
+
+-- Index for cleanup queries (find expired entries)
+CREATE INDEX IF NOT EXISTS idx_search_sessions_expiry ON search_sessions(expires_at);
+
+-- Comments for documentation
+COMMENT ON TABLE search_sessions IS 'Preview-search sessions: query, fetched pages, cursor and returned profile IDs';
+COMMENT ON COLUMN search_sessions.session_id IS 'Client session ID, or a hash of the query for /search-profiles';
+COMMENT ON COLUMN search_sessions.fetched_pages IS 'Preview pages (1-5) already fetched for this session';
+COMMENT ON COLUMN search_sessions.returned_ids IS 'Profile IDs already returned, used to de-duplicate later pages';
+COMMENT ON COLUMN search_sessions.expires_at IS 'Expiration timestamp - refreshed on every save';
@@ -0,0 +1,22 @@
+-- Extend company_discovery_cache for the shared discovery cache
+-- Caches raw Tavily results and LLM extractions separately, keyed by
+-- normalised seed name (lowercase, punctuation and Inc/Ltd/LLC... removed),
+-- so a new JD mentioning a known seed starts discovery from warm data.
+-- Used by both batch_extract_companies_from_seeds and search_competitors_web.
+
+-- Raw Tavily results per query (trimmed to title/url/content)
+ALTER TABLE company_discovery_cache
+    ADD COLUMN IF NOT EXISTS search_results JSONB,
+    ADD COLUMN IF NOT EXISTS search_expires_at TIMESTAMPTZ;
+
+-- A row may hold only search results or only an extraction
+ALTER TABLE company_discovery_cache
+    ALTER COLUMN discovered_companies DROP NOT NULL,
+    ALTER COLUMN search_queries DROP NOT NULL,
+    ALTER COLUMN expires_at DROP DEFAULT;
+
+COMMENT ON COLUMN company_discovery_cache.seed_company IS 'Normalised seed company name (see company_name_matcher.normalize_company_name)';
+COMMENT ON COLUMN company_discovery_cache.discovered_companies IS 'LLM-extracted competitor company objects (NULL until extracted)';
+COMMENT ON COLUMN company_discovery_cache.expires_at IS 'Expiry of discovered_companies';
+COMMENT ON COLUMN company_discovery_cache.search_results IS 'Tavily results keyed by query: {query: {answer, results: [{title, url, content}]}}';
+COMMENT ON COLUMN company_discovery_cache.search_expires_at IS 'Expiry of search_results';
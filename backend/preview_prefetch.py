@@ -0,0 +1,129 @@
+"""
+Preview Prefetch
+Speculatively fetches the next /preview page of a "Load More" session in the
+background, so the user's next click is served from preview_search_cache.
+
+Prefetches only spend spare rate-limit budget (they never wait in line with
+foreground requests) and are abandoned once their session goes idle. The
+cache is per process, so a click served by another gunicorn worker simply
+falls back to a normal fetch.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from coresignal_pagination import PREVIEW_MAX_PAGES, request_preview_page
+from coresignal_rate_limit import coresignal_rate_limiter
+from search_result_cache import preview_cache_key, preview_search_cache
+
+
+class PreviewPrefetcher:
+    """Background prefetcher for the next preview page of active sessions."""
+
+    # A session with no "Load More" activity for this long is idle
+    IDLE_SECONDS = 120
+    # How long a prefetch waits for spare budget before giving up
+    BUDGET_WAIT_SECONDS = 10
+    # Tokens always left for foreground requests
+    RESERVED_TOKENS = 4
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preview-prefetch")
+        self._lock = threading.Lock()
+        self._last_seen: Dict[str, float] = {}
+        self._inflight = set()
+
+    def touch(self, session_id: str) -> None:
+        """Record user activity on a session (keeps its prefetches alive)."""
+        with self._lock:
+            self._last_seen[session_id] = time.monotonic()
+            self._prune()
+
+    def schedule(
+        self,
+        session_id: str,
+        url: str,
+        query: Dict[str, Any],
+        headers: Dict[str, str],
+        page: int
+    ) -> bool:
+        """
+        Prefetch a page into preview_search_cache in the background.
+
+        Args:
+            session_id: Session the page belongs to
+            url: /preview URL without the page parameter
+            query: ES DSL query
+            headers: CoreSignal request headers
+            page: Page number to prefetch
+
+        Returns:
+            True if a prefetch was scheduled (False if out of range, cached or in flight)
+        """
+        if page > PREVIEW_MAX_PAGES:
+            return False
+
+        cache_key = preview_cache_key(f"{url}?page={page}", query)
+        if not cache_key or preview_search_cache.get(cache_key) is not None:
+            return False
+
+        with self._lock:
+            if cache_key in self._inflight:
+                return False
+            self._inflight.add(cache_key)
+            self._last_seen.setdefault(session_id, time.monotonic())
+
+        self._executor.submit(self._prefetch, session_id, cache_key, url, query, headers, page)
+        return True
+
+    def _prefetch(
+        self,
+        session_id: str,
+        cache_key: str,
+        url: str,
+        query: Dict[str, Any],
+        headers: Dict[str, str],
+        page: int
+    ) -> None:
+        try:
+            deadline = time.monotonic() + self.BUDGET_WAIT_SECONDS
+            while True:
+                if self._is_idle(session_id) or time.monotonic() > deadline:
+                    print(f"   ⏭️  Prefetch of page {page} abandoned for session {session_id}")
+                    return
+                if coresignal_rate_limiter.try_acquire(reserve=self.RESERVED_TOKENS):
+                    break
+                time.sleep(0.25)
+
+            # Token already taken above (leaving the foreground reserve);
+            # request_preview_page stores successful pages in preview_search_cache
+            success, results, error_msg = request_preview_page(
+                url, query, headers, page, max_retries=0, timeout=30, acquire_token=None
+            )
+            if success:
+                print(f"   📥 Prefetched page {page} ({len(results)} results) for session {session_id}")
+            else:
+                print(f"   ⚠️  Prefetch of page {page} failed: {error_msg}")
+        except Exception as e:
+            print(f"   ⚠️  Prefetch error for session {session_id}: {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(cache_key)
+
+    def _is_idle(self, session_id: str) -> bool:
+        with self._lock:
+            last_seen = self._last_seen.get(session_id)
+        return last_seen is None or time.monotonic() - last_seen > self.IDLE_SECONDS
+
+    def _prune(self) -> None:
+        """Forget sessions idle for a long time (lock held)."""
+        cutoff = time.monotonic() - self.IDLE_SECONDS * 10
+        for session_id, last_seen in list(self._last_seen.items()):
+            if last_seen < cutoff:
+                del self._last_seen[session_id]
+
+
+# Process-wide prefetcher used by the "Load More" helpers
+preview_prefetcher = PreviewPrefetcher()
@@ -0,0 +1,311 @@
+"""
+Research Progress
+Coalesced, throttled status writes and in-process progress pub/sub
+for company research sessions.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+FINAL_STATUSES = ("completed", "failed")
+
+
+class ResearchProgressBus:
+    """
+    In-process pub/sub for company research session progress.
+
+    SessionStatusWriter publishes a session snapshot on every status update and
+    the SSE endpoint subscribes to it instead of polling Supabase. Only runs
+    started in this process are tracked; runs owned by another gunicorn worker
+    still need the Supabase polling fallback.
+    """
+
+    # How long a finished run's final snapshot stays available to late subscribers
+    FINISHED_RETENTION_SECONDS = 300
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._active = set()
+        self._finished_at: Dict[str, float] = {}
+
+    def begin(self, jd_id: str) -> None:
+        """Mark a run as owned by this process (call before scheduling it)."""
+        with self._lock:
+            self._active.add(jd_id)
+            self._finished_at.pop(jd_id, None)
+            self._latest.pop(jd_id, None)
+
+    def is_tracking(self, jd_id: str) -> bool:
+        """True if this process is running (or just finished) the given session."""
+        with self._lock:
+            self._prune()
+            return jd_id in self._active or jd_id in self._finished_at
+
+    def publish(self, jd_id: str, session: Dict[str, Any]) -> None:
+        """Publish a session snapshot to all subscribers of this session."""
+        with self._lock:
+            self._latest[jd_id] = session
+            if session.get("status") in FINAL_STATUSES:
+                self._active.discard(jd_id)
+                self._finished_at[jd_id] = time.monotonic()
+            else:
+                self._active.add(jd_id)
+            subscribers = list(self._subscribers.get(jd_id, []))
+
+        for subscriber in subscribers:
+            subscriber.put(session)
+
+    def subscribe(self, jd_id: str) -> queue.Queue:
+        """
+        Subscribe to a session's snapshots.
+
+        The returned queue is pre-loaded with the latest snapshot, if any.
+        """
+        subscriber = queue.Queue()
+        with self._lock:
+            self._subscribers.setdefault(jd_id, []).append(subscriber)
+            latest = self._latest.get(jd_id)
+
+        if latest is not None:
+            subscriber.put(latest)
+        return subscriber
+
+    def unsubscribe(self, jd_id: str, subscriber: queue.Queue) -> None:
+        """Stop delivering snapshots to a subscriber."""
+        with self._lock:
+            subscribers = self._subscribers.get(jd_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._subscribers.pop(jd_id, None)
+
+    def _prune(self) -> None:
+        """Drop final snapshots older than the retention window (lock held)."""
+        cutoff = time.monotonic() - self.FINISHED_RETENTION_SECONDS
+        for jd_id, finished_at in list(self._finished_at.items()):
+            if finished_at < cutoff:
+                self._finished_at.pop(jd_id, None)
+                self._latest.pop(jd_id, None)
+
+
+# Process-wide bus shared by the research service and the SSE endpoint
+progress_bus = ResearchProgressBus()
+
+
+class SessionStatusWriter:
+    """
+    Accumulates company_research_sessions progress in memory and flushes it to
+    Supabase at most once per interval, or immediately on a status/phase change.
+
+    search_config is patched key-by-key on a locally cached copy, so progress
+    keys (current_action, current_company...) never clobber stored keys such as
+    screened_companies or jd_context.
+
+    Every update (not just flushed ones) is also published to the progress bus
+    as a full session snapshot, so streaming clients keep per-step fidelity.
+    """
+
+    # Metadata keys stored in their own columns (metadata key -> column)
+    COLUMN_KEYS = {
+        "total_discovered": "total_discovered",
+        "total_evaluated": "total_evaluated",
+        "total_selected": "total_selected",
+        "error": "error_message"
+    }
+
+    # Attempts (1s apart) at writing a final status before it is given up
+    FINAL_FLUSH_ATTEMPTS = 3
+
+    # Metadata keys renamed inside search_config; all other keys keep their name
+    CONFIG_KEY_RENAMES = {
+        "phase": "current_phase",
+        "action": "current_action"
+    }
+
+    def __init__(
+        self,
+        get_supabase: Callable[[], Awaitable[Any]],
+        flush_interval_ms: int = 1000,
+        bus: Optional[ResearchProgressBus] = None
+    ):
+        """
+        Args:
+            get_supabase: Coroutine function returning the async Supabase client
+            flush_interval_ms: Minimum time between writes for one session
+            bus: Progress bus to publish snapshots to (defaults to progress_bus)
+        """
+        self._get_supabase = get_supabase
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.bus = bus or progress_bus
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+
+    def start(self, jd_id: str, session: Dict[str, Any]) -> None:
+        """
+        Reset state for a session and seed it from the stored session row.
+
+        The row's search_config becomes the cached copy that patches merge into.
+        """
+        self._discard(jd_id)
+        state = self._session_state(jd_id)
+        state["row"] = {key: value for key, value in session.items() if key != "search_config"}
+        state["search_config"] = dict(session.get("search_config") or {})
+
+    async def update(
+        self,
+        jd_id: str,
+        status: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Record a status update, writing it now or coalescing it into the next flush.
+
+        Writes immediately on the first update, a status change, a phase change
+        or a final status; otherwise at most once per flush interval.
+        """
+        state = self._session_state(jd_id)
+        metadata = metadata or {}
+
+        for key, value in metadata.items():
+            if key in self.COLUMN_KEYS:
+                state["columns"][self.COLUMN_KEYS[key]] = value
+            else:
+                state["config_patch"][self.CONFIG_KEY_RENAMES.get(key, key)] = value
+
+        status_changed = status != state["status"]
+        phase_changed = "phase" in metadata and metadata["phase"] != state["phase"]
+
+        state["status"] = status
+        state["columns"]["status"] = status
+        if "phase" in metadata:
+            state["phase"] = metadata["phase"]
+        if status == "completed":
+            state["columns"]["completed_at"] = datetime.now().isoformat()
+
+        self._publish(jd_id, state)
+
+        if status in FINAL_STATUSES:
+            try:
+                # A lost final status would leave the session "running" forever
+                for attempt in range(self.FINAL_FLUSH_ATTEMPTS):
+                    try:
+                        await self._flush(jd_id)
+                        break
+                    except Exception as e:
+                        if attempt + 1 == self.FINAL_FLUSH_ATTEMPTS:
+                            raise
+                        print(f"⚠️  Final status write for {jd_id} failed ({e}) - retrying")
+                        await asyncio.sleep(1)
+            finally:
+                self._discard(jd_id)
+            return
+
+        since_last_flush = time.monotonic() - state["last_flush"]
+        if status_changed or phase_changed or since_last_flush >= self.flush_interval:
+            await self._flush(jd_id)
+        elif state["flush_task"] is None:
+            state["flush_task"] = asyncio.create_task(
+                self._delayed_flush(jd_id, state, self.flush_interval - since_last_flush)
+            )
+
+    async def flush(self, jd_id: str) -> None:
+        """Write any pending progress for a session now."""
+        await self._flush(jd_id)
+
+    # ========================================
+    # Internals
+    # ========================================
+
+    def _session_state(self, jd_id: str) -> Dict[str, Any]:
+        state = self._sessions.get(jd_id)
+        if state is None:
+            state = {
+                "columns": {},          # Pending column updates
+                "config_patch": {},     # Pending search_config keys
+                "search_config": None,  # Cached full search_config (None = not loaded)
+                "status": None,
+                "phase": None,
+                "last_flush": 0.0,
+                "flush_task": None,
+                "lock": asyncio.Lock(),
+                "row": {"jd_id": jd_id}  # Latest known column values (for snapshots)
+            }
+            self._sessions[jd_id] = state
+        return state
+
+    def _publish(self, jd_id: str, state: Dict[str, Any]) -> None:
+        """Publish the current session view (stored + pending values) to the bus."""
+        state["row"].update(state["columns"])
+        snapshot = dict(state["row"])
+        snapshot["search_config"] = {**(state["search_config"] or {}), **state["config_patch"]}
+        self.bus.publish(jd_id, snapshot)
+
+    def _discard(self, jd_id: str) -> None:
+        state = self._sessions.pop(jd_id, None)
+        if state and state["flush_task"] is not None:
+            state["flush_task"].cancel()
+
+    async def _delayed_flush(self, jd_id: str, state: Dict[str, Any], delay: float) -> None:
+        try:
+            await asyncio.sleep(max(delay, 0))
+            # Session may have finished (and been discarded) while we slept
+            if self._sessions.get(jd_id) is state:
+                state["flush_task"] = None
+                await self._flush(jd_id)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Delayed status flush failed for {jd_id}: {e}")
+
+    async def _flush(self, jd_id: str) -> None:
+        state = self._sessions.get(jd_id)
+        if state is None:
+            return
+
+        async with state["lock"]:
+            if not state["columns"] and not state["config_patch"]:
+                return
+
+            supabase = await self._get_supabase()
+
+            columns = state["columns"]
+            config_patch = state["config_patch"]
+            state["columns"] = {}
+            state["config_patch"] = {}
+            state["last_flush"] = time.monotonic()
+
+            try:
+                update_data = dict(columns)
+                if config_patch:
+                    if state["search_config"] is None:
+                        state["search_config"] = await self._load_search_config(supabase, jd_id)
+                    update_data["search_config"] = {**state["search_config"], **config_patch}
+
+                await supabase.table("company_research_sessions").update(update_data).eq(
+                    "jd_id", jd_id
+                ).execute()
+            except Exception:
+                # Put the unwritten values back under anything queued since,
+                # so the next flush retries them
+                state["columns"] = {**columns, **state["columns"]}
+                state["config_patch"] = {**config_patch, **state["config_patch"]}
+                raise
+
+            if config_patch:
+                state["search_config"].update(config_patch)
+
+    async def _load_search_config(self, supabase: Any, jd_id: str) -> Dict[str, Any]:
+        """Load the stored search_config so patches merge into it."""
+        result = await supabase.table("company_research_sessions").select("search_config").eq(
+            "jd_id", jd_id
+        ).execute()
+
+        if result.data:
+            return dict(result.data[0].get("search_config") or {})
+        return {}
@@ -0,0 +1,112 @@
+"""
+Search Result Cache
+In-process cache of CoreSignal /preview search pages.
+
+The same ES DSL query is often re-sent within minutes (LLM query comparison,
+candidate search, "Load More", UI refreshes). Pages are keyed by endpoint,
+page number and a canonical hash of the query, so a repeated page is served
+from memory instead of a slow, rate-limited API call.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class SearchResultCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+
+    Values are deep-copied in and out so callers can't mutate cached pages.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        """
+        Args:
+            ttl_seconds: How long a page stays valid
+            max_entries: Pages kept before the least recently used is evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries over the bound."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Drop one entry (no-op if missing)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def canonical_query_hash(query: Dict[str, Any]) -> str:
+    """
+    Stable hash of an ES DSL query: keys sorted, top-level `size` removed.
+
+    `size` is dropped because /preview pages are a fixed size regardless.
+    """
+    if isinstance(query, dict):
+        query = {key: value for key, value in query.items() if key != "size"}
+    canonical = json.dumps(query, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def preview_cache_key(url: str, query: Dict[str, Any]) -> Optional[str]:
+    """
+    Cache key for a /preview request (endpoint + page + query hash).
+
+    Returns:
+        Key string, or None if the URL is not a /preview search
+    """
+    parsed = urlparse(url)
+    if not parsed.path.endswith("/es_dsl/preview"):
+        return None
+
+    page = parse_qs(parsed.query).get("page", ["1"])[0]
+    return f"{parsed.netloc}{parsed.path}|page={page}|{canonical_query_hash(query)}"
+
+
+# Shared by every preview-search call site in this process
+PREVIEW_CACHE_TTL_SECONDS = float(os.getenv("PREVIEW_CACHE_TTL_SECONDS", "600"))
+PREVIEW_CACHE_MAX_ENTRIES = int(os.getenv("PREVIEW_CACHE_MAX_ENTRIES", "128"))
+
+preview_search_cache = SearchResultCache(PREVIEW_CACHE_TTL_SECONDS, PREVIEW_CACHE_MAX_ENTRIES)
@@ -0,0 +1,256 @@
+"""
+Search Session Store
+Persistent preview-search session state (Supabase table search_sessions)
+shared by every gunicorn worker and kept across restarts.
+
+A session holds the ES DSL query and endpoint, the preview pages already
+fetched (we've paid for those), the pagination cursor and the profile IDs
+already returned to the user. Reads go through a short-lived local cache;
+writes go straight to Supabase, where pages and IDs are merged atomically.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+
+class SearchSessionStore:
+    """
+    Read/write search sessions via PostgREST with a per-process cache.
+
+    Falls back to process-local memory (with a warning) when Supabase is not
+    configured, so local development keeps working.
+    """
+
+    TABLE = "search_sessions"
+
+    # Sessions are abandoned after a day without use
+    SESSION_TTL_HOURS = 24
+    # Local copies are re-read after this long, so other workers' pages show up
+    LOCAL_CACHE_SECONDS = 5.0
+
+    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None):
+        self.supabase_url = supabase_url or os.getenv("SUPABASE_URL")
+        self.supabase_key = supabase_key or os.getenv("SUPABASE_KEY")
+        self.enabled = bool(self.supabase_url and self.supabase_key)
+        self.headers = {
+            'apikey': self.supabase_key,
+            'Authorization': f'Bearer {self.supabase_key}',
+            'Content-Type': 'application/json'
+        }
+        self._lock = threading.Lock()
+        self._local: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Dict[str, float] = {}
+
+        if not self.enabled:
+            print("⚠️ SUPABASE_URL/SUPABASE_KEY not set - search sessions are process-local")
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a session (None if missing or expired).
+
+        Returns:
+            Dict with session_id, query, endpoint, fetched_pages, last_page,
+            total_fetched, returned_ids, updated_at
+        """
+        with self._lock:
+            session = self._local.get(session_id)
+            fresh = time.monotonic() - self._loaded_at.get(session_id, 0) < self.LOCAL_CACHE_SECONDS
+            if session is not None and (fresh or not self.enabled):
+                return _copy_session(session)
+
+        if not self.enabled:
+            return None
+
+        try:
+            response = requests.get(
+                f"{self.supabase_url}/rest/v1/{self.TABLE}",
+                headers=self.headers,
+                params={
+                    'session_id': f'eq.{session_id}',
+                    'expires_at': f'gt.{datetime.now(timezone.utc).isoformat()}'
+                },
+                timeout=10
+            )
+            if not response.ok:
+                print(f"⚠️ Failed to load search session {session_id}: {response.status_code}")
+                return None
+
+            rows = response.json()
+        except Exception as e:
+            print(f"⚠️ Error loading search session {session_id}: {e}")
+            return None
+
+        session = _session_from_row(rows[0]) if rows else None
+        with self._lock:
+            if session is None:
+                self._local.pop(session_id, None)
+                self._loaded_at.pop(session_id, None)
+            else:
+                self._remember(session)
+        return _copy_session(session) if session else None
+
+    def save(
+        self,
+        session_id: str,
+        query: Optional[Dict[str, Any]] = None,
+        endpoint: Optional[str] = None,
+        fetched_pages: Iterable[int] = (),
+        returned_ids: Iterable[Any] = (),
+        last_page: Optional[int] = None,
+        added_fetched: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Create or update a session, merging pages and returned IDs into what is stored.
+
+        Pages and IDs are only ever added; query/endpoint are replaced when
+        given, last_page only moves forward and total_fetched grows by
+        added_fetched. With Supabase the merge happens in one statement
+        (save_search_session RPC), so concurrent saves from other workers
+        are never overwritten.
+
+        Returns:
+            The merged session
+        """
+        new_ids = list(dict.fromkeys(str(profile_id) for profile_id in returned_ids if profile_id is not None))
+        new_pages = sorted(set(fetched_pages))
+
+        if self.enabled:
+            session = self._save_remote(session_id, query, endpoint, new_pages, new_ids, last_page, added_fetched)
+            if session is not None:
+                with self._lock:
+                    self._remember(session)
+                return _copy_session(session)
+
+        # Process-local sessions (or Supabase unavailable): merge into the local copy
+        with self._lock:
+            stored = self._local.get(session_id)
+            session = _copy_session(stored) if stored else {
+                "session_id": session_id,
+                "query": None,
+                "endpoint": None,
+                "fetched_pages": [],
+                "last_page": 0,
+                "total_fetched": 0,
+                "returned_ids": []
+            }
+
+            if query is not None:
+                session["query"] = query
+            if endpoint is not None:
+                session["endpoint"] = endpoint
+            session["fetched_pages"] = sorted(set(session["fetched_pages"]) | set(new_pages))
+
+            known_ids = set(map(str, session["returned_ids"]))
+            session["returned_ids"].extend(profile_id for profile_id in new_ids if profile_id not in known_ids)
+
+            if last_page is not None:
+                session["last_page"] = max(session["last_page"], last_page)
+            session["total_fetched"] += added_fetched
+            session["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+            self._remember(session)
+            return _copy_session(session)
+
+    def reset_pages(self, session_id: str) -> None:
+        """Forget which pages a session has used (e.g. once all of them have been)."""
+        with self._lock:
+            session = self._local.get(session_id)
+            if session is not None:
+                session["fetched_pages"] = []
+
+        if not self.enabled:
+            return
+
+        try:
+            # Only fetched_pages is written, so concurrent ID merges are kept
+            response = requests.patch(
+                f"{self.supabase_url}/rest/v1/{self.TABLE}",
+                headers={**self.headers, 'Prefer': 'return=minimal'},
+                params={'session_id': f'eq.{session_id}'},
+                json={
+                    'fetched_pages': [],
+                    'updated_at': datetime.now(timezone.utc).isoformat()
+                },
+                timeout=10
+            )
+            if not response.ok:
+                print(f"⚠️ Failed to reset pages for search session {session_id}: {response.status_code}")
+        except Exception as e:
+            print(f"⚠️ Error resetting pages for search session {session_id}: {e}")
+
+    # ========================================
+    # Internals
+    # ========================================
+
+    def _remember(self, session: Dict[str, Any]) -> None:
+        """Cache a session locally (lock held)."""
+        self._local[session["session_id"]] = _copy_session(session)
+        self._loaded_at[session["session_id"]] = time.monotonic()
+
+    def _save_remote(
+        self,
+        session_id: str,
+        query: Optional[Dict[str, Any]],
+        endpoint: Optional[str],
+        fetched_pages: List[int],
+        returned_ids: List[str],
+        last_page: Optional[int],
+        added_fetched: int
+    ) -> Optional[Dict[str, Any]]:
+        """Merge a save into the stored row (save_search_session RPC); None on failure."""
+        try:
+            response = requests.post(
+                f"{self.supabase_url}/rest/v1/rpc/save_search_session",
+                headers=self.headers,
+                json={
+                    'p_session_id': session_id,
+                    'p_query': query,
+                    'p_endpoint': endpoint,
+                    'p_fetched_pages': fetched_pages,
+                    'p_returned_ids': returned_ids,
+                    'p_last_page': last_page,
+                    'p_added_fetched': added_fetched,
+                    'p_ttl_hours': self.SESSION_TTL_HOURS
+                },
+                timeout=10
+            )
+            if not response.ok:
+                print(f"⚠️ Failed to save search session {session_id}: "
+                      f"{response.status_code} {response.text[:200]}")
+                return None
+
+            rows = response.json()
+        except Exception as e:
+            print(f"⚠️ Error saving search session {session_id}: {e}")
+            return None
+
+        return _session_from_row(rows[0]) if rows else None
+
+
+def _session_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "session_id": row["session_id"],
+        "query": row.get("query"),
+        "endpoint": row.get("endpoint"),
+        "fetched_pages": list(row.get("fetched_pages") or []),
+        "last_page": row.get("last_page") or 0,
+        "total_fetched": row.get("total_fetched") or 0,
+        "returned_ids": list(row.get("returned_ids") or []),
+        "updated_at": row.get("updated_at")
+    }
+
+
+def _copy_session(session: Dict[str, Any]) -> Dict[str, Any]:
+    copied = dict(session)
+    copied["fetched_pages"] = list(session["fetched_pages"])
+    copied["returned_ids"] = list(session["returned_ids"])
+    return copied
+
+
+# Process-wide store shared by /search-profiles and the "Load More" helpers
+search_session_store = SearchSessionStore()
@@ -0,0 +1,82 @@
+"""
+Supabase Keyset Pagination
+Cursor helpers for paging PostgREST tables newest-first on (timestamp, id).
+
+Keyset paging filters on the last row already returned instead of using an
+OFFSET, so every page costs the same index range scan however deep the
+caller has paged. Cursors are opaque URL-safe strings.
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def encode_cursor(row: Dict[str, Any], time_column: str, id_column: str = 'id') -> str:
+    """Cursor pointing just past `row` in (time_column desc, id desc) order."""
+    payload = json.dumps([row.get(time_column), row.get(id_column)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[Any, Any]]:
+    """(timestamp, id) from a cursor, or None if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return timestamp, row_id
+    except Exception:
+        return None
+
+
+def keyset_params(
+    time_column: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    id_column: str = 'id'
+) -> Dict[str, str]:
+    """
+    PostgREST params for one newest-first page.
+
+    One extra row is requested so the caller can tell whether another page
+    exists (see split_page).
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    params = {
+        'order': f'{time_column}.desc,{id_column}.desc',
+        'limit': str(limit + 1)
+    }
+
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            raise ValueError('Invalid cursor')
+
+        timestamp, row_id = position
+        # Values are quoted: timestamps contain reserved characters (':', '.', '+')
+        params['or'] = (
+            f'({time_column}.lt."{timestamp}",'
+            f'and({time_column}.eq."{timestamp}",{id_column}.lt."{row_id}"))'
+        )
+
+    return params
+
+
+def split_page(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    time_column: str,
+    id_column: str = 'id'
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim the extra row fetched by keyset_params.
+
+    Returns:
+        (rows for this page, cursor for the next page or None on the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    return page, encode_cursor(page[-1], time_column, id_column)
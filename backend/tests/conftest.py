@@ -0,0 +1,5 @@
+"""Backend unit tests import modules the way app.py does (flat, from backend/)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
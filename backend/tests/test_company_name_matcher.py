@@ -0,0 +1,76 @@
+"""Company name normalisation, bounded edit distance and the trigram index."""
+import random
+
+from company_name_matcher import (
+    CompanyNameIndex,
+    bounded_levenshtein,
+    edit_similarity,
+    name_similarity,
+    normalize_company_name,
+)
+
+
+def levenshtein(s1, s2):
+    """Plain full-matrix edit distance, the reference for bounded_levenshtein."""
+    previous = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1, 1):
+        current = [i]
+        for j, c2 in enumerate(s2, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (c1 != c2)))
+        previous = current
+    return previous[-1]
+
+
+def test_normalize_drops_case_accents_punctuation_and_suffixes():
+    assert normalize_company_name("Deepgram, Inc.") == "deepgram"
+    assert normalize_company_name("  DeepGram   Inc ") == "deepgram"
+    assert normalize_company_name("Nestlé SA") == "nestle"
+    assert normalize_company_name("AT&T") == "at and t"
+
+
+def test_normalize_keeps_a_name_made_only_of_a_suffix():
+    assert normalize_company_name("Co") == "co"
+    assert normalize_company_name("") == ""
+
+
+def test_bounded_levenshtein_matches_reference_within_bound():
+    rng = random.Random(7)
+    for _ in range(500):
+        s1 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+        s2 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+        bound = rng.randint(0, 5)
+        expected = levenshtein(s1, s2)
+        assert bounded_levenshtein(s1, s2, bound) == (expected if expected <= bound else None)
+
+
+def test_edit_similarity_floor_returns_zero_early():
+    assert edit_similarity("elevenlabs", "elevenlabs") == 1.0
+    assert edit_similarity("elevenlabs", "elevenlab", 0.9) == 0.9
+    assert edit_similarity("elevenlabs", "assemblyai", 0.5) == 0.0
+
+
+def test_name_similarity_tiers():
+    assert name_similarity("Deepgram Inc", "deepgram") == 1.0
+    assert name_similarity("Deepgram", "Deepgram Labs") == 0.9
+    assert name_similarity("Lyra Health", "Lyra Wealth") <= 0.8
+
+
+def test_index_exact_and_fuzzy_match():
+    index = CompanyNameIndex(min_similarity=0.9)
+    assert index.add("ElevenLabs", value=1)
+    assert index.add("AssemblyAI", value=2)
+    assert not index.add("elevenlabs, inc.")  # Same normalised name
+    assert len(index) == 2
+
+    assert index.match("Elevenlabs LLC") == (1, 1.0)
+    value, score = index.match("ElevenLab")
+    assert value == 1 and 0.9 <= score < 1.0
+    assert index.match("Deepgram") is None
+
+
+def test_index_per_call_threshold():
+    index = CompanyNameIndex(min_similarity=0.95)
+    index.add("Lyra Health")
+
+    assert index.match("Lyra Wealth") is None
+    assert index.match("Lyra Wealth", min_similarity=0.9) is not None
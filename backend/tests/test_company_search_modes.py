@@ -0,0 +1,69 @@
+"""Request counts for per-company vs combined company searches (no network)."""
+import pytest
+
+pytest.importorskip("requests")
+
+import coresignal_service
+from coresignal_pagination import PREVIEW_PAGE_SIZE
+
+
+def fake_preview(employees_by_company):
+    """Stand-in for _post_employee_preview_search over an in-memory index."""
+    def post(payload, page=1, request_counter=None):
+        clause = payload["query"]["bool"]["must"][0]
+        if "term" in clause:
+            ids = [clause["term"]["last_company_id"]]
+        else:
+            ids = clause["terms"]["last_company_id"]
+        # Grouped by company: the worst case for crowding out
+        hits = [
+            {"_source": {"last_company_id": company_id, "id": f"{company_id}-{n}"}}
+            for company_id in ids
+            for n in range(employees_by_company[company_id])
+        ]
+        if request_counter is not None:
+            request_counter.add()
+        start = (page - 1) * PREVIEW_PAGE_SIZE
+        return hits[start:start + PREVIEW_PAGE_SIZE]
+    return post
+
+
+def run(monkeypatch, employees_by_company, mode):
+    monkeypatch.setattr(coresignal_service, "_post_employee_preview_search", fake_preview(employees_by_company))
+    monkeypatch.setattr(coresignal_service, "_profile_from_hit", lambda hit, company_id: {"company_id": company_id})
+    counter = coresignal_service.PreviewRequestCounter()
+    profiles = coresignal_service.search_profiles_by_company_ids(
+        list(employees_by_company), max_per_company=20, max_workers=1, mode=mode, request_counter=counter
+    )
+    return profiles, counter.count
+
+
+def test_combined_uses_fewer_requests_for_small_companies(monkeypatch):
+    employees = {company_id: 2 for company_id in range(1, 51)}
+
+    per_company_profiles, per_company_requests = run(monkeypatch, employees, "per_company")
+    combined_profiles, combined_requests = run(monkeypatch, employees, "combined")
+
+    assert per_company_requests == 50
+    assert combined_requests == 5
+    assert len(combined_profiles) == len(per_company_profiles) == 100
+
+
+def test_combined_searches_crowded_out_companies_again(monkeypatch):
+    # Two large companies fill the first response; the rest must not be dropped
+    employees = {1: 500, 2: 500, **{company_id: 3 for company_id in range(3, 13)}}
+
+    profiles, request_count = run(monkeypatch, employees, "combined")
+
+    found = {profile["company_id"] for profile in profiles}
+    assert found == set(employees)
+    assert request_count < 10 * len(employees)
+
+
+def test_combined_never_exceeds_max_per_company(monkeypatch):
+    employees = {company_id: 60 for company_id in range(1, 6)}
+
+    profiles, _ = run(monkeypatch, employees, "combined")
+
+    for company_id in employees:
+        assert sum(1 for p in profiles if p["company_id"] == company_id) <= 20
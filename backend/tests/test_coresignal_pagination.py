@@ -0,0 +1,121 @@
+"""Preview de-duplication, ID-only profiles and trimming across Load More calls."""
+import pytest
+
+pytest.importorskip("requests")
+
+import coresignal_service_paginated
+from coresignal_pagination import (
+    LIGHT_PREVIEW_FIELDS,
+    PREVIEW_PAGE_SIZE,
+    dedupe_profiles,
+    preview_profile_id,
+    to_light_profile,
+)
+
+
+def test_preview_profile_id_prefers_employee_id():
+    assert preview_profile_id({"id": 7, "websites_linkedin": "x"}) == "7"
+    assert preview_profile_id({"linkedin_url": "https://linkedin.com/in/a"}) == "https://linkedin.com/in/a"
+    assert preview_profile_id({"full_name": "No ID"}) is None
+    assert preview_profile_id(42) == "42"
+
+
+def test_dedupe_keeps_order_and_updates_seen_ids():
+    seen = {"1"}
+    profiles = [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 2}, {"full_name": "no id"}]
+
+    unique = dedupe_profiles(profiles, seen)
+
+    assert unique == [{"id": 2}, {"id": 3}, {"full_name": "no id"}]
+    assert seen == {"1", "2", "3"}
+
+
+def test_light_profile_keeps_only_listed_fields():
+    profile = {"id": 1, "full_name": "Ada", "experience": [{"title": "CTO"}], "skills": ["x"]}
+
+    light = to_light_profile(profile)
+
+    assert light == {"id": 1, "full_name": "Ada"}
+    assert set(light) <= set(LIGHT_PREVIEW_FIELDS)
+    assert to_light_profile("not a dict") == "not a dict"
+
+
+def fake_pages(monkeypatch, full_pages=5):
+    """Every page is full of distinct profiles "<page>-<n>"."""
+    def fetch_pages(fetch_page, pages, **kwargs):
+        return [
+            {
+                "page": page,
+                "success": True,
+                "results": [{"id": f"{page}-{n}"} for n in range(PREVIEW_PAGE_SIZE)] if page <= full_pages else [],
+                "error": None
+            }
+            for page in pages
+        ]
+
+    monkeypatch.setenv("CORESIGNAL_API_KEY", "test")
+    monkeypatch.setattr(coresignal_service_paginated, "fetch_pages_concurrently", fetch_pages)
+
+
+def test_trimmed_profiles_are_not_marked_seen(monkeypatch):
+    fake_pages(monkeypatch)
+    seen = set()
+
+    result = coresignal_service_paginated.search_profiles_with_endpoint_paginated(
+        {"query": {}}, max_results=30, seen_ids=seen
+    )
+
+    assert result["total"] == 30
+    assert seen == {preview_profile_id(profile) for profile in result["results"]}
+    # Page 2 still has 10 profiles left, so the cursor stays on page 1
+    assert result["pagination"]["last_page"] == 1
+    assert result["pagination"]["has_more"] is True
+
+
+def test_load_more_returns_each_profile_exactly_once(monkeypatch):
+    fake_pages(monkeypatch)
+    seen = set()
+    returned = []
+    next_page = 1
+
+    while next_page:
+        result = coresignal_service_paginated.search_profiles_with_endpoint_paginated(
+            {"query": {}}, max_results=30, page_start=next_page, seen_ids=seen
+        )
+        returned.extend(profile["id"] for profile in result["results"])
+        next_page = result["pagination"]["next_page"]
+
+    assert len(returned) == len(set(returned)) == 5 * PREVIEW_PAGE_SIZE
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def test_rate_limit_token_only_taken_on_cache_miss(monkeypatch):
+    import coresignal_pagination
+    from search_result_cache import SearchResultCache
+
+    monkeypatch.setattr(coresignal_pagination, "preview_search_cache", SearchResultCache(60, 10))
+    posts = []
+    monkeypatch.setattr(
+        coresignal_pagination.requests, "post",
+        lambda url, **kwargs: posts.append(url) or FakeResponse([{"id": 1}])
+    )
+    tokens = []
+    url = "https://api.coresignal.com/cdapi/v2/employee_clean/search/es_dsl/preview"
+
+    for _ in range(3):
+        success, results, _ = coresignal_pagination.request_preview_page(
+            url, {"query": {}}, {}, 1, acquire_token=lambda: tokens.append(1)
+        )
+        assert success and results == [{"id": 1}]
+
+    assert len(posts) == 1
+    assert len(tokens) == 1
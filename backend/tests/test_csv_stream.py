@@ -0,0 +1,34 @@
+"""Chunked CSV streaming."""
+import csv
+from io import StringIO
+
+from csv_stream import csv_string, iter_csv
+
+
+def test_chunks_join_to_the_whole_document():
+    rows = [[n, f"name {n}", 'quote "me", ok'] for n in range(7)]
+
+    chunks = list(iter_csv(["id", "name", "note"], rows, rows_per_chunk=3))
+
+    assert len(chunks) == 3  # header + 7 rows = 8 rows in chunks of 3
+    parsed = list(csv.reader(StringIO("".join(chunks))))
+    assert parsed[0] == ["id", "name", "note"]
+    assert parsed[1:] == [[str(n), f"name {n}", 'quote "me", ok'] for n in range(7)]
+
+
+def test_rows_are_consumed_lazily():
+    consumed = []
+
+    def rows():
+        for n in range(10):
+            consumed.append(n)
+            yield [n]
+
+    chunks = iter_csv(None, rows(), rows_per_chunk=2)
+    assert next(chunks) == "0\r\n1\r\n"
+    assert consumed == [0, 1]
+
+
+def test_empty_export():
+    assert list(iter_csv(None, [])) == []
+    assert csv_string(["id"], []) == "id\r\n"
@@ -0,0 +1,118 @@
+"""Coalesced note drafts (no network - the RPC POST is faked)."""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+import feedback_service
+from feedback_service import FeedbackService
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, rows=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = ""
+        self._rows = rows or []
+
+    def json(self):
+        return self._rows
+
+
+class Writes(list):
+    """Recorded (url, payload) draft RPC calls, plus the response to return."""
+    response = FakeResponse(rows=[{"id": 1}])
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    calls = Writes()
+
+    def post(url, json=None, **kwargs):
+        calls.append((url, json))
+        return calls.response
+
+    monkeypatch.setattr(feedback_service.requests, "post", post)
+    monkeypatch.setattr(feedback_service, "NOTE_COALESCE_SECONDS", 0.05)
+    return calls
+
+
+def make_service(monkeypatch):
+    monkeypatch.setattr(feedback_service.atexit, "register", lambda func: None)
+    return FeedbackService("http://supabase.test", "key")
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_rapid_saves_are_written_once_with_the_latest_text(monkeypatch, writes):
+    service = make_service(monkeypatch)
+
+    for revision, text in enumerate(["H", "He", "Hello"], 1):
+        assert service.save_note_draft("url", "ana", "d1", text, revision) == (True, None)
+
+    assert wait_for(lambda: len(writes) == 1)
+    time.sleep(0.1)
+    assert len(writes) == 1
+    url, payload = writes[0]
+    assert url.endswith("/rpc/save_feedback_draft")
+    assert payload["p_feedback_text"] == "Hello" and payload["p_revision"] == 3
+
+
+def test_older_revision_does_not_replace_buffered_text(monkeypatch, writes):
+    service = make_service(monkeypatch)
+
+    service.save_note_draft("url", "ana", "d1", "newer", 5)
+    service.save_note_draft("url", "ana", "d1", "older", 4)
+    success, row = service.save_note_draft("url", "ana", "d1", "oldest", 3, flush=True)
+
+    assert success and row == {"id": 1}
+    assert [payload["p_feedback_text"] for _, payload in writes] == ["newer"]
+    time.sleep(0.1)
+    assert len(writes) == 1  # The flush cancelled the buffered write
+
+
+def test_discard_drops_buffered_drafts(monkeypatch, writes):
+    service = make_service(monkeypatch)
+
+    service.save_note_draft("url", "ana", "d1", "text", 1)
+    service.discard_drafts("url", "ana")
+
+    time.sleep(0.1)
+    assert writes == []
+
+
+def test_discard_waits_for_a_write_already_in_flight(monkeypatch, writes):
+    service = make_service(monkeypatch)
+    started, release = threading.Event(), threading.Event()
+    events = []
+
+    def slow_post(url, json=None, **kwargs):
+        started.set()
+        release.wait(2)
+        events.append("written")
+        return FakeResponse(rows=[{"id": 1}])
+
+    monkeypatch.setattr(feedback_service.requests, "post", slow_post)
+    service.save_note_draft("url", "ana", "d1", "text", 1)
+    assert started.wait(2)
+
+    threading.Timer(0.1, release.set).start()
+    service.discard_drafts("url", "ana")
+    events.append("discarded")
+
+    assert events == ["written", "discarded"]
+
+
+def test_missing_rpc_fails_instead_of_inserting(monkeypatch, writes):
+    service = make_service(monkeypatch)
+    writes.response = FakeResponse(status_code=404)
+
+    assert service.save_note_draft("url", "ana", "d1", "text", 1, flush=True) == (False, None)
+    assert len(writes) == 1
@@ -0,0 +1,30 @@
+"""Validation of GPT-5 batch screening responses."""
+import pytest
+
+for dependency in ("aiohttp", "anthropic", "supabase"):
+    pytest.importorskip(dependency)
+
+from company_research_service import CompanyResearchService
+
+
+@pytest.fixture
+def service():
+    # The validator needs no clients, so skip __init__ (API keys, Supabase)
+    return CompanyResearchService.__new__(CompanyResearchService)
+
+
+def test_one_numeric_score_per_company_is_valid(service):
+    assert service._valid_screening_scores([7, 8.5, 0], 3)
+
+
+@pytest.mark.parametrize("scores", [
+    [7, 8],                 # Too few
+    [7, 8, 9, 10],          # Too many
+    [7, "8", 9],            # Non-numeric
+    [7, None, 9],
+    [True, 8, 9],           # bool is an int, but not a score
+    {"scores": [7, 8, 9]},  # Not a list
+    None,
+])
+def test_malformed_responses_are_rejected(service, scores):
+    assert not service._valid_screening_scores(scores, 3)
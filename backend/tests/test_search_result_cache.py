@@ -0,0 +1,66 @@
+"""SearchResultCache TTL/LRU behaviour and preview cache keys."""
+import search_result_cache
+from search_result_cache import SearchResultCache, canonical_query_hash, preview_cache_key
+
+PREVIEW_URL = "https://api.coresignal.com/cdapi/v2/employee_clean/search/es_dsl/preview"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(search_result_cache.time, "monotonic", clock)
+    cache = SearchResultCache(ttl_seconds=10, max_entries=5)
+
+    cache.set("page", [1, 2])
+    clock.now += 9
+    assert cache.get("page") == [1, 2]
+    clock.now += 2
+    assert cache.get("page") is None
+    assert cache.stats() == {"entries": 0, "hits": 1, "misses": 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SearchResultCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_values_are_copied_in_and_out():
+    cache = SearchResultCache(ttl_seconds=60, max_entries=2)
+    page = [{"id": 1}]
+    cache.set("page", page)
+    page[0]["id"] = 2
+
+    cached = cache.get("page")
+    assert cached == [{"id": 1}]
+    cached.append({"id": 3})
+    assert cache.get("page") == [{"id": 1}]
+
+
+def test_canonical_hash_ignores_key_order_and_size():
+    first = {"query": {"bool": {"must": [{"term": {"a": 1}}], "filter": []}}, "size": 20}
+    second = {"query": {"bool": {"filter": [], "must": [{"term": {"a": 1}}]}}}
+
+    assert canonical_query_hash(first) == canonical_query_hash(second)
+    assert canonical_query_hash(first) != canonical_query_hash({"query": {"term": {"a": 2}}})
+
+
+def test_preview_cache_key_is_per_page_and_preview_only():
+    query = {"query": {"match_all": {}}}
+
+    assert preview_cache_key(f"{PREVIEW_URL}?page=2", query) != preview_cache_key(f"{PREVIEW_URL}?page=3", query)
+    assert preview_cache_key(PREVIEW_URL, query) == preview_cache_key(f"{PREVIEW_URL}?page=1", query)
+    assert preview_cache_key("https://api.coresignal.com/cdapi/v2/employee_clean/collect/1", query) is None
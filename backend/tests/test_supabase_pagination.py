@@ -0,0 +1,45 @@
+"""Keyset cursor encoding and page splitting."""
+import pytest
+
+from supabase_pagination import decode_cursor, encode_cursor, keyset_params, split_page
+
+
+def test_cursor_round_trip():
+    row = {"created_at": "2026-01-02T03:04:05.678+00:00", "id": 42}
+
+    cursor = encode_cursor(row, "created_at")
+
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor) == ("2026-01-02T03:04:05.678+00:00", 42)
+
+
+def test_malformed_cursor():
+    assert decode_cursor("not a cursor!") is None
+    with pytest.raises(ValueError):
+        keyset_params("created_at", 10, cursor="not a cursor!")
+
+
+def test_first_page_params():
+    assert keyset_params("created_at", 10) == {"order": "created_at.desc,id.desc", "limit": "11"}
+
+
+def test_next_page_filters_past_the_cursor_row():
+    cursor = encode_cursor({"updated_at": "2026-01-02T03:04:05+00:00", "id": 7}, "updated_at")
+
+    params = keyset_params("updated_at", 5, cursor=cursor)
+
+    assert params["or"] == (
+        '(updated_at.lt."2026-01-02T03:04:05+00:00",'
+        'and(updated_at.eq."2026-01-02T03:04:05+00:00",id.lt."7"))'
+    )
+
+
+def test_split_page_uses_the_extra_row_to_detect_more():
+    rows = [{"created_at": f"2026-01-0{day}", "id": day} for day in range(9, 0, -1)]
+
+    page, cursor = split_page(rows[:4], 3, "created_at")
+    assert [row["id"] for row in page] == [9, 8, 7]
+    assert decode_cursor(cursor) == ("2026-01-07", 7)
+
+    page, cursor = split_page(rows[:3], 3, "created_at")
+    assert len(page) == 3 and cursor is None
@@ -44,7 +44,9 @@ CREATE TABLE IF NOT EXISTS target_companies (
 
     -- Constraints
     CONSTRAINT target_companies_jd_company_unique
-        UNIQUE (jd_id, company_id)
+        UNIQUE (jd_id, company_id),           -- NULL company_ids never conflict
+    CONSTRAINT target_companies_jd_company_name_unique
+        UNIQUE (jd_id, company_name)          -- Upsert target for bulk saves
 );
 
 -- Indexes for performance
@@ -117,13 +117,19 @@ CREATE TABLE IF NOT EXISTS recruiter_feedback (
     feedback_text TEXT,
     feedback_type TEXT NOT NULL CHECK (feedback_type IN ('like', 'dislike', 'note')),
     recruiter_name TEXT NOT NULL,
+    draft_id TEXT,  -- Auto-saved note drafts upsert on (candidate, recruiter, draft)
+    draft_revision INTEGER,  -- Out-of-order draft saves never overwrite newer text
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
 -- Indexes for faster lookups
+CREATE UNIQUE INDEX IF NOT EXISTS idx_recruiter_feedback_draft
+    ON recruiter_feedback(candidate_linkedin_url, recruiter_name, draft_id);
 CREATE INDEX IF NOT EXISTS idx_recruiter_feedback_linkedin_url
     ON recruiter_feedback(candidate_linkedin_url);
+CREATE INDEX IF NOT EXISTS idx_recruiter_feedback_url_updated
+    ON recruiter_feedback(candidate_linkedin_url, updated_at DESC);  -- Readers order by last write
 CREATE INDEX IF NOT EXISTS idx_recruiter_feedback_created_at
     ON recruiter_feedback(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_recruiter_feedback_recruiter_name
@@ -134,6 +140,7 @@ COMMENT ON COLUMN recruiter_feedback.candidate_linkedin_url IS 'LinkedIn URL of
 COMMENT ON COLUMN recruiter_feedback.feedback_text IS 'The note/comment text (nullable for like/dislike only)';
 COMMENT ON COLUMN recruiter_feedback.feedback_type IS 'Type: like, dislike, or note';
 COMMENT ON COLUMN recruiter_feedback.recruiter_name IS 'Who gave the feedback (Jon or Mary)';
+COMMENT ON COLUMN recruiter_feedback.draft_id IS 'Client ID of the note being edited - auto-saves upsert this row (see migrations/add_recruiter_feedback_drafts.sql for save_feedback_draft)';
 
 -- ============================================
 -- TABLE 5: company_lists
@@ -201,6 +208,60 @@ COMMENT ON COLUMN company_list_items.relevance_score IS 'AI relevance score (0-1
 COMMENT ON COLUMN company_list_items.relevance_reasoning IS 'AI explanation of why this company is relevant';
 COMMENT ON COLUMN company_list_items.company_metadata IS 'Full company data JSON from research';
 
+-- ============================================
+-- TABLE 7: company_id_resolutions
+-- Purpose: Cache company name → CoreSignal company_id lookups
+-- Freshness Rules:
+--   - Resolved names: reused for 30 days
+--   - "No match" (company_id NULL): retried after 3 days
+-- ============================================
+CREATE TABLE IF NOT EXISTS company_id_resolutions (
+    normalized_name TEXT PRIMARY KEY,
+    input_name TEXT NOT NULL,
+    company_id BIGINT,
+    coresignal_name TEXT,
+    website TEXT,
+    employee_count INTEGER,
+    confidence REAL NOT NULL DEFAULT 0,
+    source TEXT NOT NULL DEFAULT 'search',
+    resolved_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE DEFAULT (NOW() + INTERVAL '30 days')
+);
+
+CREATE INDEX IF NOT EXISTS idx_company_id_resolutions_expiry
+    ON company_id_resolutions(expires_at);
+
+COMMENT ON TABLE company_id_resolutions IS 'Company name → CoreSignal company_id resolutions, consulted before the company search API';
+COMMENT ON COLUMN company_id_resolutions.normalized_name IS 'Normalised company name (case, punctuation and legal suffix removed)';
+COMMENT ON COLUMN company_id_resolutions.company_id IS 'Best CoreSignal candidate (NULL when the search found nothing)';
+COMMENT ON COLUMN company_id_resolutions.source IS 'search (CoreSignal company search) or stored_companies (seeded)';
+
+-- ============================================
+-- TABLE 8: search_sessions
+-- Purpose: Preview-search session state shared across workers
+-- Freshness Rules:
+--   - Expires 24 hours after last use
+-- ============================================
+CREATE TABLE IF NOT EXISTS search_sessions (
+    session_id TEXT PRIMARY KEY,
+    query JSONB,
+    endpoint TEXT,
+    fetched_pages JSONB NOT NULL DEFAULT '[]',
+    last_page INTEGER NOT NULL DEFAULT 0,
+    total_fetched INTEGER NOT NULL DEFAULT 0,
+    returned_ids JSONB NOT NULL DEFAULT '[]',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE DEFAULT (NOW() + INTERVAL '24 hours')
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_sessions_expiry
+    ON search_sessions(expires_at);
+
+COMMENT ON TABLE search_sessions IS 'Preview-search sessions: query, fetched pages, cursor and returned profile IDs';
+COMMENT ON COLUMN search_sessions.fetched_pages IS 'Preview pages (1-5) already fetched for this session';
+COMMENT ON COLUMN search_sessions.returned_ids IS 'Profile IDs already returned, used to de-duplicate later pages';
+
 -- ============================================
 -- TRIGGERS: Auto-update updated_at timestamp
 -- ============================================
@@ -47,6 +47,7 @@ function App() {
   });
   const [candidateFeedback, setCandidateFeedback] = useState({}); // Store feedback per candidate URL
   const [feedbackHistory, setFeedbackHistory] = useState({}); // Store all feedback history from DB
+  const [feedbackSummary, setFeedbackSummary] = useState({}); // Per-URL feedback counts for the indicator dots
   const [isRecording, setIsRecording] = useState({}); // Track which candidate is being recorded
   const [showFeedbackInput, setShowFeedbackInput] = useState({}); // Track if input is visible per candidate
   const [hideAIAnalysis, setHideAIAnalysis] = useState({}); // Track if AI analysis sections are hidden per candidate
@@ -225,6 +226,36 @@ function App() {
     };
   }, [singleProfileResults, batchResults, savedAssessments]); // Re-run when candidates change
 
+  // Load feedback indicators for every listed candidate in one request
+  React.useEffect(() => {
+    const urls = [
+      ...singleProfileResults.map(r => r.url),
+      ...batchResults.map(r => r.url),
+      ...savedAssessments.map(a => a.linkedin_url)
+    ].filter(url => url && url !== 'Test Profile' && !(url in feedbackSummary));
+
+    if (urls.length === 0) return;
+
+    fetch('/get-feedback-bulk', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ linkedin_urls: [...new Set(urls)].slice(0, 500) })
+    })
+      .then(response => response.json())
+      .then(data => {
+        if (data.success) {
+          setFeedbackSummary(prev => ({ ...prev, ...data.feedback }));
+        }
+      })
+      .catch(error => console.error('Error loading feedback indicators:', error));
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [singleProfileResults, batchResults, savedAssessments]);
+
+  // Feedback count for a candidate - full history once loaded, else the bulk summary
+  const getFeedbackCount = (url) => (
+    feedbackHistory[url] ? feedbackHistory[url].length : (feedbackSummary[url]?.count || 0)
+  );
+
   // Format CoreSignal freshness badge
   const formatFreshnessBadge = (checked_at) => {
     if (!checked_at) return null;
@@ -269,9 +300,25 @@ function App() {
     }
   };
 
+  // Note drafts being edited, per candidate: { id, revision }
+  // Every auto-save of a draft updates the same feedback row instead of adding one
+  const noteDrafts = React.useRef({});
+
+  const nextNoteDraft = (linkedinUrl) => {
+    const draft = noteDrafts.current[linkedinUrl] || {
+      id: `${Date.now()}-${Math.random().toString(36).slice(2, 10)}`,
+      revision: 0
+    };
+    draft.revision += 1;
+    noteDrafts.current[linkedinUrl] = draft;
+    return draft;
+  };
+
   // Save recruiter feedback with debounce
-  const saveFeedback = async (linkedinUrl, feedbackType, feedbackText = '') => {
+  // options.flush: write a note draft now instead of letting the server coalesce it
+  const saveFeedback = async (linkedinUrl, feedbackType, feedbackText = '', options = {}) => {
     try {
+      const draft = feedbackType === 'note' ? nextNoteDraft(linkedinUrl) : null;
       const response = await fetch('/save-feedback', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
@@ -279,7 +326,12 @@ function App() {
           linkedin_url: linkedinUrl,
           feedback_type: feedbackType,
           feedback_text: feedbackText,
-          recruiter_name: selectedRecruiter
+          recruiter_name: selectedRecruiter,
+          ...(draft && {
+            draft_id: draft.id,
+            draft_revision: draft.revision,
+            flush: Boolean(options.flush)
+          })
         })
       });
 
@@ -317,6 +369,11 @@ function App() {
       clearTimeout(debounceTimeouts.current[linkedinUrl]);
     }
 
+    // An emptied note box starts a new note (draft) next time
+    if (!noteText || !noteText.trim()) {
+      delete noteDrafts.current[linkedinUrl];
+    }
+
     // Set new timeout for auto-save (2 seconds after typing stops)
     debounceTimeouts.current[linkedinUrl] = setTimeout(async () => {
       if (noteText && noteText.trim()) {
@@ -338,7 +395,7 @@ function App() {
 
     // Save immediately on blur if there's text
     if (noteText && noteText.trim()) {
-      await saveFeedback(linkedinUrl, 'note', noteText);
+      await saveFeedback(linkedinUrl, 'note', noteText, { flush: true });
       showNotification('Feedback saved');
     }
   };
@@ -444,6 +501,8 @@ function App() {
         return;
       }
       setOpenAccordionId(candidateUrl);
+      // Saved assessments are listed without their JSONB blobs - load them on first open
+      loadSavedAssessmentDetail(candidateUrl);
     }
   };
 
@@ -494,7 +553,7 @@ function App() {
     // Save immediately if there's a note
     const note = candidateFeedback[linkedinUrl]?.note;
     if (note && note.trim()) {
-      await saveFeedback(linkedinUrl, 'note', note);
+      await saveFeedback(linkedinUrl, 'note', note, { flush: true });
       showNotification('Feedback saved');
     }
     setDrawerOpen(prev => ({ ...prev, [linkedinUrl]: false }));
@@ -519,6 +578,7 @@ function App() {
       const data = await response.json();
       if (data.success) {
         // Clear local state
+        delete noteDrafts.current[linkedinUrl];
         setCandidateFeedback(prev => ({
           ...prev,
           [linkedinUrl]: { note: '' }
@@ -1756,17 +1816,17 @@ function App() {
         },
         body: JSON.stringify({
           user_prompt: searchPrompt,
-          limit: profileCount
+          limit: profileCount,
+          format: 'csv'
         }),
       });
 
-      const data = await response.json();
-
-      if (data.success) {
-        console.log(`✅ Found ${data.total_found} profiles`);
+      if (response.ok) {
+        // The server streams the CSV itself; the result count comes back in a header
+        const totalFound = response.headers.get('X-Total-Found');
+        console.log(`✅ Found ${totalFound} profiles`);
         
-        // Create a blob from the CSV data
-        const blob = new Blob([data.csv_data], { type: 'text/csv' });
+        const blob = await response.blob();
         const url = window.URL.createObjectURL(blob);
         
         // Create a download link and trigger it
@@ -1778,8 +1838,9 @@ function App() {
         document.body.removeChild(link);
         window.URL.revokeObjectURL(url);
         
-        showNotification(`Downloaded ${data.total_found} profiles as CSV!`, 'success');
+        showNotification(`Downloaded ${totalFound} profiles as CSV!`, 'success');
       } else {
+        const data = await response.json().catch(() => ({}));
         setError(data.error || 'Failed to search profiles');
       }
     } catch (err) {
@@ -1822,6 +1883,26 @@ function App() {
     }
   };
 
+  const loadSavedAssessmentDetail = async (candidateUrl) => {
+    const saved = savedAssessments.find(a => a.linkedin_url === candidateUrl);
+    if (!saved || saved.assessment_data || saved.detailLoading) return;
+
+    setSavedAssessments(prev => prev.map(a => a.id === saved.id ? { ...a, detailLoading: true } : a));
+    try {
+      const response = await fetch(`/assessments/${saved.id}`);
+      const data = await response.json();
+
+      setSavedAssessments(prev => prev.map(a =>
+        a.id === saved.id
+          ? (data.success ? { ...a, ...data.assessment, detailLoading: false } : { ...a, detailLoading: false })
+          : a
+      ));
+    } catch (err) {
+      console.error('Error loading assessment detail:', err);
+      setSavedAssessments(prev => prev.map(a => a.id === saved.id ? { ...a, detailLoading: false } : a));
+    }
+  };
+
   const saveCurrentAssessments = async () => {
     const allCurrentAssessments = [];
     
@@ -1909,19 +1990,59 @@ function App() {
         body: JSON.stringify({
           company_names: selectedCompanies,
           filters: companySearchFilters,
-          max_per_company: 20
+          max_per_company: 20,
+          stream: true
         })
       });
 
-      const data = await response.json();
-
-      if (response.ok && data.success) {
-        setCompanySearchResults(data);
-        showNotification(`Found ${data.total_people} people at ${data.company_matches.filter(m => m.coresignal_id).length} companies`, 'success');
-        console.log('✅ Company search completed:', data);
-      } else {
+      if (!response.ok) {
+        const data = await response.json();
         setError(data.error || 'Search failed');
         showNotification(data.error || 'Search failed', 'error');
+        return;
+      }
+
+      // Results stream back as NDJSON, one line per company as each completes
+      const companyMatches = new Array(selectedCompanies.length).fill(null);
+      const peopleByCompany = selectedCompanies.map(() => []);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let summary = null;
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop(); // Keep incomplete line in buffer
+
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+
+          if (event.type === 'company') {
+            companyMatches[event.index] = event.match;
+            peopleByCompany[event.index] = event.people;
+            const people = peopleByCompany.flat();
+            setCompanySearchResults({
+              company_matches: companyMatches.filter(Boolean),
+              people,
+              total_people: people.length
+            });
+          } else if (event.type === 'done') {
+            summary = event;
+          }
+        }
+      }
+
+      if (summary && summary.success) {
+        showNotification(`Found ${summary.total_people} people at ${summary.companies_matched} companies`, 'success');
+        console.log('✅ Company search completed:', summary);
+      } else {
+        setError('No matching companies found in CoreSignal database');
+        showNotification('No matching companies found in CoreSignal database', 'error');
       }
     } catch (err) {
       setError('Network error searching companies');
@@ -3395,15 +3516,18 @@ function App() {
                     <button
                       className="export-csv-btn"
                       onClick={async () => {
-                        const response = await fetch(`/research-companies/${companySessionId}/export-csv`);
-                        const data = await response.json();
-                        if (data.success) {
-                          const blob = new Blob([data.csv_data], { type: 'text/csv' });
+                        const response = await fetch(`/research-companies/${companySessionId}/export-csv?format=csv`);
+                        if (response.ok) {
+                          // Streamed CSV download - filename comes from Content-Disposition
+                          const disposition = response.headers.get('Content-Disposition') || '';
+                          const match = disposition.match(/filename="?([^";]+)"?/);
+                          const blob = await response.blob();
                           const url = window.URL.createObjectURL(blob);
                           const a = document.createElement('a');
                           a.href = url;
-                          a.download = data.filename;
+                          a.download = match ? match[1] : `company_research_${companySessionId}.csv`;
                           a.click();
+                          window.URL.revokeObjectURL(url);
                           showNotification('CSV exported!', 'success');
                         }
                       }}
@@ -4304,9 +4428,12 @@ function App() {
               name: result.full_name || 'Unknown Name',
               headline: result.headline || 'N/A',
               score: savedScore,
-              assessment: result.assessment_data,
+              // Until the detail is loaded, show the stored score on its own
+              assessment: result.assessment_data || (result.weighted_score !== null
+                ? { weighted_analysis: { weighted_score: result.weighted_score } }
+                : { overall_score: result.overall_score }),
               profileSummary: result.profile_data,
-              checked_at: result.profile_data?.checked_at,
+              checked_at: result.profile_data?.checked_at || result.checked_at,
               success: true,
               url: result.linkedin_url,
               created_at: result.created_at,
@@ -4499,10 +4626,10 @@ function App() {
                                 title={drawerOpen[candidate.url] ? "Close feedback panel" : "Open feedback panel"}
                               >
                                 <div className="feedback-tab-content">
-                                  <div className={`feedback-status-dot ${(feedbackHistory[candidate.url] || []).length > 0 ? 'has-feedback' : ''}`}></div>
+                                  <div className={`feedback-status-dot ${getFeedbackCount(candidate.url) > 0 ? 'has-feedback' : ''}`}></div>
                                   <span className="feedback-tab-label">Feedback</span>
-                                  {(feedbackHistory[candidate.url] || []).length > 0 && (
-                                    <span className="feedback-count">{(feedbackHistory[candidate.url] || []).length}</span>
+                                  {getFeedbackCount(candidate.url) > 0 && (
+                                    <span className="feedback-count">{getFeedbackCount(candidate.url)}</span>
                                   )}
                                   <span className="feedback-arrow">{drawerOpen[candidate.url] ? '▶' : '◀'}</span>
                                 </div>
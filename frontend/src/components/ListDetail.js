@@ -6,6 +6,8 @@ function ListDetail({ list, recruiterName, onBack, showNotification }) {
   const [loading, setLoading] = useState(false);
   const [assessing, setAssessing] = useState(false);
   const [error, setError] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchProfiles();
@@ -24,6 +26,7 @@ function ListDetail({ list, recruiterName, onBack, showNotification }) {
 
       const data = await response.json();
       setProfiles(data.profiles || data);
+      setNextCursor(data.next_cursor || null);
     } catch (err) {
       setError(err.message || 'Failed to fetch profiles');
       console.error('Error fetching profiles:', err);
@@ -32,6 +35,28 @@ function ListDetail({ list, recruiterName, onBack, showNotification }) {
     }
   };
 
+  const fetchMoreProfiles = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+
+    try {
+      const response = await fetch(`/extension/profiles/${list.id}?cursor=${encodeURIComponent(nextCursor)}`);
+
+      if (!response.ok) {
+        throw new Error('Failed to fetch more profiles');
+      }
+
+      const data = await response.json();
+      setProfiles(prev => [...prev, ...(data.profiles || [])]);
+      setNextCursor(data.next_cursor || null);
+    } catch (err) {
+      showNotification(err.message || 'Failed to fetch more profiles', 'error');
+      console.error('Error fetching more profiles:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleAssessAll = async () => {
     const unassessedCount = profiles.filter(p => !p.assessed).length;
 
@@ -306,6 +331,16 @@ function ListDetail({ list, recruiterName, onBack, showNotification }) {
               </div>
             </div>
           )}
+
+          {nextCursor && (
+            <button
+              className="load-more-btn"
+              onClick={fetchMoreProfiles}
+              disabled={loadingMore}
+            >
+              {loadingMore ? 'Loading...' : 'Load More Profiles'}
+            </button>
+          )}
         </div>
       )}
     </div>